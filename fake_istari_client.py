@@ -0,0 +1,233 @@
+"""In-process stand-in for the Istari ``Client`` used by campaign scripts and benchmarks.
+
+Implements the calls the quickstart scripts make (``add_job``, ``get_job``,
+``list_functions``, ``list_tools``, ``list_agents``, ``list_models``,
+``get_current_user``) against in-memory state, with configurable:
+
+- per-call latency (fixed, lognormal or exponential around ``latency_ms``),
+- transient API errors (``error_rate``; raised as ``ApiException`` status 503),
+- rate limiting (token bucket of ``rate_limit_per_second``; status 429 with ``Retry-After``),
+- job queue/run durations and terminal failure rate, compressed by ``time_scale``,
+- the pagination shape returned by list calls, covering every shape ``page_items`` accepts.
+
+Example:
+    client = FakeIstariClient(FakeClientConfig(latency_ms=20, latency_dist="lognormal", error_rate=0.01))
+    executor = IstariExecutor(client)
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Callable
+
+LATENCY_DISTS = ("fixed", "lognormal", "exponential")
+PAGE_SHAPES = ("items", "content", "list", "iterable")
+
+
+class ApiException(Exception):
+    """Shaped like the SDK's generated ``ApiException`` (``status``, ``reason``, ``headers``)."""
+
+    def __init__(self, status: int, reason: str, headers: dict[str, str] | None = None) -> None:
+        super().__init__(f"({status}) {reason}")
+        self.status = status
+        self.reason = reason
+        self.headers = headers or {}
+
+
+@dataclass
+class FakeClientConfig:
+    latency_ms: float = 0.0
+    latency_dist: str = "fixed"
+    # Lognormal shape parameter; ignored by the other distributions.
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    rate_limit_per_second: float = 0.0
+    # Job lifecycle in simulated seconds (each job draws exponential durations around these means).
+    job_queue_seconds: float = 30.0
+    job_run_seconds: float = 120.0
+    job_failure_rate: float = 0.0
+    # Simulated seconds per wall-clock second; 1000 turns a 2-minute job into 0.12 s.
+    time_scale: float = 1.0
+    page_shape: str = "items"
+    catalog_size: int = 25
+    seed: int = 0
+
+    def __post_init__(self) -> None:
+        if self.latency_dist not in LATENCY_DISTS:
+            raise ValueError(f"latency_dist must be one of {LATENCY_DISTS}")
+        if self.page_shape not in PAGE_SHAPES:
+            raise ValueError(f"page_shape must be one of {PAGE_SHAPES}")
+
+
+@dataclass
+class FakeJob:
+    id: str
+    model_id: str
+    function: str
+    parameters: dict[str, Any]
+    created_at: float
+    queue_seconds: float
+    run_seconds: float
+    fails: bool
+    status_name: str = "queued"
+
+
+@dataclass
+class FakeRecord:
+    """Catalog entry returned by list calls (functions, tools, agents, models)."""
+
+    id: str
+    name: str
+    display_name: str = ""
+
+
+@dataclass
+class FakeUser:
+    id: str
+    name: str
+    email: str
+
+
+@dataclass
+class FakePage:
+    items: list[Any] | None = None
+    content: list[Any] | None = None
+    total: int = 0
+    page: int = 1
+    size: int = 50
+    pages: int = 1
+
+
+class FakeIstariClient:
+    def __init__(self, config: FakeClientConfig | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        self.config = config or FakeClientConfig()
+        self._clock = clock
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._jobs: dict[str, FakeJob] = {}
+        self._next_job = 0
+        self._tokens = self.config.rate_limit_per_second
+        self._tokens_at = clock()
+        self.calls: Counter[str] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.catalog = {
+            kind: [
+                FakeRecord(id=f"{kind}-{i:04d}", name=f"@fake:{kind}_{i:04d}", display_name=f"Fake {kind} {i}")
+                for i in range(self.config.catalog_size)
+            ]
+            for kind in ("function", "tool", "agent", "model")
+        }
+        self.catalog["function"][0].name = "@istari:run_pyintact_simulation"
+
+    # -- call plumbing -------------------------------------------------
+
+    def _sample_latency(self) -> float:
+        mean = self.config.latency_ms / 1000.0
+        if mean <= 0:
+            return 0.0
+        if self.config.latency_dist == "lognormal":
+            return mean * math.exp(self._rng.gauss(0.0, self.config.latency_sigma))
+        if self.config.latency_dist == "exponential":
+            return self._rng.expovariate(1.0 / mean)
+        return mean
+
+    def _call(self, method: str) -> None:
+        with self._lock:
+            self.calls[method] += 1
+            latency = self._sample_latency()
+            failure = self._rng.random() < self.config.error_rate
+            limited = False
+            rate = self.config.rate_limit_per_second
+            if rate > 0:
+                now = self._clock()
+                self._tokens = min(rate, self._tokens + (now - self._tokens_at) * rate)
+                self._tokens_at = now
+                if self._tokens < 1.0:
+                    limited = True
+                    retry_after = (1.0 - self._tokens) / rate
+                else:
+                    self._tokens -= 1.0
+        if latency:
+            time.sleep(latency)
+        if limited:
+            self.errors["429"] += 1
+            raise ApiException(429, "Too Many Requests", {"Retry-After": f"{retry_after:.3f}"})
+        if failure:
+            self.errors["503"] += 1
+            raise ApiException(503, "Service Unavailable")
+
+    def _page(self, records: list[Any], page: int, size: int) -> Any:
+        size = max(1, size)
+        chunk = records[(page - 1) * size: page * size]
+        shape = self.config.page_shape
+        if shape == "list":
+            return chunk
+        if shape == "iterable":
+            return iter(chunk)
+        pages = max(1, math.ceil(len(records) / size))
+        if shape == "content":
+            return FakePage(content=chunk, total=len(records), page=page, size=size, pages=pages)
+        return FakePage(items=chunk, total=len(records), page=page, size=size, pages=pages)
+
+    # -- jobs ----------------------------------------------------------
+
+    def add_job(self, model_id: str, function: str, parameters: dict[str, Any] | None = None, **_: Any) -> FakeJob:
+        self._call("add_job")
+        with self._lock:
+            self._next_job += 1
+            job = FakeJob(
+                id=f"fake-job-{self._next_job:08d}",
+                model_id=model_id,
+                function=function,
+                parameters=parameters or {},
+                created_at=self._clock(),
+                queue_seconds=self._rng.expovariate(1.0 / max(self.config.job_queue_seconds, 1e-9)),
+                run_seconds=self._rng.expovariate(1.0 / max(self.config.job_run_seconds, 1e-9)),
+                fails=self._rng.random() < self.config.job_failure_rate,
+            )
+            self._jobs[job.id] = job
+        return job
+
+    def get_job(self, job_id: str) -> FakeJob:
+        self._call("get_job")
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise ApiException(404, f"job not found: {job_id}")
+        elapsed = (self._clock() - job.created_at) * self.config.time_scale
+        if elapsed < job.queue_seconds:
+            job.status_name = "queued"
+        elif elapsed < job.queue_seconds + job.run_seconds:
+            job.status_name = "running"
+        else:
+            job.status_name = "failed" if job.fails else "completed"
+        return job
+
+    # -- catalog -------------------------------------------------------
+
+    def _list(self, kind: str, name: str | None, page: int, size: int) -> Any:
+        self._call(f"list_{kind}s")
+        records = self.catalog[kind]
+        if name is not None:
+            records = [r for r in records if r.name == name]
+        return self._page(records, page, size)
+
+    def list_functions(self, name: str | None = None, page: int = 1, size: int = 50, **_: Any) -> Any:
+        return self._list("function", name, page, size)
+
+    def list_tools(self, page: int = 1, size: int = 50, **_: Any) -> Any:
+        return self._list("tool", None, page, size)
+
+    def list_agents(self, page: int = 1, size: int = 50, **_: Any) -> Any:
+        return self._list("agent", None, page, size)
+
+    def list_models(self, page: int = 1, size: int = 50, **_: Any) -> Any:
+        return self._list("model", None, page, size)
+
+    def get_current_user(self) -> Any:
+        self._call("get_current_user")
+        return FakeUser(id="user-0001", name="Fake User", email="fake.user@example.com")
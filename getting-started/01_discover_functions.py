@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from istari_client import get_client, page_items
+from istari_client import get_client, paginate
 
 
 def safe_name(item: object, *names: str) -> str:
@@ -17,17 +17,13 @@ def main() -> None:
     client = get_client()
 
     print("=== Functions (first 50) ===")
-    functions_page = client.list_functions(size=50)
-    functions = page_items(functions_page)
-    for fn in functions:
+    for fn in paginate(client.list_functions, page_size=50, max_pages=1):
         key = safe_name(fn, "key", "function", "name")
         display = safe_name(fn, "display_name", "name")
         print(f"- {key} :: {display}")
 
     print("\n=== Tools (first 50) ===")
-    tools_page = client.list_tools(size=50)
-    tools = page_items(tools_page)
-    for tool in tools:
+    for tool in paginate(client.list_tools, page_size=50, max_pages=1):
         key = safe_name(tool, "key", "name")
         display = safe_name(tool, "display_name", "name")
         print(f"- {key} :: {display}")
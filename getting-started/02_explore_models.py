@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from istari_client import get_client, page_items
+from istari_client import get_client, paginate
 
 
 def describe(item: object) -> tuple[str, str]:
@@ -21,10 +21,8 @@ def main() -> None:
         print("Use Istari UI to grab model IDs for geometry inputs and campaign root model.")
         return
 
-    page = client.list_models(size=25)
-    models = page_items(page)
     print("=== Models (first 25) ===")
-    for model in models:
+    for model in paginate(client.list_models, page_size=25, max_pages=1):
         model_id, name = describe(model)
         print(f"- {model_id} :: {name}")
 
@@ -1,13 +1,68 @@
-"""Shared Istari client helper for quickstart scripts."""
+"""Shared Istari client helper for quickstart scripts.
+
+``get_client()`` returns one client per process. It is built on first use from
+the environment (``.env`` is read once) and wrapped in ``InstrumentedClient``,
+which retries rate-limited and transient server errors with jittered
+exponential backoff and keeps per-endpoint call counters and latency
+histograms (``client_stats()`` / ``format_client_stats()``).
+
+``paginate(client.list_functions, page_size=100)`` yields every item of a
+paged listing lazily, fetching the next page on a background thread while the
+current one is consumed; breaking out of the loop stops further requests.
+
+``cached_listing(client, kind)`` returns the full function, tool, agent or
+model listing from an on-disk cache while it is younger than its TTL, so
+repeated launches validate keys without paging through the API. Clear it
+with ``python istari_client.py --clear-metadata-cache``.
+
+``upload_models(client, uploads)`` hashes files locally, reuses the model from
+an earlier upload of identical bytes (recorded in a local ledger, with the
+revision that holds those bytes), and sends the remaining ``add_model`` calls
+concurrently.
+
+Tuning, all optional:
+
+    ISTARI_CLIENT_POOL_SIZE       HTTP connections kept alive for concurrent workers (default 16)
+    ISTARI_CLIENT_MAX_RETRIES     retries per call after the first attempt (default 5)
+    ISTARI_CLIENT_BACKOFF_SECONDS first backoff ceiling; doubles per retry (default 0.5)
+    ISTARI_CLIENT_MAX_BACKOFF     backoff ceiling cap in seconds (default 30)
+    ISTARI_CACHE_DIR              metadata cache directory (default ~/.cache/istari-quickstart)
+    ISTARI_METADATA_TTL_SECONDS   metadata cache TTL for every kind (0 disables the cache)
+"""
 
 from __future__ import annotations
 
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import math
 import os
-from dataclasses import dataclass
-from typing import Any, Iterable
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
 
-from dotenv import load_dotenv
-from istari_digital_client import Client, Configuration
+if TYPE_CHECKING:
+    from istari_digital_client import Client
+
+# Upper bounds of the latency histogram buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+# Calls that create resources are only retried when the server refused them outright;
+# a 500/502/504 may have been applied, and retrying would submit a duplicate.
+NON_IDEMPOTENT_PREFIXES = ("add_", "create_", "update_", "upload_")
+REFUSED_STATUSES = (429, 503)
+# Listing call and default TTL in seconds per metadata kind; model listings change most often.
+METADATA_KINDS = {
+    "functions": ("list_functions", 3600.0),
+    "tools": ("list_tools", 3600.0),
+    "agents": ("list_agents", 900.0),
+    "models": ("list_models", 120.0),
+}
 
 
 @dataclass(frozen=True)
@@ -16,6 +71,23 @@ class IstariSettings:
     auth_token: str
 
 
+@dataclass(frozen=True)
+class ClientOptions:
+    pool_size: int = 16
+    max_retries: int = 5
+    backoff_seconds: float = 0.5
+    max_backoff_seconds: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "ClientOptions":
+        return cls(
+            pool_size=int(os.getenv("ISTARI_CLIENT_POOL_SIZE", cls.pool_size)),
+            max_retries=int(os.getenv("ISTARI_CLIENT_MAX_RETRIES", cls.max_retries)),
+            backoff_seconds=float(os.getenv("ISTARI_CLIENT_BACKOFF_SECONDS", cls.backoff_seconds)),
+            max_backoff_seconds=float(os.getenv("ISTARI_CLIENT_MAX_BACKOFF", cls.max_backoff_seconds)),
+        )
+
+
 def _require_env(name: str) -> str:
     value = os.getenv(name, "").strip()
     if not value:
@@ -24,6 +96,8 @@ def _require_env(name: str) -> str:
 
 
 def load_settings() -> IstariSettings:
+    from dotenv import load_dotenv
+
     load_dotenv()
     return IstariSettings(
         registry_url=_require_env("ISTARI_DIGITAL_REGISTRY_URL"),
@@ -31,15 +105,212 @@ def load_settings() -> IstariSettings:
     )
 
 
-def get_client() -> Client:
-    settings = load_settings()
+def error_status(exc: BaseException) -> int | None:
+    """HTTP status of an SDK ``ApiException`` (or anything shaped like one)."""
+    status = getattr(exc, "status", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_after_seconds(exc: BaseException) -> float:
+    headers = getattr(exc, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After", 0.0)))
+    except (AttributeError, TypeError, ValueError):  # HTTP-date form or odd header objects
+        return 0.0
+
+
+def is_retryable(method: str, status: int | None) -> bool:
+    if status is None:
+        return False
+    if method.startswith(NON_IDEMPOTENT_PREFIXES):
+        return status in REFUSED_STATUSES
+    return status == 429 or 500 <= status < 600
+
+
+class EndpointStats:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.retries = 0
+        self.errors: Counter[str] = Counter()
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def observe(self, seconds: float) -> None:
+        self.calls += 1
+        self.latency_sum += seconds
+        self.latency_max = max(self.latency_max, seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the max for the overflow bucket)."""
+        target, seen = q * self.calls, 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if count and seen >= target:
+                return min(bound, self.latency_max)
+        return self.latency_max
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "errors": dict(self.errors),
+            "latency_seconds": {
+                "sum": self.latency_sum,
+                "max": self.latency_max,
+                "p50": self.quantile(0.5),
+                "p95": self.quantile(0.95),
+                "p99": self.quantile(0.99),
+                # Cumulative counts per upper bound, as in a Prometheus histogram.
+                "buckets": {
+                    ("+Inf" if math.isinf(b) else str(b)): sum(self.buckets[: i + 1])
+                    for i, b in enumerate(LATENCY_BUCKETS)
+                },
+            },
+        }
+
+
+class InstrumentedClient:
+    """Proxy that times, counts and retries every method call on the wrapped client.
+
+    Each attempt is one latency observation; ``calls`` counts attempts, so
+    ``retries`` of them were repeats. Non-callable attributes pass through.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        options: ClientOptions | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        seed: int | None = None,
+    ) -> None:
+        self.client = client
+        self.options = options or ClientOptions()
+        self._sleep = sleep
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats: dict[str, EndpointStats] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.client, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            return self._call(name, attr, args, kwargs)
+
+        return call
+
+    def _endpoint(self, name: str) -> EndpointStats:
+        if name not in self._stats:
+            self._stats[name] = EndpointStats()
+        return self._stats[name]
+
+    def backoff_seconds(self, attempt: int, exc: BaseException) -> float:
+        # Full jitter: uniform over [0, ceiling] so concurrent workers do not retry in lockstep.
+        ceiling = min(self.options.max_backoff_seconds, self.options.backoff_seconds * 2**attempt)
+        with self._lock:
+            jittered = self._rng.uniform(0.0, ceiling)
+        return max(jittered, retry_after_seconds(exc))
+
+    def _call(self, name: str, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as exc:
+                elapsed = time.perf_counter() - started
+                status = error_status(exc)
+                retry = attempt < self.options.max_retries and is_retryable(name, status)
+                with self._lock:
+                    stats = self._endpoint(name)
+                    stats.observe(elapsed)
+                    stats.errors[str(status) if status is not None else type(exc).__name__] += 1
+                    if retry:
+                        stats.retries += 1
+                if not retry:
+                    raise
+                self._sleep(self.backoff_seconds(attempt, exc))
+                attempt += 1
+                continue
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._endpoint(name).observe(elapsed)
+            return result
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {name: s.snapshot() for name, s in sorted(self._stats.items())}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+_shared_lock = threading.Lock()
+_shared: InstrumentedClient | None = None
+_shared_pid: int | None = None
+
+
+def build_client(settings: IstariSettings, options: ClientOptions) -> Client:
+    from istari_digital_client import Client, Configuration
+
     config = Configuration(
         registry_url=settings.registry_url,
         registry_auth_token=settings.auth_token,
     )
+    # Generated SDK configurations size the urllib3 pool here (default: a handful of connections).
+    if hasattr(config, "connection_pool_maxsize"):
+        config.connection_pool_maxsize = options.pool_size
     return Client(config)
 
 
+def get_client(options: ClientOptions | None = None) -> InstrumentedClient:
+    """Process-wide shared client; ``options`` only apply when it is first built."""
+    global _shared, _shared_pid
+    with _shared_lock:
+        # A forked child must not reuse the parent's sockets.
+        if _shared is None or _shared_pid != os.getpid():
+            options = options or ClientOptions.from_env()
+            _shared = InstrumentedClient(build_client(load_settings(), options), options)
+            _shared_pid = os.getpid()
+        return _shared
+
+
+def reset_client() -> None:
+    global _shared, _shared_pid
+    with _shared_lock:
+        _shared, _shared_pid = None, None
+
+
+def client_stats(client: Any = None) -> dict[str, dict[str, Any]]:
+    """Per-endpoint stats of ``client`` (default: the shared client); {} when uninstrumented."""
+    client = _shared if client is None else client
+    stats = getattr(client, "stats", None)
+    return stats() if callable(stats) else {}
+
+
+def format_client_stats(stats: dict[str, dict[str, Any]]) -> list[str]:
+    lines = []
+    for name, s in stats.items():
+        latency = s["latency_seconds"]
+        errors = ", ".join(f"{k}={v}" for k, v in sorted(s["errors"].items())) or "none"
+        lines.append(
+            f"{name:<20} calls={s['calls']:<7} retries={s['retries']:<5} "
+            f"p50={latency['p50'] * 1000:.0f}ms p95={latency['p95'] * 1000:.0f}ms "
+            f"max={latency['max'] * 1000:.0f}ms errors: {errors}"
+        )
+    return lines
+
+
 def page_items(page_like: Any) -> list[Any]:
     """Normalize SDK pagination responses across versions."""
     if page_like is None:
@@ -57,6 +328,253 @@ def page_items(page_like: Any) -> list[Any]:
     return [page_like]
 
 
+def _fetch_page(method: Callable[..., Any], page: int, page_size: int, kwargs: dict) -> tuple[list[Any], bool]:
+    response = method(page=page, size=page_size, **kwargs)
+    items = page_items(response)
+    # Last page: an empty one, or the final one when the response says how many there are.
+    pages = getattr(response, "pages", None)
+    return items, not items or (isinstance(pages, int) and page >= pages)
+
+
+def paginate(
+    method: Callable[..., Any],
+    page_size: int = 100,
+    max_pages: int | None = None,
+    prefetch: bool = True,
+    **kwargs: Any,
+) -> Iterator[Any]:
+    """Yield the items of every page of ``method(page=..., size=..., **kwargs)``.
+
+    At most two pages are held at once. Closing the generator early (``break``,
+    ``islice``) abandons the in-flight prefetch; its result is discarded.
+    """
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=1) if prefetch else None
+    try:
+        page = 1
+        items, last = _fetch_page(method, page, page_size, kwargs)
+        while True:
+            ahead = None
+            more = not last and (max_pages is None or page < max_pages)
+            if more and pool is not None:
+                ahead = pool.submit(_fetch_page, method, page + 1, page_size, kwargs)
+            yield from items
+            if not more:
+                return
+            page += 1
+            items, last = ahead.result() if ahead is not None else _fetch_page(method, page, page_size, kwargs)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def metadata_cache_dir() -> Path:
+    root = os.environ.get("ISTARI_CACHE_DIR") or Path(
+        os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    ) / "istari-quickstart"
+    return Path(root) / "metadata"
+
+
+def metadata_scope(registry_url: str | None = None, auth_token: str | None = None) -> str:
+    """Cache namespace per registry and identity; different users may see different catalogs."""
+    registry_url = os.getenv("ISTARI_DIGITAL_REGISTRY_URL", "") if registry_url is None else registry_url
+    auth_token = os.getenv("ISTARI_DIGITAL_REGISTRY_AUTH_TOKEN", "") if auth_token is None else auth_token
+    return hashlib.sha256(f"{registry_url}|{auth_token}".encode("utf-8")).hexdigest()[:16]
+
+
+def to_record(obj: Any) -> Any:
+    """JSON-ready form of an SDK model, keeping Python field names (not API aliases)."""
+    for method in ("model_dump", "to_dict"):
+        dump = getattr(obj, method, None)
+        if callable(dump):
+            return dump()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return asdict(obj)
+    if hasattr(obj, "__dict__"):
+        return {k: v for k, v in vars(obj).items() if not k.startswith("_")}
+    return obj
+
+
+def as_namespaces(records: list[Any]) -> list[Any]:
+    return json.loads(json.dumps(records), object_hook=lambda d: SimpleNamespace(**d))
+
+
+def fetch_listing(client: Any, kind: str, page_size: int = 100) -> list[Any]:
+    return list(paginate(getattr(client, METADATA_KINDS[kind][0]), page_size=page_size))
+
+
+def cached_listing(
+    client: Any,
+    kind: str,
+    ttl_seconds: float | None = None,
+    refresh: bool = False,
+    scope: str | None = None,
+) -> list[Any]:
+    """Every ``kind`` record as attribute-access namespaces, from cache when fresh.
+
+    ``refresh`` refetches and rewrites the entry. Without a usable cache
+    (TTL 0, unwritable directory) this is just ``fetch_listing``.
+    """
+    if ttl_seconds is None:
+        ttl_seconds = float(os.getenv("ISTARI_METADATA_TTL_SECONDS", METADATA_KINDS[kind][1]))
+    path = metadata_cache_dir() / f"{scope or metadata_scope()}-{kind}.json"
+    if ttl_seconds > 0 and not refresh:
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            if time.time() - float(entry["fetched_at"]) < ttl_seconds:
+                return as_namespaces(entry["records"])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    # Round-trip through JSON so cached and fresh results look the same to callers.
+    records = json.loads(json.dumps([to_record(r) for r in fetch_listing(client, kind)], default=str))
+    if ttl_seconds > 0:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"fetched_at": time.time(), "records": records}), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass
+    return as_namespaces(records)
+
+
+@dataclass(frozen=True)
+class ModelUpload:
+    path: Path
+    display_name: str
+    version_name: str = "v1.0.0"
+    # Only read-only inputs may be reused. A model that gets new versions (update_model,
+    # or add_job with a version_name) must be uploaded fresh, or runs mix their lineage.
+    reuse: bool = True
+
+
+def newest_revision_id(model: Any) -> str:
+    """Id of the model's most recently created revision (listings are not ordered by age)."""
+    revisions = list(getattr(getattr(model, "file", None), "revisions", None) or [])
+    if not revisions:
+        raise RuntimeError(f"No revisions found for model: {getattr(model, 'id', '<unknown>')}")
+    if len(revisions) == 1:
+        return str(revisions[0].id)
+    if any(getattr(r, "created", None) is None for r in revisions):
+        raise RuntimeError(f"Revisions of model {getattr(model, 'id', '<unknown>')} have no created timestamps")
+    return str(max(revisions, key=lambda r: r.created).id)
+
+
+def file_sha256(path: Path, chunk_bytes: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(chunk_bytes), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def upload_ledger_path(scope: str | None = None) -> Path:
+    return metadata_cache_dir().parent / "uploads" / f"{scope or metadata_scope()}.json"
+
+
+def upload_models(
+    client: Any,
+    uploads: dict[str, ModelUpload],
+    scope: str | None = None,
+    workers: int = 4,
+) -> tuple[dict[str, Any], dict[str, str], set[str]]:
+    """Upload ``uploads`` (key -> file).
+
+    Returns ``(models by key, revision ids by key, keys that reused a model)``.
+    The revision id is the one holding the uploaded bytes, so callers can pin
+    it even if the model gained newer versions since. A reusable file whose
+    SHA-256 is in the ledger resolves to that model via ``get_model``; a
+    404/410 there, or a recorded revision the model no longer has, drops the
+    stale entry and uploads again. Identical reusable files within one call
+    share a single upload.
+    """
+    ledger_path = upload_ledger_path(scope)
+    try:
+        ledger: dict[str, Any] = json.loads(ledger_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        ledger = {}
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        digests = dict(zip(uploads, pool.map(file_sha256, [u.path for u in uploads.values()])))
+        models: dict[str, Any] = {}
+        revisions: dict[str, str] = {}
+        reused: set[str] = set()
+        for key, upload in uploads.items():
+            entry = ledger.get(digests[key]) if upload.reuse else None
+            if entry is None:
+                continue
+            try:
+                model = client.get_model(entry["model_id"])
+            except Exception as exc:
+                if error_status(exc) not in (404, 410):
+                    raise
+                del ledger[digests[key]]
+                continue
+            known = {str(r.id) for r in getattr(getattr(model, "file", None), "revisions", None) or []}
+            if entry.get("revision_id") not in known:
+                # Entries from before revisions were recorded cannot say which revision holds the bytes.
+                del ledger[digests[key]]
+                continue
+            models[key] = model
+            revisions[key] = entry["revision_id"]
+            reused.add(key)
+
+        pending: dict[Any, list[str]] = {}
+        by_digest: dict[str, Any] = {}
+        for key, upload in uploads.items():
+            if key in models:
+                continue
+            if upload.reuse and digests[key] in by_digest:
+                pending[by_digest[digests[key]]].append(key)
+                continue
+            future = pool.submit(
+                client.add_model, path=upload.path, display_name=upload.display_name, version_name=upload.version_name
+            )
+            pending[future] = [key]
+            if upload.reuse:
+                by_digest[digests[key]] = future
+        # Record every upload that succeeded before re-raising, so a rerun does not repeat them.
+        error: Exception | None = None
+        for future, keys in pending.items():
+            try:
+                model = future.result()
+                revision_id = newest_revision_id(model)
+            except Exception as exc:
+                error = error or exc
+                continue
+            for key in keys:
+                models[key] = model
+                revisions[key] = revision_id
+            if uploads[keys[0]].reuse:
+                ledger[digests[keys[0]]] = {
+                    "model_id": str(getattr(model, "id", "")),
+                    "revision_id": revision_id,
+                    "path": str(uploads[keys[0]].path),
+                    "uploaded_at": time.time(),
+                }
+            if len(keys) > 1:
+                reused.update(keys[1:])
+
+    try:
+        ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = ledger_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(ledger, indent=2), encoding="utf-8")
+        os.replace(tmp, ledger_path)
+    except OSError:
+        pass
+    if error is not None:
+        raise error
+    return {key: models[key] for key in uploads}, {key: revisions[key] for key in uploads}, reused
+
+
+def invalidate_metadata(kind: str | None = None) -> int:
+    """Delete cached listings of ``kind`` (default: all kinds, every scope); returns files removed."""
+    removed = 0
+    for path in metadata_cache_dir().glob(f"*-{kind or '*'}.json"):
+        path.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
 def _field(obj: Any, name: str, default: str = "") -> str:
     value = getattr(obj, name, default)
     return str(value) if value is not None else default
@@ -70,5 +588,16 @@ def print_connection_summary() -> None:
     print(f"Connected as: {full_name} ({email})")
 
 
-if __name__ == "__main__":
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check Istari connectivity or manage the metadata cache.")
+    parser.add_argument("--clear-metadata-cache", nargs="?", const="all", choices=["all", *METADATA_KINDS])
+    args = parser.parse_args()
+    if args.clear_metadata_cache:
+        kind = None if args.clear_metadata_cache == "all" else args.clear_metadata_cache
+        print(f"Removed {invalidate_metadata(kind)} cached listing(s) from {metadata_cache_dir()}")
+        return
     print_connection_summary()
+
+
+if __name__ == "__main__":
+    main()
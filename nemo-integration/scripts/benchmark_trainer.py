@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""Benchmark the scaffold trainer phases across dataset sizes, backends and ensembles.
+
+Each cell is (rows, features, backend, ensemble_size). Its synthetic CSV is
+written once (untimed), then a fresh process times the phases the trainer
+actually runs and reports its peak RSS:
+
+    load_csv   load_csv_dataset
+    split      split_dataset
+    fit        fit_surrogate (feature map, chunked or bootstrap statistics, solve)
+    predict    predict_distribution over all rows
+
+Cells whose float64 input matrix would exceed ``--max-matrix-gb`` are skipped,
+so the ``full`` profile (1e3..1e7 rows, 8..512 features) adapts to the machine.
+
+Timings are compared with stored baselines after dividing both by a fixed
+calibration workload timed on the same machine (before and after the cells,
+keeping the slower), which absorbs most CPU-speed differences. A phase regresses when its normalized time exceeds the baseline by
+more than ``--threshold`` and by more than ``--min-seconds`` of wall time. A
+cell's peak RSS regresses when it exceeds the baseline by more than
+``--threshold`` and by more than ``--min-mb``.
+
+It also runs the function runner end to end on the tiny test input
+(``--cold-start-runs`` times, hardware probe cache warm) and fails if the
+median wall time exceeds ``--cold-start-target`` seconds.
+
+Usage:
+    python3 scripts/benchmark_trainer.py --profile quick                   # compare with baselines
+    python3 scripts/benchmark_trainer.py --profile quick --update-baseline # record new baselines
+    python3 scripts/benchmark_trainer.py --profile full --max-matrix-gb 4 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+MODULE_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = MODULE_DIR / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from train_nemo_surrogate import DEFAULT_CONFIG, fit_surrogate, load_csv_dataset, predict_distribution, split_dataset
+
+DEFAULT_BASELINES = MODULE_DIR / "benchmarks" / "trainer_baselines.json"
+COLD_START_INPUT = MODULE_DIR / "test_files" / "train_nemo_surrogate" / "input.json"
+COLD_START_TARGET_SECONDS = 1.0
+PHASES = ("load_csv", "split", "fit", "predict")
+PROFILES = {
+    # Small enough to run on every test.sh invocation.
+    "quick": [
+        (1_000, 8, "baseline_mlp", 0),
+        (10_000, 8, "baseline_mlp", 0),
+        (10_000, 64, "baseline_mlp", 0),
+        (100_000, 8, "baseline_mlp", 0),
+        (10_000, 8, "random_fourier", 0),
+        (10_000, 8, "polynomial", 0),
+        (20_000, 8, "random_fourier", 8),
+    ],
+    "full": [
+        *[
+            (rows, features, "baseline_mlp", 0)
+            for rows in (10**3, 10**4, 10**5, 10**6, 10**7)
+            for features in (8, 32, 128, 512)
+        ],
+        *[
+            (rows, 8, backend, ensemble_size)
+            for rows in (10**3, 10**4, 10**5, 10**6)
+            for backend, ensemble_size in (("random_fourier", 0), ("polynomial", 0), ("random_fourier", 16))
+        ],
+    ],
+}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--baselines", default=str(DEFAULT_BASELINES))
+    parser.add_argument("--update-baseline", action="store_true", help="Write results into the baselines file")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Allowed normalized slowdown (0.5 = +50%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.05, help="Ignore regressions smaller than this")
+    parser.add_argument("--min-mb", type=float, default=64.0, help="Ignore peak RSS growth smaller than this")
+    parser.add_argument("--max-matrix-gb", type=float, default=2.0, help="Skip cells with a larger feature matrix")
+    parser.add_argument("--repeats", type=int, default=1, help="Runs per cell; the fastest is kept")
+    parser.add_argument("--cold-start-runs", type=int, default=3, help="End-to-end runner runs (0 to skip)")
+    parser.add_argument("--cold-start-target", type=float, default=COLD_START_TARGET_SECONDS)
+    parser.add_argument("--output", default="", help="Optional JSON results path")
+    return parser.parse_args()
+
+
+def cell_key(rows: int, features: int, backend: str, ensemble_size: int) -> str:
+    key = f"{rows}x{features}/{backend}"
+    return f"{key}/ens{ensemble_size}" if ensemble_size else key
+
+
+def result_key(result: dict) -> str:
+    return cell_key(result["rows"], result["features"], result["backend"], result["ensemble_size"])
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def write_synthetic_csv(path: Path, rows: int, features: int, seed: int = 0, chunk_rows: int = 100_000) -> None:
+    rng = np.random.default_rng(seed)
+    weights = rng.normal(size=features)
+    header = ",".join([f"x{i}" for i in range(features)] + ["target"])
+    with path.open("w", encoding="utf-8") as f:
+        f.write(header + "\n")
+        for start in range(0, rows, chunk_rows):
+            x = rng.normal(size=(min(chunk_rows, rows - start), features))
+            y = x @ weights + 0.01 * rng.normal(size=x.shape[0])
+            np.savetxt(f, np.column_stack([x, y]), fmt="%.6g", delimiter=",")
+
+
+def calibrate() -> float:
+    """Seconds for a fixed mix of Python parsing and BLAS work (best of 3)."""
+    lines = [",".join(f"{(i * 7 + j) % 97 / 13:.6g}" for j in range(16)) for i in range(20_000)]
+    a = np.random.default_rng(0).normal(size=(384, 384))
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        parsed = [[float(v) for v in line.split(",")] for line in lines]
+        for _ in range(10):
+            b = a @ a
+        best = min(best, time.perf_counter() - started)
+        del parsed, b
+    return best
+
+
+def run_cell(csv_path: str, rows: int, features: int, backend: str, ensemble_size: int) -> dict:
+    timings: dict[str, float] = {}
+    started = time.perf_counter()
+    dataset = load_csv_dataset(Path(csv_path), {"target_column": "target"})
+    timings["load_csv"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    x_train, y_train, x_val, y_val = split_dataset(dataset.features, dataset.targets, 0.2, 42)
+    timings["split"] = time.perf_counter() - started
+
+    config = dict(DEFAULT_CONFIG, backend=backend, ensemble_size=ensemble_size)
+    started = time.perf_counter()
+    model = fit_surrogate(x_train, y_train, backend, config)
+    timings["fit"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    predict_distribution(model, dataset.features)
+    timings["predict"] = time.perf_counter() - started
+
+    return {
+        "rows": rows,
+        "features": features,
+        "backend": backend,
+        "ensemble_size": ensemble_size,
+        "seconds": timings,
+        "rows_per_second": {phase: rows / max(seconds, 1e-9) for phase, seconds in timings.items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def cold_start(runs: int) -> dict:
+    """Median wall time of the runner on the tiny test input, after one untimed warm-up run."""
+    walls, to_main = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        command = [
+            sys.executable,
+            str(SRC_DIR / "train_nemo_surrogate.py"),
+            str(COLD_START_INPUT),
+            str(Path(tmp) / "output.json"),
+            tmp,
+        ]
+        for i in range(runs + 1):
+            started = time.perf_counter()
+            subprocess.run(command, check=True, cwd=MODULE_DIR, stdout=subprocess.DEVNULL)
+            if i == 0:
+                continue  # populates the hardware probe cache
+            walls.append(time.perf_counter() - started)
+            startup = json.loads((Path(tmp) / "metrics.json").read_text(encoding="utf-8"))["startup"]
+            to_main.append(startup["time_to_main_seconds"])
+    return {
+        "runs": runs,
+        "median_wall_seconds": statistics.median(walls),
+        "median_time_to_main_seconds": statistics.median(to_main) if None not in to_main else None,
+    }
+
+
+def in_fresh_process(fn, *args):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(fn, *args).result()
+
+
+def compare(
+    result: dict,
+    calibration: float,
+    baselines: dict,
+    threshold: float,
+    min_seconds: float,
+    min_mb: float,
+) -> list[str]:
+    cell = result_key(result)
+    base = baselines.get("cells", {}).get(cell)
+    if not base:
+        return []
+    base_cal = float(base["calibration_seconds"])
+    regressions = []
+    for phase in PHASES:
+        now, before = result["seconds"][phase], base["seconds"].get(phase)
+        if before is None:
+            continue
+        expected = before * calibration / base_cal
+        if now > expected * (1.0 + threshold) and now - expected > min_seconds:
+            regressions.append(f"{cell} {phase}: {now:.3f}s vs {expected:.3f}s expected")
+    # Memory does not scale with CPU speed, so peak RSS is compared as recorded.
+    before_mb = base.get("peak_rss_mb")
+    if before_mb is not None:
+        now_mb = result["peak_rss_mb"]
+        if now_mb > before_mb * (1.0 + threshold) and now_mb - before_mb > min_mb:
+            regressions.append(f"{cell} peak RSS: {now_mb:.0f} MB vs {before_mb:.0f} MB")
+    return regressions
+
+
+def main() -> int:
+    args = parse_args()
+    baselines_path = Path(args.baselines)
+    baselines = json.loads(baselines_path.read_text(encoding="utf-8")) if baselines_path.exists() else {}
+    calibration = in_fresh_process(calibrate)
+    print(f"{'cell':>34} " + " ".join(f"{p:>9}" for p in PHASES) + f" {'peak MB':>9}")
+
+    results, regressions = [], []
+    budget = args.max_matrix_gb * 1024**3
+    with tempfile.TemporaryDirectory() as tmp:
+        profile_cells = PROFILES[args.profile]
+        for index, (rows, features, backend, ensemble_size) in enumerate(profile_cells):
+            cell = cell_key(rows, features, backend, ensemble_size)
+            if rows * features * 8 > budget:
+                print(f"{cell:>34} skipped (matrix exceeds --max-matrix-gb)")
+                continue
+            # Cells that differ only in backend or ensemble share one CSV.
+            csv_path = Path(tmp) / f"{rows}x{features}.csv"
+            if not csv_path.exists():
+                write_synthetic_csv(csv_path, rows, features)
+            runs = [
+                in_fresh_process(run_cell, str(csv_path), rows, features, backend, ensemble_size)
+                for _ in range(max(1, args.repeats))
+            ]
+            if all(later[:2] != (rows, features) for later in profile_cells[index + 1:]):
+                csv_path.unlink()
+            result = min(runs, key=lambda r: sum(r["seconds"].values()))
+            results.append(result)
+            print(
+                f"{cell:>34} "
+                + " ".join(f"{result['seconds'][p]:>9.3f}" for p in PHASES)
+                + f" {result['peak_rss_mb']:>9.1f}"
+            )
+
+    cold = cold_start(args.cold_start_runs) if args.cold_start_runs > 0 else None
+    if cold:
+        print(
+            f"{'cold start':>34} {cold['median_wall_seconds']:>9.3f}s median wall "
+            f"(target {args.cold_start_target:.2f}s, {cold['runs']} runs)"
+        )
+        if args.cold_start_target > 0 and cold["median_wall_seconds"] > args.cold_start_target:
+            regressions.append(
+                f"cold start: {cold['median_wall_seconds']:.3f}s exceeds target {args.cold_start_target:.2f}s"
+            )
+
+    # Shared machines drift; the slower calibration avoids flagging a transient speedup as a regression.
+    calibration = max(calibration, in_fresh_process(calibrate))
+    print(f"[benchmark_trainer] profile={args.profile} calibration={calibration:.3f}s")
+    if baselines and not args.update_baseline:
+        for result in results:
+            regressions += compare(result, calibration, baselines, args.threshold, args.min_seconds, args.min_mb)
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps({"calibration_seconds": calibration, "results": results, "cold_start": cold}, indent=2), encoding="utf-8"
+        )
+    if args.update_baseline:
+        # Cells keep their own calibration, so profiles can be recorded separately.
+        cells = dict(baselines.get("cells", {}))
+        for r in results:
+            cells[result_key(r)] = {
+                "seconds": r["seconds"],
+                "peak_rss_mb": r["peak_rss_mb"],
+                "calibration_seconds": calibration,
+                "machine": platform.platform(),
+            }
+        baselines_path.parent.mkdir(parents=True, exist_ok=True)
+        baselines_path.write_text(json.dumps({"cells": cells}, indent=2), encoding="utf-8")
+        print(f"[benchmark_trainer] wrote baselines: {baselines_path}")
+        return 0
+    if not baselines:
+        print(f"[benchmark_trainer] no baselines at {baselines_path}; run with --update-baseline to record them")
+        return 0
+    if regressions:
+        print(f"[benchmark_trainer] {len(regressions)} regression(s) beyond +{args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  REGRESSION  {line}")
+        return 1
+    print("[benchmark_trainer] no regressions against baselines")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
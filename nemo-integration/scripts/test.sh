@@ -24,7 +24,7 @@ echo "=== Verifying outputs ==="
 PASS=0
 FAIL=0
 
-for expected in metrics.json model_checkpoint.npz training_report.md; do
+for expected in metrics.json model_checkpoint.npz model_checkpoint.nsc training_report.md; do
     if [ -f "$TEMP_DIR/$expected" ]; then
         SIZE=$(wc -c < "$TEMP_DIR/$expected" | tr -d ' ')
         echo "  PASS  $expected ($SIZE bytes)"
@@ -54,6 +54,258 @@ if [ -f "$TEMP_DIR/metrics.json" ]; then
     fi
 fi
 
+echo ""
+echo "=== Checkpoint round trip ==="
+
+# Both formats from the CLI (random_fourier ensemble, float64 and float32), loaded back by path string.
+RT_DIR="$TEMP_DIR/round_trip"
+mkdir -p "$RT_DIR"
+if python3 - "$INPUT_FILE" "$RT_DIR" <<'PY'
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, "src")
+from train_nemo_surrogate import load_checkpoint, load_csv_dataset, predict_distribution
+
+payload = json.loads(Path(sys.argv[1]).read_text())
+csv_path = Path(payload["campaign_root_model"]["value"]).resolve()
+payload["campaign_root_model"]["value"] = str(csv_path)
+base = json.loads(payload["training_config"]["value"])
+root = Path(sys.argv[2])
+for dtype in ("float64", "float32"):
+    run = root / dtype
+    run.mkdir(exist_ok=True)
+    config = dict(base, backend="random_fourier", rff_features=64, ensemble_size=4, save_stats=True, checkpoint_dtype=dtype)
+    payload["training_config"]["value"] = json.dumps(config)
+    (run / "input.json").write_text(json.dumps(payload))
+    with (run / "train.log").open("w") as log:
+        subprocess.run(
+            [sys.executable, "src/train_nemo_surrogate.py", str(run / "input.json"), str(run / "output.json"), str(run)],
+            check=True, stdout=log, stderr=subprocess.STDOUT,
+        )
+
+dataset = load_csv_dataset(csv_path, base)
+x, spread = dataset.features, float(dataset.targets.std())
+# Mean and predictive std of the float64 .npz are the reference.
+reference = predict_distribution(load_checkpoint(str(root / "float64" / "model_checkpoint.npz"))[0], x)
+failed = False
+for label, path, tolerance in (
+    (".nsc float64", root / "float64" / "model_checkpoint.nsc", 1e-12),
+    (".nsc float32", root / "float32" / "model_checkpoint.nsc", 1e-5),
+):
+    model, names = load_checkpoint(str(path))
+    mean, var = predict_distribution(model, x)
+    err = max(np.abs(mean - reference[0]).max(), np.abs(np.sqrt(var) - np.sqrt(reference[1])).max()) / spread
+    ok = err <= tolerance
+    failed |= not ok
+    print(f"  {'ok  ' if ok else 'BAD '} {label:<13} vs .npz: {err:.1e} of the target spread (limit {tolerance:.0e})")
+
+stats = root / "float64" / "model_stats.npz"
+with np.load(stats, allow_pickle=False) as data:
+    ok = set(data.files) == {"gram", "xty", "train_rows"} and data["gram"].dtype == np.float64
+model, _ = load_checkpoint(str(root / "float64" / "model_checkpoint.nsc"), stats_path=str(stats))
+ok = ok and model.gram.shape == (4, 65, 65) and model.xty.shape == model.weights.shape
+failed |= not ok
+print(f"  {'ok  ' if ok else 'BAD '} model_stats.npz loads with allow_pickle=False and attaches gram {model.gram.shape}")
+sys.exit(1 if failed else 0)
+PY
+then
+    echo "  PASS  .nsc and .npz checkpoints agree; model_stats.npz loads"
+    PASS=$((PASS + 1))
+else
+    echo "  FAIL  checkpoint round trip (see $RT_DIR)"
+    FAIL=$((FAIL + 1))
+fi
+
+echo ""
+echo "=== Warm start ==="
+
+# Batch A from scratch, then batch B warm-started through the CLI; the reference refits the
+# training rows of both batches from scratch with A's frozen feature map.
+WS_DIR="$TEMP_DIR/warm_start"
+mkdir -p "$WS_DIR"
+if python3 - "$WS_DIR" <<'PY'
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, "src")
+from train_nemo_surrogate import (
+    SurrogateModel,
+    accumulate_normal_equations,
+    load_checkpoint,
+    predict_surrogate,
+    solve_ridge,
+    split_dataset,
+)
+
+root = Path(sys.argv[1])
+rng = np.random.default_rng(3)
+batches = {}
+for name, rows in (("a", 2000), ("b", 800)):
+    x = rng.normal(size=(rows, 3))
+    y = np.sin(x).sum(axis=1) + 0.01 * rng.normal(size=rows)
+    batches[name] = (x, y)
+    np.savetxt(root / f"{name}.csv", np.column_stack([x, y]), delimiter=",", header="x0,x1,x2,target", comments="")
+
+
+def train(name, config, **inputs):
+    run = root / name
+    run.mkdir(exist_ok=True)
+    payload = {
+        "campaign_root_model": {"type": "user_model", "value": str(root / f"{name}.csv")},
+        "training_config": {"type": "parameter", "value": json.dumps(config)},
+        **{key: {"type": "user_model", "value": str(value)} for key, value in inputs.items()},
+    }
+    (run / "input.json").write_text(json.dumps(payload))
+    with (run / "train.log").open("w") as log:
+        subprocess.run(
+            [sys.executable, "src/train_nemo_surrogate.py", str(run / "input.json"), str(run / "output.json"), str(run)],
+            check=True, stdout=log, stderr=subprocess.STDOUT,
+        )
+    return run
+
+
+base = {"target_column": "target", "val_split": 0.2, "random_seed": 7}
+first = train("a", dict(base, backend="random_fourier", rff_features=64, rff_lengthscale=0.7, save_stats=True))
+# The warm run does not repeat the feature-map settings; they come from the checkpoint.
+second = train("b", base, previous_checkpoint=first / "model_checkpoint.nsc")
+
+previous, _ = load_checkpoint(first / "model_checkpoint.nsc")
+warm, _ = load_checkpoint(second / "model_checkpoint.nsc")
+x_train = np.vstack([split_dataset(*batches[name], 0.2, 7)[0] for name in ("a", "b")])
+y_train = np.concatenate([split_dataset(*batches[name], 0.2, 7)[1] for name in ("a", "b")])
+gram, xty = accumulate_normal_equations(x_train, y_train, previous.feature_map, 65536)
+weights = solve_ridge(gram, xty, 1e-6)
+reported = json.loads((second / "metrics.json").read_text())["training_config"]
+
+failed = False
+err = np.abs(warm.weights - weights).max() / np.abs(weights).max()
+ok = warm.train_rows == x_train.shape[0] and err < 1e-6
+failed |= not ok
+print(f"  {'ok  ' if ok else 'BAD '} warm-start weights vs refit on {x_train.shape[0]} rows: {err:.1e} relative")
+refit = SurrogateModel(weights=weights, feature_map=previous.feature_map)
+pred = np.abs(predict_surrogate(warm, x_train) - predict_surrogate(refit, x_train)).max() / y_train.std()
+ok = pred < 1e-8
+failed |= not ok
+print(f"  {'ok  ' if ok else 'BAD '} predictions agree to {pred:.1e} of the target spread")
+ok = reported["backend"] == "random_fourier" and reported["rff_features"] == 64 and reported["rff_lengthscale"] is None
+failed |= not ok
+print(f"  {'ok  ' if ok else 'BAD '} metrics.json reports the inherited map: rff_features={reported['rff_features']}")
+sys.exit(1 if failed else 0)
+PY
+then
+    echo "  PASS  warm start matches a from-scratch fit with the same feature map"
+    PASS=$((PASS + 1))
+else
+    echo "  FAIL  warm start (see $WS_DIR)"
+    FAIL=$((FAIL + 1))
+fi
+
+echo ""
+echo "=== Data-parallel parity ==="
+
+# Sharded statistics are summed in a different order, so fits agree to a tolerance, not bit for bit.
+if python3 - <<'PY'
+import sys
+
+import numpy as np
+
+sys.path.insert(0, "src")
+from train_nemo_surrogate import DEFAULT_CONFIG, fit_surrogate, predict_surrogate
+
+rng = np.random.default_rng(0)
+x = rng.normal(size=(5000, 4))
+y = np.sin(x).sum(axis=1) + 0.01 * rng.normal(size=5000)
+failed = False
+for backend in ("baseline_mlp", "random_fourier", "polynomial"):
+    for ensemble_size in (0, 5):
+        config = dict(DEFAULT_CONFIG, backend=backend, ensemble_size=ensemble_size, chunk_rows=300)
+        serial = fit_surrogate(x, y, backend, config)
+        sharded = fit_surrogate(x, y, backend, dict(config, data_workers=3))
+        gram = np.abs(sharded.gram - serial.gram).max() / np.abs(serial.gram).max()
+        weights = np.abs(sharded.weights - serial.weights).max() / np.abs(serial.weights).max()
+        pred = np.abs(predict_surrogate(sharded, x) - predict_surrogate(serial, x)).max() / y.std()
+        ok = gram < 1e-12 and weights < 1e-6 and pred < 1e-8
+        failed |= not ok
+        print(f"  {'ok  ' if ok else 'BAD '} {backend:<15} ensemble={ensemble_size} "
+              f"gram {gram:.1e}  weights {weights:.1e}  predictions {pred:.1e}")
+sys.exit(1 if failed else 0)
+PY
+then
+    echo "  PASS  data_workers=3 matches the serial fit within tolerance"
+    PASS=$((PASS + 1))
+else
+    echo "  FAIL  data_workers=3 differs from the serial fit beyond tolerance"
+    FAIL=$((FAIL + 1))
+fi
+
+echo ""
+echo "=== Data-parallel training over a stats worker ==="
+
+# Multi-host mode through the CLI: one worker on a Unix socket, same config as above.
+DP_DIR="$TEMP_DIR/data_parallel"
+SOCKET_DIR="$(mktemp -d)"
+mkdir -p "$DP_DIR"
+export NEMO_STATS_AUTHKEY="test-$$-$RANDOM"
+python3 src/stats_worker.py --listen "$SOCKET_DIR/stats.sock" > "$DP_DIR/stats_worker.log" 2>&1 &
+WORKER_PID=$!
+trap 'kill $WORKER_PID 2>/dev/null || true; rm -rf "$SOCKET_DIR"' EXIT
+for _ in $(seq 50); do
+    [ -S "$SOCKET_DIR/stats.sock" ] && break
+    sleep 0.1
+done
+python3 - "$INPUT_FILE" "$DP_DIR/input.json" "$SOCKET_DIR/stats.sock" <<'PY'
+import json, sys
+from pathlib import Path
+
+payload = json.loads(Path(sys.argv[1]).read_text())
+payload["campaign_root_model"]["value"] = str(Path(payload["campaign_root_model"]["value"]).resolve())
+config = json.loads(payload["training_config"]["value"])
+config["data_parallel_hosts"] = [sys.argv[3]]
+payload["training_config"]["value"] = json.dumps(config)
+Path(sys.argv[2]).write_text(json.dumps(payload))
+PY
+if python3 src/train_nemo_surrogate.py "$DP_DIR/input.json" "$DP_DIR/output_manifest.json" "$DP_DIR" > "$DP_DIR/train.log" 2>&1 \
+    && python3 -c "
+import numpy as np, sys
+a = np.load('$TEMP_DIR/model_checkpoint.npz')['weights']
+b = np.load('$DP_DIR/model_checkpoint.npz')['weights']
+sys.exit(0 if np.allclose(a, b, rtol=1e-6, atol=1e-9) else 1)
+"; then
+    echo "  PASS  stats_worker fit matches the single-process fit"
+    PASS=$((PASS + 1))
+else
+    echo "  FAIL  stats_worker fit (see $DP_DIR/train.log, $DP_DIR/stats_worker.log)"
+    FAIL=$((FAIL + 1))
+fi
+kill $WORKER_PID 2>/dev/null || true
+
+echo ""
+echo "=== Trainer benchmark (quick profile) ==="
+
+# Wall-clock timings depend on the machine and its load, so regressions only warn by default.
+# Set BENCH_GATE=1 to fail on them (on a quiet, calibrated host), SKIP_BENCHMARK=1 to skip,
+# or BENCHMARK_THRESHOLD to loosen the comparison.
+if [ "${SKIP_BENCHMARK:-0}" = "1" ]; then
+    echo "  SKIP  benchmark (SKIP_BENCHMARK=1)"
+elif python3 scripts/benchmark_trainer.py --profile quick --threshold "${BENCHMARK_THRESHOLD:-0.5}"; then
+    echo "  PASS  no performance regressions"
+    PASS=$((PASS + 1))
+elif [ "${BENCH_GATE:-0}" = "1" ]; then
+    echo "  FAIL  performance regression against benchmarks/trainer_baselines.json"
+    FAIL=$((FAIL + 1))
+else
+    echo "  WARN  performance regression against benchmarks/trainer_baselines.json (set BENCH_GATE=1 to fail)"
+fi
+
 echo ""
 echo "=== Results: $PASS passed, $FAIL failed ==="
 
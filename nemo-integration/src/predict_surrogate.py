@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Streaming batch prediction for scaffold surrogate checkpoints.
+
+Evaluates a checkpoint on large design sweeps without loading the inputs into
+memory. Inputs are a CSV with a header row (columns matched by name to the
+checkpoint's ``feature_names``) or a 2-D ``.npy`` array (memory-mapped). Rows
+are split into chunks that a process pool predicts independently, writing
+straight into a memory-mapped ``.npy`` output, so memory is bounded by
+``--chunk-rows`` times the number of workers rather than by the input size.
+
+Usage:
+    python3 predict_surrogate.py --checkpoint model_checkpoint.nsc --input designs.csv --output pred.npy
+    python3 predict_surrogate.py --checkpoint model_checkpoint.nsc --input designs.npy --output pred.npy \\
+        --npy-columns pressure_pa,youngs_modulus,poisson_ratio --with-variance
+
+The output has shape ``(rows,)``, or ``(rows, 2)`` holding ``[mean, variance]``
+with ``--with-variance``. CSV rows that fail to parse produce NaN.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from train_nemo_surrogate import SurrogateModel, load_checkpoint, predict_distribution
+
+# Per-process state opened once by init_worker.
+_WORKER: dict[str, Any] = {}
+
+
+def csv_chunk_offsets(path: Path, chunk_rows: int) -> tuple[list[str], list[tuple[int, int]]]:
+    """Return the header and ``(byte_offset, rows)`` for each chunk of data rows.
+
+    Only the chunk boundaries are kept, so the scan uses constant memory.
+    Assumes one record per line (no quoted newlines), which holds for numeric sweeps.
+    """
+    chunks: list[tuple[int, int]] = []
+    with path.open("rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8")]), [])
+        start = f.tell()
+        rows = 0
+        for line in iter(f.readline, b""):
+            if not line.strip():
+                continue
+            rows += 1
+            if rows == chunk_rows:
+                chunks.append((start, rows))
+                start, rows = f.tell(), 0
+        if rows:
+            chunks.append((start, rows))
+    return [h.strip() for h in header], chunks
+
+
+def column_indices(available: list[str], feature_names: list[str], source: str) -> list[int]:
+    missing = [name for name in feature_names if name not in available]
+    if missing:
+        raise ValueError(f"{source} is missing checkpoint features {missing} (has {available})")
+    return [available.index(name) for name in feature_names]
+
+
+def init_worker(checkpoint: str, output: str) -> None:
+    model, _ = load_checkpoint(Path(checkpoint))
+    _WORKER.update(model=model, output=np.load(output, mmap_mode="r+"))
+
+
+def write_predictions(model: SurrogateModel, output: np.ndarray, row_offset: int, x: np.ndarray) -> None:
+    mean, variance = predict_distribution(model, x, chunk_rows=x.shape[0] or 1)
+    if output.ndim == 2:
+        output[row_offset:row_offset + x.shape[0], 0] = mean
+        output[row_offset:row_offset + x.shape[0], 1] = variance
+    else:
+        output[row_offset:row_offset + x.shape[0]] = mean
+
+
+def predict_csv_chunk(path: str, byte_offset: int, rows: int, row_offset: int, columns: list[int]) -> int:
+    x = np.full((rows, len(columns)), np.nan, dtype=np.float64)
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        f.seek(byte_offset)
+        lines = (line for line in f if line.strip())
+        for i, record in enumerate(csv.reader(lines)):
+            if i >= rows:
+                break
+            try:
+                x[i] = [float(record[c]) for c in columns]
+            except (IndexError, ValueError):
+                continue
+    write_predictions(_WORKER["model"], _WORKER["output"], row_offset, x)
+    return rows
+
+
+def predict_npy_chunk(path: str, start: int, stop: int, columns: list[int]) -> int:
+    source = np.load(path, mmap_mode="r")
+    x = np.asarray(source[start:stop][:, columns], dtype=np.float64)
+    write_predictions(_WORKER["model"], _WORKER["output"], start, x)
+    return stop - start
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Stream batch predictions from a surrogate checkpoint.")
+    parser.add_argument("--checkpoint", required=True, help="Path to model_checkpoint.nsc or .npz")
+    parser.add_argument("--input", required=True, help="Input .csv (with header) or 2-D .npy")
+    parser.add_argument("--output", required=True, help="Output .npy (memory-mapped while writing)")
+    parser.add_argument("--chunk-rows", type=int, default=65536)
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: all cores)")
+    parser.add_argument(
+        "--npy-columns",
+        default="",
+        help="Comma-delimited column names of the .npy input (default: checkpoint feature order)",
+    )
+    parser.add_argument("--with-variance", action="store_true", help="Write [mean, variance] per row")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    checkpoint = Path(args.checkpoint).resolve()
+    input_path = Path(args.input).resolve()
+    output_path = Path(args.output).resolve()
+    chunk_rows = max(1, args.chunk_rows)
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    started = time.time()
+
+    _, feature_names = load_checkpoint(checkpoint)
+    suffix = input_path.suffix.lower()
+    if suffix == ".csv":
+        header, chunks = csv_chunk_offsets(input_path, chunk_rows)
+        columns = column_indices(header, feature_names, str(input_path))
+        total_rows = sum(rows for _, rows in chunks)
+        tasks = []
+        row_offset = 0
+        for byte_offset, rows in chunks:
+            tasks.append((predict_csv_chunk, str(input_path), byte_offset, rows, row_offset, columns))
+            row_offset += rows
+    elif suffix == ".npy":
+        source = np.load(input_path, mmap_mode="r")
+        if source.ndim != 2:
+            raise ValueError(f".npy input must be 2-D (rows, features), got shape {source.shape}")
+        npy_columns = [c.strip() for c in args.npy_columns.split(",") if c.strip()] or feature_names
+        if len(npy_columns) != source.shape[1]:
+            raise ValueError(f"--npy-columns names {len(npy_columns)} columns but input has {source.shape[1]}")
+        columns = column_indices(npy_columns, feature_names, str(input_path))
+        total_rows = int(source.shape[0])
+        tasks = [
+            (predict_npy_chunk, str(input_path), start, min(start + chunk_rows, total_rows), columns)
+            for start in range(0, total_rows, chunk_rows)
+        ]
+        del source
+    else:
+        raise ValueError(f"Unsupported input type (expected .csv or .npy): {input_path}")
+
+    shape = (total_rows, 2) if args.with_variance else (total_rows,)
+    output = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.float64, shape=shape)
+    output.flush()
+    del output
+
+    done = 0
+    if workers == 1 or len(tasks) <= 1:
+        init_worker(str(checkpoint), str(output_path))
+        for fn, *task_args in tasks:
+            done += fn(*task_args)
+        _WORKER["output"].flush()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)),
+            initializer=init_worker,
+            initargs=(str(checkpoint), str(output_path)),
+        ) as pool:
+            futures = [pool.submit(fn, *task_args) for fn, *task_args in tasks]
+            for i, future in enumerate(futures, start=1):
+                done += future.result()
+                if i % 50 == 0 or i == len(futures):
+                    print(f"[predict_surrogate] {done}/{total_rows} rows", file=sys.stderr)
+
+    elapsed = max(time.time() - started, 1e-9)
+    print(
+        f"[predict_surrogate] wrote {output_path} shape={shape} "
+        f"in {elapsed:.2f}s ({total_rows / elapsed:,.0f} rows/s, {len(tasks)} chunks, {workers} workers)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
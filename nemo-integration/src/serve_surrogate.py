@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""Local micro-batching inference server for scaffold surrogate checkpoints.
+
+Loads a checkpoint written by train_nemo_surrogate.py once (``.nsc`` files are
+memory-mapped) and serves predictions over HTTP on TCP or a Unix socket.
+Concurrent requests are coalesced into one vectorized prediction per
+micro-batch; a batch closes when it reaches ``--max-batch-rows`` or when its
+oldest request has waited ``--max-wait-ms``.
+
+Usage:
+    python3 serve_surrogate.py --checkpoint model_checkpoint.nsc --port 8765
+    python3 serve_surrogate.py --checkpoint model_checkpoint.nsc --unix-socket /tmp/surrogate.sock
+
+Endpoints:
+    POST /predict  {"inputs": [[...], ...]} or {"records": [{"<feature>": v, ...}, ...]}
+    GET  /stats    request/row/batch counters, p50/p99 latency, throughput
+    GET  /health
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from train_nemo_surrogate import SurrogateModel, load_checkpoint, predict_distribution
+
+
+@dataclass
+class PendingRequest:
+    x: np.ndarray
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    done: threading.Event = field(default_factory=threading.Event)
+    mean: np.ndarray | None = None
+    variance: np.ndarray | None = None
+    error: str | None = None
+
+
+class ServerStats:
+    def __init__(self, window: int = 10000) -> None:
+        self._lock = threading.Lock()
+        self._latencies_ms: deque[float] = deque(maxlen=window)
+        self._batch_sizes: deque[int] = deque(maxlen=window)
+        self.started = time.time()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.errors = 0
+
+    def record_batch(self, requests: list[PendingRequest], finished_at: float) -> None:
+        with self._lock:
+            self.batches += 1
+            self._batch_sizes.append(len(requests))
+            for req in requests:
+                self.requests += 1
+                self.rows += int(req.x.shape[0])
+                self._latencies_ms.append((finished_at - req.enqueued_at) * 1000.0)
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            latencies = np.asarray(self._latencies_ms, dtype=np.float64)
+            batch_sizes = np.asarray(self._batch_sizes, dtype=np.float64)
+            uptime = max(time.time() - self.started, 1e-9)
+            return {
+                "uptime_seconds": round(uptime, 3),
+                "requests": self.requests,
+                "rows": self.rows,
+                "batches": self.batches,
+                "errors": self.errors,
+                "requests_per_second": self.requests / uptime,
+                "rows_per_second": self.rows / uptime,
+                "mean_requests_per_batch": float(batch_sizes.mean()) if batch_sizes.size else 0.0,
+                "latency_ms_p50": float(np.percentile(latencies, 50)) if latencies.size else 0.0,
+                "latency_ms_p99": float(np.percentile(latencies, 99)) if latencies.size else 0.0,
+                "latency_window": int(latencies.size),
+            }
+
+
+class MicroBatcher:
+    """Single prediction thread that drains the request queue in micro-batches."""
+
+    def __init__(
+        self,
+        model: SurrogateModel,
+        stats: ServerStats,
+        max_batch_rows: int,
+        max_wait_ms: float,
+    ) -> None:
+        self.model = model
+        self.stats = stats
+        self.max_batch_rows = max(1, max_batch_rows)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self._queue: queue.Queue[PendingRequest] = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, x: np.ndarray, timeout: float = 30.0) -> PendingRequest:
+        req = PendingRequest(x=x)
+        self._queue.put(req)
+        if not req.done.wait(timeout):
+            req.error = "prediction timed out"
+        return req
+
+    def _collect(self) -> list[PendingRequest]:
+        batch = [self._queue.get()]
+        rows = batch[0].x.shape[0]
+        deadline = batch[0].enqueued_at + self.max_wait
+        while rows < self.max_batch_rows:
+            remaining = deadline - time.perf_counter()
+            try:
+                req = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(req)
+            rows += req.x.shape[0]
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            try:
+                mean, variance = predict_distribution(self.model, np.vstack([req.x for req in batch]))
+            except Exception as exc:  # keep serving; report the failure to every caller in the batch
+                for req in batch:
+                    req.error = str(exc)
+                    req.done.set()
+                    self.stats.record_error()
+                continue
+            offset = 0
+            for req in batch:
+                n = req.x.shape[0]
+                req.mean = mean[offset:offset + n]
+                req.variance = variance[offset:offset + n]
+                offset += n
+            self.stats.record_batch(batch, time.perf_counter())
+            for req in batch:
+                req.done.set()
+
+
+def parse_inputs(body: dict[str, Any], feature_names: list[str]) -> np.ndarray:
+    if "records" in body:
+        records = body["records"]
+        if not isinstance(records, list):
+            raise ValueError("'records' must be a list of objects")
+        rows = [[float(r[name]) for name in feature_names] for r in records]
+    elif "inputs" in body:
+        rows = body["inputs"]
+    else:
+        raise ValueError("Request body needs 'inputs' (list of rows) or 'records' (list of objects)")
+    x = np.asarray(rows, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[None, :]
+    if x.ndim != 2 or x.shape[1] != len(feature_names) or x.shape[0] == 0:
+        raise ValueError(f"Expected non-empty rows of {len(feature_names)} features: {feature_names}")
+    return x
+
+
+class SurrogateRequestHandler(BaseHTTPRequestHandler):
+    """Reads ``batcher``, ``feature_names`` and ``verbose`` from the server (see make_server)."""
+
+    server_version = "SurrogateServer/0.1"
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:  # noqa: N802 (http.server naming)
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok", "feature_names": self.server.feature_names})
+        elif self.path == "/stats":
+            self._send_json(200, self.server.batcher.stats.snapshot())
+        else:
+            self._send_json(404, {"error": f"unknown path: {self.path}"})
+
+    def do_POST(self) -> None:  # noqa: N802 (http.server naming)
+        if self.path != "/predict":
+            self._send_json(404, {"error": f"unknown path: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", "0"))
+            x = parse_inputs(json.loads(self.rfile.read(length) or b"{}"), self.server.feature_names)
+        except (ValueError, KeyError, TypeError) as exc:
+            self.server.batcher.stats.record_error()
+            self._send_json(400, {"error": str(exc)})
+            return
+        req = self.server.batcher.submit(x)
+        if req.error is not None:
+            self._send_json(500, {"error": req.error})
+            return
+        self._send_json(200, {"mean": req.mean.tolist(), "variance": req.variance.tolist()})
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class SurrogateHTTPServer(ThreadingHTTPServer):
+    # Many concurrent clients is the point; the socketserver default backlog of 5 resets them.
+    request_queue_size = 256
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+    def server_bind(self) -> None:
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(args: argparse.Namespace) -> socketserver.BaseServer:
+    model, feature_names = load_checkpoint(Path(args.checkpoint))
+    stats = ServerStats()
+    batcher = MicroBatcher(model, stats, args.max_batch_rows, args.max_wait_ms)
+
+    if args.unix_socket:
+        sock_path = Path(args.unix_socket)
+        if sock_path.exists():
+            sock_path.unlink()
+        server: Any = ThreadingUnixHTTPServer(str(sock_path), SurrogateRequestHandler)
+    else:
+        server = SurrogateHTTPServer((args.host, args.port), SurrogateRequestHandler)
+    server.batcher = batcher
+    server.feature_names = feature_names
+    server.verbose = args.verbose
+    return server
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve a scaffold surrogate checkpoint with micro-batching.")
+    parser.add_argument("--checkpoint", required=True, help="Path to model_checkpoint.nsc or .npz")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", default="", help="Serve on this Unix socket path instead of TCP")
+    parser.add_argument("--max-batch-rows", type=int, default=4096)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="Latency budget for filling a micro-batch")
+    parser.add_argument("--verbose", action="store_true", help="Log every HTTP request")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    server = make_server(args)
+    where = args.unix_socket or f"http://{args.host}:{args.port}"
+    print(f"[serve_surrogate] serving {args.checkpoint} on {where} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.unix_socket and Path(args.unix_socket).exists():
+            Path(args.unix_socket).unlink()
+    print(f"[serve_surrogate] final stats: {json.dumps(server.batcher.stats.snapshot())}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
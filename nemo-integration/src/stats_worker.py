@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Remote worker for data-parallel surrogate training (sufficient statistics).
+
+The trainer streams chunk-aligned shards of the training rows to every address
+in ``training_config.data_parallel_hosts``; each worker lifts them through the
+trainer's feature map, accumulates the partial ``Phi^T Phi`` / ``Phi^T y``
+(stacked per bootstrap member for ensembles) and returns them, and the trainer
+tree-reduces the parts and solves. Each connection is one shard and is served
+on its own thread, so one worker can serve several shards or trainers.
+
+Connections use ``multiprocessing.connection`` authenticated with the shared
+secret in ``$NEMO_STATS_AUTHKEY`` (messages are pickled: only run workers on
+networks you trust, with a strong secret).
+
+Usage:
+    NEMO_STATS_AUTHKEY=... python3 stats_worker.py --listen 0.0.0.0:6100
+    NEMO_STATS_AUTHKEY=... python3 stats_worker.py --listen /tmp/nemo-stats.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import threading
+import traceback
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Connection, Listener
+
+from train_nemo_surrogate import FeatureMap, shard_normal_equations, stats_address, stats_authkey
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--listen", default="127.0.0.1:6100", help="host:port, or a Unix socket path")
+    return parser.parse_args()
+
+
+def serve_connection(conn: Connection) -> None:
+    with conn:
+        gram = xty = None
+        try:
+            _, map_fields, chunk_rows, replicates, seed = conn.recv()
+            feature_map = FeatureMap(**map_fields)
+            while True:
+                message = conn.recv()
+                if message[0] == "end":
+                    break
+                _, chunk_index, x, y = message
+                part = shard_normal_equations(x, y, feature_map, chunk_rows, replicates, seed, chunk_index)
+                gram, xty = part if gram is None else (gram + part[0], xty + part[1])
+            conn.send(("ok", (gram, xty)))
+        except EOFError:
+            pass
+        except Exception:
+            conn.send(("error", traceback.format_exc(limit=3)))
+
+
+def main() -> int:
+    args = parse_args()
+    with Listener(stats_address(args.listen), authkey=stats_authkey()) as listener:
+        print(f"[stats_worker] listening on {args.listen}")
+        while True:
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, OSError) as exc:  # wrong secret or a dropped client
+                print(f"[stats_worker] rejected connection: {exc}")
+                continue
+            threading.Thread(target=serve_connection, args=(conn,), daemon=True).start()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+"""Versioned, memory-mappable checkpoint container for the scaffold surrogate.
+
+Layout (all integers little-endian):
+
+    magic      8 bytes   b"NSURCKPT"
+    version    uint32
+    header_len uint32
+    header     header_len bytes of UTF-8 JSON, space-padded to ALIGNMENT
+    arrays     raw C-order array bytes, each starting on an ALIGNMENT boundary
+
+The JSON header holds free-form ``metadata`` plus an ``arrays`` table of
+``{name: {dtype, shape, offset, nbytes}}``. Nothing needs pickle to load, and
+the array block can be mapped read-only so many inference processes share one
+copy of the weights through the OS page cache.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+MAGIC = b"NSURCKPT"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_checkpoint(path: Path, arrays: dict[str, np.ndarray], metadata: dict[str, Any]) -> None:
+    contiguous = {name: np.ascontiguousarray(value) for name, value in arrays.items()}
+
+    # Offsets depend on the header length, which depends on the offsets; iterate until stable.
+    header_len = 0
+    while True:
+        offset = _align(_PREAMBLE.size + header_len)
+        table: dict[str, dict[str, Any]] = {}
+        for name, value in contiguous.items():
+            table[name] = {
+                "dtype": value.dtype.str,
+                "shape": list(value.shape),
+                "offset": offset,
+                "nbytes": int(value.nbytes),
+            }
+            offset = _align(offset + value.nbytes)
+        header = json.dumps(
+            {"format": "nemo-surrogate-checkpoint", "version": FORMAT_VERSION, "metadata": metadata, "arrays": table},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        padded_len = _align(_PREAMBLE.size + len(header)) - _PREAMBLE.size
+        if padded_len == header_len:
+            break
+        header_len = padded_len
+
+    with path.open("wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, header_len))
+        f.write(header.ljust(header_len, b" "))
+        for name, value in contiguous.items():
+            f.seek(table[name]["offset"])
+            value.tofile(f)
+        # Pad to the aligned end so zero-length trailing arrays still map cleanly.
+        f.truncate(offset)
+
+
+def read_header(path: Path) -> dict[str, Any]:
+    with path.open("rb") as f:
+        magic, version, header_len = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        if magic != MAGIC:
+            raise ValueError(f"Not a surrogate checkpoint (bad magic): {path}")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Checkpoint format v{version} is newer than supported v{FORMAT_VERSION}: {path}")
+        return json.loads(f.read(header_len).decode("utf-8"))
+
+
+def read_checkpoint(path: Path, use_mmap: bool = True) -> tuple[dict[str, Any], dict[str, np.ndarray]]:
+    """Return ``(metadata, arrays)``.
+
+    With ``use_mmap`` the arrays are read-only views over a shared file mapping;
+    otherwise they are private in-memory copies.
+    """
+    header = read_header(path)
+    with path.open("rb") as f:
+        if use_mmap:
+            buffer: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            buffer = f.read()
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=int(spec["offset"]))
+        arrays[name] = array.reshape(spec["shape"])
+    return header["metadata"], arrays
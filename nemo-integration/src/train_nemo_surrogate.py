@@ -13,18 +13,33 @@ Contract:
 from __future__ import annotations
 
 import csv
+import hashlib
+import itertools
 import json
+import os
 import platform
+import shutil
 import subprocess
 import sys
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+# Startup accounting: everything below is third-party or local and counted as import time.
+# Process pools, shared memory and torch are imported only where a code path needs them.
+_IMPORTS_STARTED = time.perf_counter()
 
 import numpy as np
 
+from phase_timing import PhaseSpans
+from surrogate_checkpoint import read_checkpoint, write_checkpoint
+
+if TYPE_CHECKING:
+    from multiprocessing import shared_memory
+
+_IMPORTS_SECONDS = time.perf_counter() - _IMPORTS_STARTED
 
 DEFAULT_CONFIG = {
     "backend": "baseline_mlp",
@@ -32,8 +47,43 @@ DEFAULT_CONFIG = {
     "val_split": 0.2,
     "random_seed": 42,
     "ridge_lambda": 1e-6,
+    "rff_features": 256,
+    "rff_lengthscale": 1.0,
+    "poly_degree": 2,
+    "chunk_rows": 65536,
+    "ensemble_size": 0,
+    "ensemble_workers": 1,
+    "sweep_workers": 0,
+    "checkpoint_dtype": "float64",
+    "trace": False,
+    "hardware_probe_ttl_seconds": 86400,
+    "fidelity_column": "fidelity",
+    "correction_backend": "baseline_mlp",
+    "load_workers": 0,
+    "data_workers": 1,
+    "data_parallel_hosts": [],
+    "save_stats": False,
 }
 
+# Backends that lift inputs through a fixed nonlinear feature map before the ridge solve.
+FEATURE_MAP_BACKENDS = {"random_fourier", "polynomial"}
+MAX_POLY_TERMS = 4096
+
+# Keys that change how the dataset is parsed; a sweep shares one loaded dataset, so variants may not set them.
+DATASET_CONFIG_KEYS = {"target_column", "feature_columns", "fidelity_column"}
+SCAFFOLD_BACKENDS = {"baseline_mlp"} | FEATURE_MAP_BACKENDS
+KIND_TO_BACKEND = {"identity": "baseline_mlp", "random_fourier": "random_fourier", "polynomial": "polynomial"}
+FIDELITY_LEVELS = {"low": 0.0, "high": 1.0}
+
+# Shared secret for remote statistics workers (see stats_worker.py and data_parallel_hosts).
+STATS_AUTHKEY_ENV = "NEMO_STATS_AUTHKEY"
+# load_workers=0 gives each pool worker at least this much CSV; below it, process startup
+# costs more than the parsing it saves.
+LOAD_BYTES_PER_WORKER = 4 << 20
+
+# Per-process view of the dataset shared by the sweep parent (see init_sweep_worker).
+_SWEEP_DATA: dict[str, Any] = {}
+
 
 @dataclass
 class Dataset:
@@ -41,6 +91,65 @@ class Dataset:
     targets: np.ndarray
     feature_names: list[str]
     source: str
+    # Per-row fidelity level (larger is higher fidelity), when the data has a fidelity column.
+    fidelity: np.ndarray | None = None
+    # Per-file provenance when loaded from a directory or glob: path, sha256, row_start, rows.
+    files: list[dict[str, Any]] | None = None
+
+
+@dataclass
+class FeatureMap:
+    """Deterministic input lifting applied before the ridge solve.
+
+    ``identity`` keeps the raw inputs (the original linear baseline). The other
+    kinds standardize inputs with training statistics and then expand them into
+    random Fourier features (an RBF kernel approximation) or monomials up to a
+    bounded degree, so the cost of fitting stays linear in the sample count.
+    """
+
+    kind: str
+    x_mean: np.ndarray
+    x_scale: np.ndarray
+    omega: np.ndarray | None = None
+    phase: np.ndarray | None = None
+    powers: np.ndarray | None = None
+
+    @property
+    def output_dim(self) -> int:
+        if self.kind == "random_fourier":
+            return int(self.omega.shape[1])
+        if self.kind == "polynomial":
+            return int(self.powers.shape[0])
+        return int(self.x_mean.shape[0])
+
+    def transform(self, x: np.ndarray) -> np.ndarray:
+        if self.kind == "identity":
+            return x
+        z = (x - self.x_mean) / self.x_scale
+        if self.kind == "random_fourier":
+            return np.sqrt(2.0 / self.output_dim) * np.cos(z @ self.omega + self.phase)
+        if self.kind == "polynomial":
+            return polynomial_features(z, self.powers)
+        raise ValueError(f"Unknown feature map kind: {self.kind}")
+
+
+@dataclass
+class SurrogateModel:
+    # Shape (model_features + 1,) for a single fit, or (ensemble_size, model_features + 1)
+    # for a bootstrap ensemble whose members share one feature map.
+    weights: np.ndarray
+    feature_map: FeatureMap
+    # Unregularized normal equations of every row seen so far. Persisting them lets a
+    # later run add new rows and re-solve without revisiting the old ones.
+    gram: np.ndarray | None = None
+    xty: np.ndarray | None = None
+    train_rows: int = 0
+    # Multi-fidelity: this model is a correction fitted on [x, low_fidelity(x)].
+    low_fidelity: SurrogateModel | None = None
+
+    @property
+    def ensemble_size(self) -> int:
+        return int(self.weights.shape[0]) if self.weights.ndim == 2 else 0
 
 
 def unwrap(value: Any) -> Any:
@@ -79,6 +188,38 @@ def resolve_model_path(raw_path: str, input_file: Path) -> Path:
     return (Path.cwd() / candidate).resolve()
 
 
+def resolve_model_paths(raw_path: str, input_file: Path) -> Path | list[Path]:
+    """Resolve ``campaign_root_model`` to one file, or to the sorted files of a directory or glob.
+
+    A directory contributes its ``*.csv`` files (or ``*.json`` when it has no CSVs).
+    """
+    if not any(ch in raw_path for ch in "*?["):
+        path = resolve_model_path(raw_path, input_file)
+        if not path.is_dir():
+            return path
+        files = sorted(path.glob("*.csv")) or sorted(path.glob("*.json"))
+        if not files:
+            raise ValueError(f"No .csv or .json files in dataset directory: {path}")
+        return files
+
+    pattern = Path(raw_path)
+    roots = [Path(pattern.anchor)] if pattern.is_absolute() else [input_file.parent, Path.cwd()]
+    relative = str(pattern.relative_to(pattern.anchor)) if pattern.is_absolute() else raw_path
+    for root in roots:
+        files = sorted(p.resolve() for p in root.glob(relative) if p.suffix.lower() in {".csv", ".json"} and p.is_file())
+        if files:
+            return files
+    raise ValueError(f"No .csv or .json files match: {raw_path}")
+
+
+def parse_fidelity(value: Any) -> float:
+    """Map a fidelity cell to an orderable level: 'low'/'high' or a number such as mesh resolution."""
+    text = str(value).strip().lower()
+    if text in FIDELITY_LEVELS:
+        return FIDELITY_LEVELS[text]
+    return float(text)
+
+
 def load_csv_dataset(path: Path, config: dict[str, Any]) -> Dataset:
     with path.open("r", encoding="utf-8", newline="") as f:
         reader = csv.DictReader(f)
@@ -89,25 +230,34 @@ def load_csv_dataset(path: Path, config: dict[str, Any]) -> Dataset:
         target_column = str(config.get("target_column", "target"))
         if target_column not in fieldnames:
             target_column = fieldnames[-1]
+        fidelity_column = str(config.get("fidelity_column", "fidelity"))
+        if fidelity_column not in fieldnames or fidelity_column == target_column:
+            fidelity_column = ""
 
         configured_features = config.get("feature_columns")
+        excluded = {target_column, fidelity_column}
         if isinstance(configured_features, list) and configured_features:
-            feature_columns = [str(c) for c in configured_features if str(c) in fieldnames and str(c) != target_column]
+            feature_columns = [str(c) for c in configured_features if str(c) in fieldnames and str(c) not in excluded]
         else:
-            feature_columns = [c for c in fieldnames if c != target_column]
+            feature_columns = [c for c in fieldnames if c not in excluded]
 
         if not feature_columns:
             raise ValueError("No feature columns found in CSV")
 
         x_rows: list[list[float]] = []
         y_vals: list[float] = []
+        fidelity: list[float] = []
         for row in reader:
             try:
-                x_rows.append([float(row[c]) for c in feature_columns])
-                y_vals.append(float(row[target_column]))
+                level = parse_fidelity(row[fidelity_column]) if fidelity_column else 0.0
+                x_row = [float(row[c]) for c in feature_columns]
+                y_val = float(row[target_column])
             except (TypeError, ValueError):
                 # Skip malformed rows in scaffold mode.
                 continue
+            x_rows.append(x_row)
+            y_vals.append(y_val)
+            fidelity.append(level)
 
     if not x_rows:
         raise ValueError(f"No valid numeric rows found in CSV: {path}")
@@ -117,6 +267,7 @@ def load_csv_dataset(path: Path, config: dict[str, Any]) -> Dataset:
         targets=np.asarray(y_vals, dtype=np.float64),
         feature_names=feature_columns,
         source=f"csv:{path}",
+        fidelity=np.asarray(fidelity, dtype=np.float64) if fidelity_column else None,
     )
 
 
@@ -147,16 +298,24 @@ def load_json_dataset(path: Path, config: dict[str, Any]) -> Dataset:
     keys = sorted({k for r in records for k in r.keys()})
     if target_column not in keys:
         target_column = keys[-1]
-    feature_columns = [k for k in keys if k != target_column]
+    fidelity_column = str(config.get("fidelity_column", "fidelity"))
+    if fidelity_column not in keys or fidelity_column == target_column:
+        fidelity_column = ""
+    feature_columns = [k for k in keys if k not in {target_column, fidelity_column}]
 
     x_rows: list[list[float]] = []
     y_vals: list[float] = []
+    fidelity: list[float] = []
     for row in records:
         try:
-            x_rows.append([float(row[k]) for k in feature_columns])
-            y_vals.append(float(row[target_column]))
+            level = parse_fidelity(row[fidelity_column]) if fidelity_column else 0.0
+            x_row = [float(row[k]) for k in feature_columns]
+            y_val = float(row[target_column])
         except (KeyError, TypeError, ValueError):
             continue
+        x_rows.append(x_row)
+        y_vals.append(y_val)
+        fidelity.append(level)
 
     if not x_rows:
         raise ValueError(f"No valid numeric rows found in JSON records: {path}")
@@ -166,6 +325,7 @@ def load_json_dataset(path: Path, config: dict[str, Any]) -> Dataset:
         targets=np.asarray(y_vals, dtype=np.float64),
         feature_names=feature_columns,
         source=f"json-records:{path}",
+        fidelity=np.asarray(fidelity, dtype=np.float64) if fidelity_column else None,
     )
 
 
@@ -185,7 +345,86 @@ def synthetic_dataset() -> Dataset:
     )
 
 
-def load_dataset(model_path: Path, config: dict[str, Any]) -> Dataset:
+def load_dataset_file(path: Path, config: dict[str, Any]) -> tuple[Dataset, str]:
+    """Parse one file of a multi-file dataset (runs in a loader worker) and hash it for provenance."""
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    if path.suffix.lower() == ".csv":
+        return load_csv_dataset(path, config), digest
+    return load_json_dataset(path, config), digest
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (affinity and cpusets), not every core of the host."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # macOS has no affinity API
+        return os.cpu_count() or 1
+
+
+def load_dataset_files(paths: list[Path], config: dict[str, Any]) -> Dataset:
+    """Parse ``paths`` on a process pool and concatenate them into one preallocated array.
+
+    Every file must resolve to the same feature columns (in the same order) and
+    agree on whether it has a fidelity column. Rows keep the file order. The pool
+    never has more workers than files; with ``load_workers=0`` it is also sized
+    by ``available_cpus()`` and by ``LOAD_BYTES_PER_WORKER``, so a few small
+    files are parsed in this process.
+    """
+    workers = int(config.get("load_workers", 0))
+    if workers <= 0:
+        total_bytes = sum(path.stat().st_size for path in paths)
+        workers = min(available_cpus(), -(-total_bytes // LOAD_BYTES_PER_WORKER))
+    workers = max(1, min(workers, len(paths)))
+    if workers == 1:
+        parts = [load_dataset_file(path, config) for path in paths]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Thousands of small per-case files: batch them so task overhead does not dominate.
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(load_dataset_file, paths, itertools.repeat(config), chunksize=chunksize))
+
+    first = parts[0][0]
+    has_fidelity = first.fidelity is not None
+    for path, (part, _) in zip(paths, parts):
+        if part.feature_names != first.feature_names:
+            raise ValueError(
+                f"Schema mismatch: {path} has features {part.feature_names}, "
+                f"{paths[0]} has {first.feature_names}"
+            )
+        if (part.fidelity is not None) != has_fidelity:
+            raise ValueError(f"Schema mismatch: {path} and {paths[0]} disagree on the fidelity column")
+
+    total = sum(part.features.shape[0] for part, _ in parts)
+    features = np.empty((total, first.features.shape[1]), dtype=np.float64)
+    targets = np.empty(total, dtype=np.float64)
+    fidelity = np.empty(total, dtype=np.float64) if has_fidelity else None
+    files: list[dict[str, Any]] = []
+    start = 0
+    for path, (part, digest) in zip(paths, parts):
+        stop = start + part.features.shape[0]
+        features[start:stop] = part.features
+        targets[start:stop] = part.targets
+        if fidelity is not None:
+            fidelity[start:stop] = part.fidelity
+        files.append({"path": str(path), "sha256": digest, "row_start": start, "rows": stop - start})
+        start = stop
+
+    root = os.path.commonpath([str(p.parent) for p in paths])
+    return Dataset(
+        features=features,
+        targets=targets,
+        feature_names=first.feature_names,
+        source=f"files:{root} ({len(paths)} files)",
+        fidelity=fidelity,
+        files=files,
+    )
+
+
+def load_dataset(model_path: Path | list[Path], config: dict[str, Any]) -> Dataset:
+    if isinstance(model_path, list):
+        return load_dataset_files(model_path, config)
     if model_path.exists():
         suffix = model_path.suffix.lower()
         if suffix == ".csv":
@@ -213,18 +452,454 @@ def split_dataset(x: np.ndarray, y: np.ndarray, val_split: float, seed: int) ->
     return x[train_idx], y[train_idx], x[val_idx], y[val_idx]
 
 
-def fit_ridge_regression(x_train: np.ndarray, y_train: np.ndarray, ridge_lambda: float) -> np.ndarray:
-    x_aug = np.hstack([x_train, np.ones((x_train.shape[0], 1), dtype=np.float64)])
-    eye = np.eye(x_aug.shape[1], dtype=np.float64)
+def add_bias(x: np.ndarray) -> np.ndarray:
+    return np.hstack([x, np.ones((x.shape[0], 1), dtype=np.float64)])
+
+
+def polynomial_powers(n_features: int, degree: int) -> np.ndarray:
+    terms: list[list[int]] = []
+    for d in range(1, degree + 1):
+        for combo in itertools.combinations_with_replacement(range(n_features), d):
+            row = [0] * n_features
+            for i in combo:
+                row[i] += 1
+            terms.append(row)
+            if len(terms) > MAX_POLY_TERMS:
+                raise ValueError(
+                    f"poly_degree={degree} over {n_features} features exceeds {MAX_POLY_TERMS} terms; "
+                    "lower poly_degree or use backend='random_fourier'"
+                )
+    return np.asarray(terms, dtype=np.float64)
+
+
+def polynomial_features(z: np.ndarray, powers: np.ndarray) -> np.ndarray:
+    """Monomials ``prod_j z_j ** powers[t, j]``, built by multiplying in one input power at a time.
+
+    Temporaries are at most the size of the output, so memory stays bounded by
+    ``rows * terms`` rather than ``rows * terms * n_features``.
+    """
+    out = np.ones((z.shape[0], powers.shape[0]), dtype=np.float64)
+    for j in range(powers.shape[1]):
+        column = powers[:, j]
+        for exponent in np.unique(column[column > 0]):
+            terms = np.flatnonzero(column == exponent)
+            out[:, terms] *= (z[:, j] ** exponent)[:, None]
+    return out
+
+
+def build_feature_map(backend: str, x_train: np.ndarray, config: dict[str, Any]) -> FeatureMap:
+    n_features = x_train.shape[1]
+    if backend not in FEATURE_MAP_BACKENDS:
+        return FeatureMap(
+            kind="identity",
+            x_mean=np.zeros(n_features, dtype=np.float64),
+            x_scale=np.ones(n_features, dtype=np.float64),
+        )
+
+    x_mean = x_train.mean(axis=0)
+    x_scale = x_train.std(axis=0)
+    x_scale[x_scale == 0.0] = 1.0
+
+    if backend == "random_fourier":
+        n_components = int(config.get("rff_features", 256))
+        lengthscale = float(config.get("rff_lengthscale", 1.0))
+        if n_components < 1 or lengthscale <= 0.0:
+            raise ValueError("rff_features must be >= 1 and rff_lengthscale must be > 0")
+        # Offset the seed so the projection is independent of the train/val shuffle.
+        rng = np.random.default_rng(int(config.get("random_seed", 42)) + 1)
+        return FeatureMap(
+            kind="random_fourier",
+            x_mean=x_mean,
+            x_scale=x_scale,
+            omega=rng.normal(scale=1.0 / lengthscale, size=(n_features, n_components)),
+            phase=rng.uniform(0.0, 2.0 * np.pi, size=n_components),
+        )
+
+    degree = int(config.get("poly_degree", 2))
+    if degree < 1:
+        raise ValueError("poly_degree must be >= 1")
+    return FeatureMap(
+        kind="polynomial",
+        x_mean=x_mean,
+        x_scale=x_scale,
+        powers=polynomial_powers(n_features, degree),
+    )
+
+
+def feature_map_config(feature_map: FeatureMap) -> dict[str, Any]:
+    """Config keys a frozen feature map fixes, recovered from its arrays.
+
+    ``rff_lengthscale`` (and the seed) are baked into ``omega`` and cannot be
+    recovered, so they are reported as ``None``.
+    """
+    if feature_map.kind == "random_fourier":
+        return {"rff_features": int(feature_map.omega.shape[1]), "rff_lengthscale": None}
+    if feature_map.kind == "polynomial":
+        return {"poly_degree": int(feature_map.powers.sum(axis=1).max())}
+    return {}
+
+
+def accumulate_normal_equations(
+    x: np.ndarray,
+    y: np.ndarray,
+    feature_map: FeatureMap,
+    chunk_rows: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Build ``Phi^T Phi`` and ``Phi^T y`` one row chunk at a time.
+
+    Only one chunk of lifted features is materialized, so memory is bounded by
+    ``chunk_rows * output_dim`` regardless of the dataset size.
+    """
+    dim = feature_map.output_dim + 1
+    gram = np.zeros((dim, dim), dtype=np.float64)
+    xty = np.zeros(dim, dtype=np.float64)
+    chunk_rows = max(1, int(chunk_rows))
+    for start in range(0, x.shape[0], chunk_rows):
+        phi = add_bias(feature_map.transform(x[start:start + chunk_rows]))
+        gram += phi.T @ phi
+        xty += phi.T @ y[start:start + chunk_rows]
+    return gram, xty
+
+
+def accumulate_bootstrap_normal_equations(
+    x: np.ndarray,
+    y: np.ndarray,
+    feature_map: FeatureMap,
+    chunk_rows: int,
+    replicates: list[int],
+    seed: int,
+    first_chunk: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Stacked normal equations for Poisson(1) bootstrap resamples.
+
+    Each replicate reweights rows by an independent Poisson(1) count, which
+    approximates multinomial resampling but can be drawn chunk by chunk. Counts
+    are seeded per (replicate, chunk), so results do not depend on how the
+    replicates are split across workers. ``first_chunk`` is the global index of
+    the first chunk of ``x`` when it is a chunk-aligned shard of the rows.
+    """
+    dim = feature_map.output_dim + 1
+    gram = np.zeros((len(replicates), dim, dim), dtype=np.float64)
+    xty = np.zeros((len(replicates), dim), dtype=np.float64)
+    chunk_rows = max(1, int(chunk_rows))
+    for chunk_index, start in enumerate(range(0, x.shape[0], chunk_rows), start=first_chunk):
+        phi = add_bias(feature_map.transform(x[start:start + chunk_rows]))
+        y_chunk = y[start:start + chunk_rows]
+        # One replicate at a time: the only temporary is a reweighted copy of phi.
+        for i, b in enumerate(replicates):
+            counts = np.random.default_rng([seed, b, chunk_index]).poisson(1.0, size=phi.shape[0]).astype(np.float64)
+            weighted = phi.T * counts
+            gram[i] += weighted @ phi
+            xty[i] += weighted @ y_chunk
+    return gram, xty
+
+
+def solve_ridge(gram: np.ndarray, xty: np.ndarray, ridge_lambda: float) -> np.ndarray:
+    """Solve one system, or a stack of them in a single batched call."""
+    eye = np.eye(gram.shape[-1], dtype=np.float64)
     eye[-1, -1] = 0.0  # do not regularize bias term
-    a = x_aug.T @ x_aug + float(ridge_lambda) * eye
-    b = x_aug.T @ y_train
-    return np.linalg.pinv(a) @ b
+    a = gram + float(ridge_lambda) * eye
+    return (np.linalg.pinv(a) @ xty[..., None])[..., 0]
 
 
 def predict(x: np.ndarray, weights: np.ndarray) -> np.ndarray:
-    x_aug = np.hstack([x, np.ones((x.shape[0], 1), dtype=np.float64)])
-    return x_aug @ weights
+    return add_bias(x) @ weights.T
+
+
+def bootstrap_normal_equations(
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    feature_map: FeatureMap,
+    config: dict[str, Any],
+    ensemble_size: int,
+    seed: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    workers = max(1, min(int(config.get("ensemble_workers", 1)), ensemble_size))
+    chunk_rows = int(config.get("chunk_rows", 65536))
+    replicates = list(range(ensemble_size))
+    if workers == 1:
+        return accumulate_bootstrap_normal_equations(x_train, y_train, feature_map, chunk_rows, replicates, seed)
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    groups = [g.tolist() for g in np.array_split(np.asarray(replicates), workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(accumulate_bootstrap_normal_equations, x_train, y_train, feature_map, chunk_rows, g, seed)
+            for g in groups
+        ]
+        parts = [f.result() for f in futures]
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+
+def shard_normal_equations(
+    x: np.ndarray,
+    y: np.ndarray,
+    feature_map: FeatureMap,
+    chunk_rows: int,
+    replicates: list[int],
+    seed: int,
+    first_chunk: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Partial statistics of one shard of rows: plain, or stacked bootstrap when ``replicates`` is set."""
+    if replicates:
+        return accumulate_bootstrap_normal_equations(x, y, feature_map, chunk_rows, replicates, seed, first_chunk)
+    return accumulate_normal_equations(x, y, feature_map, chunk_rows)
+
+
+def accumulate_shared_shard(
+    features_spec: dict[str, Any],
+    targets_spec: dict[str, Any],
+    start: int,
+    stop: int,
+    feature_map: FeatureMap,
+    chunk_rows: int,
+    replicates: list[int],
+    seed: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    features_shm, features = attach_array(features_spec)
+    targets_shm, targets = attach_array(targets_spec)
+    try:
+        return shard_normal_equations(
+            features[start:stop], targets[start:stop], feature_map, chunk_rows, replicates, seed, start // chunk_rows
+        )
+    finally:
+        del features, targets
+        features_shm.close()
+        targets_shm.close()
+
+
+def tree_reduce(parts: list[tuple[np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray]:
+    """Sum partial ``(gram, xty)`` pairs pairwise, so rounding error grows with log(shards)."""
+    while len(parts) > 1:
+        paired = [(a[0] + b[0], a[1] + b[1]) for a, b in zip(parts[0::2], parts[1::2])]
+        parts = paired + parts[2 * len(paired):]
+    return parts[0]
+
+
+def shard_bounds(n_rows: int, shards: int, chunk_rows: int, aligned: bool) -> list[tuple[int, int]]:
+    """Contiguous row ranges; bootstrap shards start on chunk boundaries so Poisson counts stay the same."""
+    if aligned:
+        n_chunks = -(-n_rows // chunk_rows)
+        groups = [g for g in np.array_split(np.arange(n_chunks), min(shards, n_chunks)) if g.size]
+        return [(int(g[0]) * chunk_rows, min(n_rows, (int(g[-1]) + 1) * chunk_rows)) for g in groups]
+    edges = np.linspace(0, n_rows, min(shards, n_rows) + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def data_parallel_normal_equations(
+    x: np.ndarray,
+    y: np.ndarray,
+    feature_map: FeatureMap,
+    chunk_rows: int,
+    replicates: list[int],
+    seed: int,
+    workers: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Split rows across a process pool over one shared-memory copy and tree-reduce the statistics."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    bounds = shard_bounds(x.shape[0], workers, chunk_rows, aligned=bool(replicates))
+    features_shm, features_spec = share_array(np.ascontiguousarray(x))
+    targets_shm, targets_spec = share_array(np.ascontiguousarray(y))
+    try:
+        with ProcessPoolExecutor(max_workers=len(bounds)) as pool:
+            futures = [
+                pool.submit(
+                    accumulate_shared_shard,
+                    features_spec,
+                    targets_spec,
+                    start,
+                    stop,
+                    feature_map,
+                    chunk_rows,
+                    replicates,
+                    seed,
+                )
+                for start, stop in bounds
+            ]
+            parts = [f.result() for f in futures]
+    finally:
+        for shm in (features_shm, targets_shm):
+            shm.close()
+            shm.unlink()
+    return tree_reduce(parts)
+
+
+def stats_address(address: str) -> str | tuple[str, int]:
+    """``host:port`` for TCP, anything else is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return address
+
+
+def stats_authkey() -> bytes:
+    key = os.environ.get(STATS_AUTHKEY_ENV, "")
+    if not key:
+        raise ValueError(f"data_parallel_hosts requires a shared secret in ${STATS_AUTHKEY_ENV}")
+    return key.encode("utf-8")
+
+
+def remote_normal_equations(
+    x: np.ndarray,
+    y: np.ndarray,
+    feature_map: FeatureMap,
+    chunk_rows: int,
+    replicates: list[int],
+    seed: int,
+    hosts: list[str],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Stream chunk-aligned shards to ``stats_worker.py`` processes and tree-reduce their statistics."""
+    from concurrent.futures import ThreadPoolExecutor
+    from multiprocessing.connection import Client
+
+    authkey = stats_authkey()
+    bounds = shard_bounds(x.shape[0], len(hosts), chunk_rows, aligned=True)
+
+    # Plain arrays only: a pickled FeatureMap would refer to __main__ when the trainer runs as a script.
+    map_fields = {f.name: getattr(feature_map, f.name) for f in fields(FeatureMap)}
+
+    def run(host: str, start: int, stop: int) -> tuple[np.ndarray, np.ndarray]:
+        with Client(stats_address(host), authkey=authkey) as conn:
+            try:
+                conn.send(("begin", map_fields, chunk_rows, replicates, seed))
+                for lo in range(start, stop, chunk_rows):
+                    conn.send(("chunk", lo // chunk_rows, x[lo:lo + chunk_rows], y[lo:lo + chunk_rows]))
+                conn.send(("end",))
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # the worker stopped reading; its error reply explains why
+            try:
+                status, payload = conn.recv()
+            except (EOFError, OSError):
+                status, payload = "error", "connection closed without a result"
+        if status != "ok":
+            raise RuntimeError(f"Statistics worker {host} failed: {payload}")
+        return payload
+
+    with ThreadPoolExecutor(max_workers=len(bounds)) as pool:
+        futures = [pool.submit(run, host, start, stop) for host, (start, stop) in zip(hosts, bounds)]
+        parts = [f.result() for f in futures]
+    return tree_reduce(parts)
+
+
+def sufficient_statistics(
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    feature_map: FeatureMap,
+    config: dict[str, Any],
+    ensemble_size: int,
+    seed: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    chunk_rows = max(1, int(config.get("chunk_rows", 65536)))
+    replicates = list(range(ensemble_size)) if ensemble_size > 1 else []
+    hosts = [str(h) for h in config.get("data_parallel_hosts") or []]
+    if hosts:
+        return remote_normal_equations(x_train, y_train, feature_map, chunk_rows, replicates, seed, hosts)
+    workers = int(config.get("data_workers", 1)) or available_cpus()
+    if workers > 1 and x_train.shape[0] > 1:
+        return data_parallel_normal_equations(x_train, y_train, feature_map, chunk_rows, replicates, seed, workers)
+    if replicates:
+        return bootstrap_normal_equations(x_train, y_train, feature_map, config, ensemble_size, seed)
+    return accumulate_normal_equations(x_train, y_train, feature_map, chunk_rows)
+
+
+def fit_surrogate(x_train: np.ndarray, y_train: np.ndarray, backend: str, config: dict[str, Any]) -> SurrogateModel:
+    feature_map = build_feature_map(backend, x_train, config)
+    ensemble_size = int(config.get("ensemble_size", 0))
+    gram, xty = sufficient_statistics(
+        x_train,
+        y_train,
+        feature_map,
+        config,
+        ensemble_size,
+        int(config.get("random_seed", 42)),
+    )
+    weights = solve_ridge(gram, xty, float(config.get("ridge_lambda", 1e-6)))
+    return SurrogateModel(weights=weights, feature_map=feature_map, gram=gram, xty=xty, train_rows=x_train.shape[0])
+
+
+def update_surrogate(
+    previous: SurrogateModel,
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    config: dict[str, Any],
+) -> SurrogateModel:
+    """Warm-start: add new rows to a previous fit and re-solve.
+
+    The feature map (including standardization stats) is frozen from the
+    previous fit, so cost is proportional to the new rows only.
+    """
+    if previous.gram is None or previous.xty is None:
+        raise ValueError(
+            "Previous checkpoint has no sufficient statistics; pass its model_stats.npz as previous_stats "
+            "(written when training_config.save_stats is true)"
+        )
+    if previous.low_fidelity is not None:
+        raise ValueError("Warm start is not supported for multi-fidelity checkpoints; retrain from scratch")
+    # Offset bootstrap seeds by rows already seen so new rows get fresh Poisson counts.
+    seed = int(config.get("random_seed", 42)) + previous.train_rows
+    gram, xty = sufficient_statistics(x_train, y_train, previous.feature_map, config, previous.ensemble_size, seed)
+    gram = previous.gram + gram
+    xty = previous.xty + xty
+    weights = solve_ridge(gram, xty, float(config.get("ridge_lambda", 1e-6)))
+    return SurrogateModel(
+        weights=weights,
+        feature_map=previous.feature_map,
+        gram=gram,
+        xty=xty,
+        train_rows=previous.train_rows + x_train.shape[0],
+    )
+
+
+def predict_distribution(
+    model: SurrogateModel,
+    x: np.ndarray,
+    chunk_rows: int = 65536,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the (ensemble mean, ensemble variance) prediction per sample.
+
+    Single models report zero variance. Multi-fidelity models return the
+    high-fidelity prediction; variance covers the correction ensemble only.
+    """
+    chunk_rows = max(1, int(chunk_rows))
+    mean = np.empty(x.shape[0], dtype=np.float64)
+    var = np.zeros(x.shape[0], dtype=np.float64)
+    for start in range(0, x.shape[0], chunk_rows):
+        chunk = x[start:start + chunk_rows]
+        if model.low_fidelity is not None:
+            chunk = np.hstack([chunk, predict_surrogate(model.low_fidelity, chunk, chunk_rows)[:, None]])
+        pred = predict(model.feature_map.transform(chunk), model.weights)
+        if pred.ndim == 2:
+            mean[start:start + chunk_rows] = pred.mean(axis=1)
+            var[start:start + chunk_rows] = pred.var(axis=1, ddof=1)
+        else:
+            mean[start:start + chunk_rows] = pred
+    return mean, var
+
+
+def predict_surrogate(model: SurrogateModel, x: np.ndarray, chunk_rows: int = 65536) -> np.ndarray:
+    return predict_distribution(model, x, chunk_rows)[0]
+
+
+def ensemble_summary(y_true: np.ndarray, y_mean: np.ndarray, y_var: np.ndarray, size: int) -> dict[str, Any]:
+    std = np.sqrt(y_var)
+    within = np.abs(y_true - y_mean) <= 2.0 * std
+    return {
+        "size": size,
+        "bootstrap": "poisson",
+        "val_mean_predictive_std": float(np.mean(std)),
+        "val_max_predictive_std": float(np.max(std)),
+        "val_coverage_2sigma": float(np.mean(within)),
+    }
+
+
+def write_ensemble_predictions(path: Path, y_true: np.ndarray, y_mean: np.ndarray, y_var: np.ndarray) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["val_index", "target", "prediction_mean", "prediction_variance"])
+        for i, row in enumerate(zip(y_true.tolist(), y_mean.tolist(), y_var.tolist())):
+            writer.writerow([i, *row])
 
 
 def metrics(y_true: np.ndarray, y_pred: np.ndarray) -> dict[str, float]:
@@ -239,7 +914,241 @@ def metrics(y_true: np.ndarray, y_pred: np.ndarray) -> dict[str, float]:
     return {"mse": mse, "mae": mae, "r2": r2}
 
 
+def resolve_backend(config: dict[str, Any]) -> str:
+    backend = str(config.get("backend", "baseline_mlp")).strip().lower()
+    if backend == "physicsnemo":
+        raise RuntimeError(
+            "Scaffold backend does not execute full PhysicsNeMo yet. "
+            "Use backend='baseline_mlp', 'random_fourier' or 'polynomial' for smoke tests, "
+            "then replace src/train_nemo_surrogate.py "
+            "with your production GPU training implementation."
+        )
+    if backend not in SCAFFOLD_BACKENDS:
+        raise ValueError(f"Unknown backend: {backend} (expected one of {sorted(SCAFFOLD_BACKENDS)})")
+    return backend
+
+
+def fit_multi_fidelity(
+    x: np.ndarray,
+    y: np.ndarray,
+    is_high: np.ndarray,
+    config: dict[str, Any],
+    spans: PhaseSpans | None = None,
+) -> tuple[SurrogateModel, dict[str, Any]]:
+    """Fit a low-fidelity surrogate, then a correction from it to the high-fidelity rows.
+
+    The correction regresses high-fidelity targets on ``[x, f_low(x)]`` (an
+    autoregressive co-kriging style model), so the dense low-resolution sweep
+    carries the shape and the sparse high-resolution cases fix the offset.
+    Validation rows are drawn from the high-fidelity cases only.
+    """
+    backend = resolve_backend(config)
+    correction_backend = resolve_backend({"backend": config.get("correction_backend", "baseline_mlp")})
+    chunk_rows = int(config.get("chunk_rows", 65536))
+    spans = spans or PhaseSpans()
+
+    # Bootstrap only the correction: it is fitted on the sparse data that drives the uncertainty.
+    with spans.span("fit_low_fidelity", rows=int((~is_high).sum())):
+        low_model = fit_surrogate(x[~is_high], y[~is_high], backend, dict(config, ensemble_size=0))
+    with spans.span("split", rows=int(is_high.sum())):
+        x_train, y_train, x_val, y_val = split_dataset(
+            x[is_high],
+            y[is_high],
+            float(config.get("val_split", 0.2)),
+            int(config.get("random_seed", 42)),
+        )
+    with spans.span("fit_correction", rows=x_train.shape[0]):
+        lifted = np.hstack([x_train, predict_surrogate(low_model, x_train, chunk_rows)[:, None]])
+        model = fit_surrogate(lifted, y_train, correction_backend, config)
+        model.low_fidelity = low_model
+
+    with spans.span("predict", rows=x_train.shape[0] + x_val.shape[0]):
+        val_pred, val_var = predict_distribution(model, x_val, chunk_rows)
+        train_pred = predict_surrogate(model, x_train, chunk_rows)
+    return model, {
+        "y_train": y_train,
+        "train_pred": train_pred,
+        "y_val": y_val,
+        "val_pred": val_pred,
+        "val_var": val_var,
+        "fidelity": {
+            "low_rows": int((~is_high).sum()),
+            "high_rows": int(is_high.sum()),
+            "correction_backend": correction_backend,
+            # Low-fidelity model alone on the high-fidelity validation rows, for comparison.
+            "low_only_val_metrics": metrics(y_val, predict_surrogate(low_model, x_val, chunk_rows)),
+        },
+    }
+
+
+def train_and_evaluate(
+    x: np.ndarray,
+    y: np.ndarray,
+    config: dict[str, Any],
+    previous: SurrogateModel | None = None,
+    fidelity: np.ndarray | None = None,
+    spans: PhaseSpans | None = None,
+) -> tuple[SurrogateModel, dict[str, Any]]:
+    if fidelity is not None and np.unique(fidelity).size > 1:
+        if previous is not None:
+            raise ValueError("Warm start is not supported for multi-fidelity datasets; retrain from scratch")
+        return fit_multi_fidelity(x, y, fidelity == fidelity.max(), config, spans)
+
+    backend = resolve_backend(config)
+    spans = spans or PhaseSpans()
+    with spans.span("split", rows=x.shape[0]):
+        x_train, y_train, x_val, y_val = split_dataset(
+            x,
+            y,
+            float(config.get("val_split", 0.2)),
+            int(config.get("random_seed", 42)),
+        )
+    with spans.span("fit", rows=x_train.shape[0]):
+        if previous is not None:
+            model = update_surrogate(previous, x_train, y_train, config)
+        else:
+            model = fit_surrogate(x_train, y_train, backend, config)
+    chunk_rows = int(config.get("chunk_rows", 65536))
+    with spans.span("predict", rows=x.shape[0]):
+        val_pred, val_var = predict_distribution(model, x_val, chunk_rows)
+        train_pred = predict_surrogate(model, x_train, chunk_rows)
+    return model, {
+        "y_train": y_train,
+        "train_pred": train_pred,
+        "y_val": y_val,
+        "val_pred": val_pred,
+        "val_var": val_var,
+    }
+
+
+def sweep_variants(config: dict[str, Any]) -> list[dict[str, Any]]:
+    raw = config.get("sweep")
+    if not isinstance(raw, list) or not all(isinstance(v, dict) for v in raw):
+        raise ValueError("training_config.sweep must be a list of config override objects")
+    base = {k: v for k, v in config.items() if k != "sweep"}
+    variants = []
+    for overrides in raw:
+        shaped = DATASET_CONFIG_KEYS.intersection(overrides)
+        if shaped:
+            raise ValueError(f"sweep variants cannot override dataset keys: {sorted(shaped)}")
+        merged = dict(base)
+        merged.update(overrides)
+        # Parallelism comes from the sweep pool; keep each variant single-process.
+        merged["ensemble_workers"] = 1
+        merged["data_workers"] = 1
+        variants.append(merged)
+    return variants
+
+
+def share_array(array: np.ndarray) -> tuple[shared_memory.SharedMemory, dict[str, Any]]:
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, {"name": shm.name, "shape": array.shape, "dtype": array.dtype.str}
+
+
+def attach_array(spec: dict[str, Any]) -> tuple[shared_memory.SharedMemory, np.ndarray]:
+    from multiprocessing import shared_memory
+
+    shm = shared_memory.SharedMemory(name=spec["name"])
+    return shm, np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=shm.buf)
+
+
+def init_sweep_worker(
+    features_spec: dict[str, Any],
+    targets_spec: dict[str, Any],
+    fidelity_spec: dict[str, Any] | None = None,
+) -> None:
+    features_shm, features = attach_array(features_spec)
+    targets_shm, targets = attach_array(targets_spec)
+    handles = [features_shm, targets_shm]
+    fidelity = None
+    if fidelity_spec is not None:
+        fidelity_shm, fidelity = attach_array(fidelity_spec)
+        handles.append(fidelity_shm)
+    _SWEEP_DATA.update(handles=handles, features=features, targets=targets, fidelity=fidelity)
+
+
+def failed_sweep_row(index: int, config: dict[str, Any], error: BaseException, duration: float = 0.0) -> dict[str, Any]:
+    return {
+        "variant": index,
+        "config": config,
+        "status": "failed",
+        "error": f"{type(error).__name__}: {error}",
+        "duration_seconds": round(duration, 3),
+    }
+
+
+def evaluate_sweep_variant(index: int, config: dict[str, Any]) -> dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        _, result = train_and_evaluate(
+            _SWEEP_DATA["features"], _SWEEP_DATA["targets"], config, fidelity=_SWEEP_DATA["fidelity"]
+        )
+    except Exception as exc:
+        # One bad variant (e.g. a singular solve) must not cost the rest of the sweep.
+        return failed_sweep_row(index, config, exc, time.perf_counter() - started)
+    return {
+        "variant": index,
+        "config": config,
+        "status": "ok",
+        "train_metrics": metrics(result["y_train"], result["train_pred"]),
+        "val_metrics": metrics(result["y_val"], result["val_pred"]),
+        "duration_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def run_sweep(dataset: Dataset, variants: list[dict[str, Any]], workers: int) -> list[dict[str, Any]]:
+    """Evaluate every variant against one copy of the dataset in shared memory.
+
+    Returns the leaderboard sorted by validation MSE (best first), with failed
+    variants (``status == "failed"``) ranked after every successful one.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = workers if workers > 0 else available_cpus()
+    workers = max(1, min(workers, len(variants)))
+    features_shm, features_spec = share_array(dataset.features)
+    targets_shm, targets_spec = share_array(dataset.targets)
+    handles = [features_shm, targets_shm]
+    fidelity_spec = None
+    if dataset.fidelity is not None:
+        fidelity_shm, fidelity_spec = share_array(dataset.fidelity)
+        handles.append(fidelity_shm)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_sweep_worker,
+            initargs=(features_spec, targets_spec, fidelity_spec),
+        ) as pool:
+            futures = [pool.submit(evaluate_sweep_variant, i, v) for i, v in enumerate(variants)]
+            rows = []
+            for index, future in enumerate(futures):
+                try:
+                    rows.append(future.result())
+                except Exception as exc:  # the worker process died (e.g. out of memory)
+                    rows.append(failed_sweep_row(index, variants[index], exc))
+    finally:
+        for shm in handles:
+            shm.close()
+            shm.unlink()
+
+    def sort_key(row: dict[str, Any]) -> tuple[Any, ...]:
+        if row["status"] != "ok":
+            return (1, 0.0, 0.0, row["variant"])
+        return (0, row["val_metrics"]["mse"], -row["val_metrics"]["r2"], row["variant"])
+
+    rows.sort(key=sort_key)
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    return rows
+
+
 def has_nvidia_gpu() -> bool:
+    # Skip the process spawn entirely on hosts without the driver tools.
+    if shutil.which("nvidia-smi") is None:
+        return False
     try:
         result = subprocess.run(
             ["nvidia-smi", "-L"],
@@ -247,29 +1156,80 @@ def has_nvidia_gpu() -> bool:
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
+            timeout=10,
         )
         return result.returncode == 0 and bool(result.stdout.strip())
-    except FileNotFoundError:
+    except (FileNotFoundError, subprocess.TimeoutExpired):
         return False
 
 
-def detect_hardware() -> dict[str, Any]:
-    mps = False
+def has_apple_mps() -> bool:
+    # MPS only exists on Apple silicon; importing torch anywhere else costs seconds for nothing.
+    if sys.platform != "darwin" or platform.machine() != "arm64":
+        return False
+    import importlib.util
+
+    if importlib.util.find_spec("torch") is None:
+        return False
     try:
         import torch  # type: ignore
 
-        mps = bool(getattr(torch.backends, "mps", None) and torch.backends.mps.is_available())
+        return bool(getattr(torch.backends, "mps", None) and torch.backends.mps.is_available())
     except Exception:
-        mps = False
+        return False
+
+
+def detect_hardware() -> dict[str, Any]:
     return {
         "platform": platform.platform(),
         "machine": platform.machine(),
         "python_version": platform.python_version(),
         "nvidia_gpu_available": has_nvidia_gpu(),
-        "apple_mps_available": mps,
+        "apple_mps_available": has_apple_mps(),
     }
 
 
+def hardware_cache_path() -> Path:
+    root = os.environ.get("NEMO_SURROGATE_CACHE_DIR") or Path(
+        os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    ) / "nemo-surrogate"
+    # One entry per host and interpreter: torch availability differs between environments.
+    key = hashlib.sha256(f"{platform.node()}|{sys.executable}".encode("utf-8")).hexdigest()[:16]
+    return Path(root) / f"hardware-{key}.json"
+
+
+def cached_hardware(ttl_seconds: float) -> tuple[dict[str, Any], bool]:
+    """Return ``(hardware, from_cache)``; the probe result is reused for ``ttl_seconds``."""
+    path = hardware_cache_path()
+    if ttl_seconds > 0:
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            if time.time() - float(entry["probed_at"]) < ttl_seconds:
+                return entry["hardware"], True
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+    hardware = detect_hardware()
+    if ttl_seconds > 0:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"probed_at": time.time(), "hardware": hardware}), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            pass  # read-only home on some agents; probing every run is still correct
+    return hardware, False
+
+
+def process_age_seconds() -> float | None:
+    """Seconds since this process was exec'd (Linux /proc only; 10 ms resolution)."""
+    try:
+        stat = Path("/proc/self/stat").read_text().rsplit(")", 1)[1].split()
+        uptime = float(Path("/proc/uptime").read_text().split()[0])
+        return max(0.0, uptime - int(stat[19]) / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
 def write_report(path: Path, payload: dict[str, Any]) -> None:
     lines = [
         "# NeMo Surrogate Training Report (Scaffold)",
@@ -280,6 +1240,7 @@ def write_report(path: Path, payload: dict[str, Any]) -> None:
         f"- Dataset source: `{payload['dataset_source']}`",
         f"- Samples: `{payload['samples']}`",
         f"- Features: `{payload['features']}`",
+        f"- Model features (after feature map): `{payload['model_features']}`",
         f"- Dataset job id: `{payload.get('dataset_job_id', '')}`",
         "",
         "## Validation Metrics",
@@ -288,6 +1249,59 @@ def write_report(path: Path, payload: dict[str, Any]) -> None:
         f"- MAE: `{payload['val_metrics']['mae']:.6f}`",
         f"- R2: `{payload['val_metrics']['r2']:.6f}`",
         "",
+    ]
+    ensemble = payload.get("ensemble")
+    if ensemble:
+        lines += [
+            "## Ensemble Uncertainty",
+            "",
+            f"- Members: `{ensemble['size']}` ({ensemble['bootstrap']} bootstrap)",
+            f"- Mean predictive std (val): `{ensemble['val_mean_predictive_std']:.6f}`",
+            f"- Max predictive std (val): `{ensemble['val_max_predictive_std']:.6f}`",
+            f"- Val targets within 2 sigma: `{ensemble['val_coverage_2sigma']:.1%}`",
+            "",
+        ]
+    fidelity = payload.get("fidelity")
+    if fidelity:
+        lines += [
+            "## Multi-Fidelity",
+            "",
+            f"- Low / high fidelity rows: `{fidelity['low_rows']}` / `{fidelity['high_rows']}`",
+            f"- Correction backend: `{fidelity['correction_backend']}`",
+            f"- Low-fidelity model alone, val R2: `{fidelity['low_only_val_metrics']['r2']:.6f}`",
+            "",
+        ]
+    startup = payload.get("startup")
+    if startup:
+        time_to_main = startup["time_to_main_seconds"]
+        lines += [
+            "## Startup",
+            "",
+            f"- Interpreter start to main: `{time_to_main if time_to_main is not None else 'n/a'}` s"
+            f" (module imports `{startup['imports_seconds']:.3f}` s)",
+            f"- Hardware probe: `{startup['hardware_probe_seconds']:.3f}` s"
+            f" ({'cached' if startup['hardware_probe_cached'] else 'probed'})",
+            "",
+        ]
+    phases = payload.get("phases")
+    if phases:
+        lines += [
+            "## Phase Timing",
+            "",
+            "| Phase | Wall s | CPU s | Rows/s | Peak RSS MB (+growth) |",
+            "| --- | ---: | ---: | ---: | ---: |",
+        ]
+        for phase in phases:
+            name = phase["name"] if phase.get("parent") is None else f"&nbsp;&nbsp;{phase['name']}"
+            rate = phase.get("rows_per_second")
+            rate_text = f"{rate:,.0f}" if rate else "-"
+            rss = phase.get("peak_rss_mb")
+            rss_text = f"{rss:.1f} (+{phase['peak_rss_growth_mb']:.1f})" if rss is not None else "-"
+            lines.append(
+                f"| {name} | {phase['wall_seconds']:.3f} | {phase['cpu_seconds']:.3f} | {rate_text} | {rss_text} |"
+            )
+        lines.append("")
+    lines += [
         "## Hardware Notes",
         "",
         "- This scaffold backend can run on macOS CPU for first-time integration testing.",
@@ -297,6 +1311,195 @@ def write_report(path: Path, payload: dict[str, Any]) -> None:
     path.write_text("\n".join(lines), encoding="utf-8")
 
 
+LOW_FIDELITY_PREFIX = "low_fidelity__"
+STATS_FILENAME = "model_stats.npz"
+
+
+def model_arrays(model: SurrogateModel) -> dict[str, np.ndarray]:
+    """Serving arrays of one model level (no metadata), skipping unset feature-map parts.
+
+    Warm-start statistics are not included; they go to the ``save_stats`` sidecar.
+    """
+    arrays = {"weights": model.weights}
+    for name, value in (
+        ("omega", model.feature_map.omega),
+        ("phase", model.feature_map.phase),
+        ("powers", model.feature_map.powers),
+    ):
+        if value is not None:
+            arrays[name] = value
+    return arrays
+
+
+def save_checkpoint(path: Path, model: SurrogateModel, feature_names: list[str], source: str) -> None:
+    arrays = {
+        **model_arrays(model),
+        "feature_map_kind": np.asarray([model.feature_map.kind], dtype=str),
+        "x_mean": model.feature_map.x_mean,
+        "x_scale": model.feature_map.x_scale,
+        "train_rows": np.asarray(model.train_rows, dtype=np.int64),
+    }
+    low = model.low_fidelity
+    if low is not None:
+        arrays.update({LOW_FIDELITY_PREFIX + name: value for name, value in model_arrays(low).items()})
+        arrays[LOW_FIDELITY_PREFIX + "feature_map_kind"] = np.asarray([low.feature_map.kind], dtype=str)
+        arrays[LOW_FIDELITY_PREFIX + "x_mean"] = low.feature_map.x_mean
+        arrays[LOW_FIDELITY_PREFIX + "x_scale"] = low.feature_map.x_scale
+        arrays[LOW_FIDELITY_PREFIX + "train_rows"] = np.asarray(low.train_rows, dtype=np.int64)
+    # Fixed-width unicode arrays, so the npz loads with allow_pickle=False.
+    np.savez(
+        path,
+        feature_names=np.asarray(feature_names, dtype=str),
+        dataset_source=np.asarray([source], dtype=str),
+        **arrays,
+    )
+
+
+def save_mappable_checkpoint(
+    path: Path,
+    model: SurrogateModel,
+    feature_names: list[str],
+    source: str,
+    config: dict[str, Any],
+) -> None:
+    """Write the memory-mappable ``.nsc`` checkpoint (see surrogate_checkpoint.py).
+
+    ``checkpoint_dtype='float32'`` halves the serving block (weights and feature map).
+    """
+    dtype = np.dtype(str(config.get("checkpoint_dtype", "float64")))
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("checkpoint_dtype must be 'float32' or 'float64'")
+
+    def level(m: SurrogateModel, prefix: str) -> dict[str, Any]:
+        for name, value in model_arrays(m).items():
+            arrays[prefix + name] = value.astype(dtype)
+        return {
+            "feature_map_kind": m.feature_map.kind,
+            "x_mean": m.feature_map.x_mean.tolist(),
+            "x_scale": m.feature_map.x_scale.tolist(),
+            "train_rows": m.train_rows,
+        }
+
+    arrays: dict[str, np.ndarray] = {}
+    metadata = {
+        "feature_names": feature_names,
+        "dataset_source": source,
+        **level(model, ""),
+        "ensemble_size": model.ensemble_size,
+        "training_config": config,
+    }
+    if model.low_fidelity is not None:
+        metadata["low_fidelity"] = level(model.low_fidelity, LOW_FIDELITY_PREFIX)
+    write_checkpoint(path, arrays, metadata)
+
+
+def save_stats(path: Path, model: SurrogateModel) -> None:
+    """Write the warm-start sidecar: unregularized ``gram``/``xty`` and the rows they cover (float64)."""
+    np.savez(path, gram=model.gram, xty=model.xty, train_rows=np.asarray(model.train_rows, dtype=np.int64))
+
+
+def load_stats(path: Path, model: SurrogateModel) -> None:
+    """Attach a ``save_stats`` sidecar to ``model`` for a warm start."""
+    with np.load(path, allow_pickle=False) as data:
+        gram, xty, train_rows = data["gram"], data["xty"], int(data["train_rows"])
+    if xty.shape != model.weights.shape or gram.shape != xty.shape + xty.shape[-1:]:
+        raise ValueError(
+            f"Statistics {path} (gram {gram.shape}) do not match the checkpoint weights {model.weights.shape}"
+        )
+    model.gram, model.xty, model.train_rows = gram, xty, train_rows
+
+
+def model_from_arrays(
+    arrays: dict[str, np.ndarray],
+    kind: str,
+    x_mean: np.ndarray,
+    x_scale: np.ndarray,
+    train_rows: int,
+    prefix: str = "",
+) -> SurrogateModel:
+    feature_map = FeatureMap(
+        kind=kind,
+        x_mean=x_mean,
+        x_scale=x_scale,
+        omega=arrays.get(prefix + "omega"),
+        phase=arrays.get(prefix + "phase"),
+        powers=arrays.get(prefix + "powers"),
+    )
+    return SurrogateModel(
+        weights=arrays[prefix + "weights"],
+        feature_map=feature_map,
+        gram=arrays.get(prefix + "gram"),
+        xty=arrays.get(prefix + "xty"),
+        train_rows=train_rows,
+    )
+
+
+def load_checkpoint(
+    path: str | Path,
+    use_mmap: bool = True,
+    stats_path: str | Path | None = None,
+) -> tuple[SurrogateModel, list[str]]:
+    """Load a ``.nsc`` or ``.npz`` checkpoint; ``.nsc`` arrays are memory-mapped by default.
+
+    ``stats_path`` (a ``save_stats`` sidecar) adds the warm-start statistics.
+    Checkpoints from earlier versions that embed ``gram``/``xty`` still load them.
+    """
+    model, feature_names = read_model(path, use_mmap)
+    if stats_path is not None:
+        load_stats(Path(stats_path), model)
+    return model, feature_names
+
+
+def read_model(path: str | Path, use_mmap: bool) -> tuple[SurrogateModel, list[str]]:
+    path = Path(path)
+    if path.suffix.lower() == ".nsc":
+        meta, arrays = read_checkpoint(path, use_mmap=use_mmap)
+
+        def level(m: dict[str, Any], prefix: str) -> SurrogateModel:
+            return model_from_arrays(
+                arrays,
+                str(m["feature_map_kind"]),
+                np.asarray(m["x_mean"], dtype=np.float64),
+                np.asarray(m["x_scale"], dtype=np.float64),
+                int(m.get("train_rows", 0)),
+                prefix,
+            )
+
+        model = level(meta, "")
+        if "low_fidelity" in meta:
+            model.low_fidelity = level(meta["low_fidelity"], LOW_FIDELITY_PREFIX)
+        return model, [str(name) for name in meta["feature_names"]]
+
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+    except ValueError:
+        # Checkpoints from earlier scaffold versions stored names as object arrays.
+        with np.load(path, allow_pickle=True) as data:
+            arrays = {name: data[name] for name in data.files}
+
+    def level(prefix: str, n_features: int) -> SurrogateModel:
+        # Checkpoints written before feature maps existed hold only weights and names.
+        kind = arrays.get(prefix + "feature_map_kind")
+        return model_from_arrays(
+            arrays,
+            str(kind[0]) if kind is not None else "identity",
+            arrays.get(prefix + "x_mean", np.zeros(n_features)),
+            arrays.get(prefix + "x_scale", np.ones(n_features)),
+            int(arrays.get(prefix + "train_rows", 0)),
+            prefix,
+        )
+
+    n_features = arrays["feature_names"].shape[0]
+    if LOW_FIDELITY_PREFIX + "weights" in arrays:
+        # The correction model sees the low-fidelity prediction as one extra input.
+        model = level("", n_features + 1)
+        model.low_fidelity = level(LOW_FIDELITY_PREFIX, n_features)
+    else:
+        model = level("", n_features)
+    return model, [str(name) for name in arrays["feature_names"].tolist()]
+
+
 def write_output_manifest(path: Path, outputs: list[dict[str, str]]) -> None:
     path.write_text(json.dumps(outputs, indent=2), encoding="utf-8")
 
@@ -312,78 +1515,169 @@ def main() -> int:
     temp_dir.mkdir(parents=True, exist_ok=True)
 
     started = time.time()
-    payload = read_input(input_file)
-
-    model_raw = str(payload.get("campaign_root_model", "")).strip()
-    if not model_raw:
-        raise ValueError("Missing required input: campaign_root_model")
-    model_path = resolve_model_path(model_raw, input_file)
-
-    dataset_job_id = str(payload.get("dataset_job_id", "")).strip()
-    config = parse_training_config(payload.get("training_config", {}))
-    backend = str(config.get("backend", "baseline_mlp")).strip().lower()
-
-    if backend == "physicsnemo":
-        raise RuntimeError(
-            "Scaffold backend does not execute full PhysicsNeMo yet. "
-            "Use backend='baseline_mlp' for smoke tests, then replace src/train_nemo_surrogate.py "
-            "with your production GPU training implementation."
+    time_to_main = process_age_seconds()
+    spans = PhaseSpans()
+    with spans.span("read_input"):
+        payload = read_input(input_file)
+
+        model_raw = str(payload.get("campaign_root_model", "")).strip()
+        if not model_raw:
+            raise ValueError("Missing required input: campaign_root_model")
+        model_path = resolve_model_paths(model_raw, input_file)
+
+        dataset_job_id = str(payload.get("dataset_job_id", "")).strip()
+        config = parse_training_config(payload.get("training_config", {}))
+        variants = sweep_variants(config) if config.get("sweep") else [config]
+        for variant in variants:
+            resolve_backend(variant)
+
+        previous: SurrogateModel | None = None
+        previous_raw = str(payload.get("previous_checkpoint", "") or "").strip()
+        if previous_raw:
+            if config.get("sweep"):
+                raise ValueError("previous_checkpoint (warm start) cannot be combined with training_config.sweep")
+            previous_path = resolve_model_path(previous_raw, input_file)
+            stats_raw = str(payload.get("previous_stats", "") or "").strip()
+            # Default to the sidecar written next to the checkpoint by the same run.
+            stats_path = (
+                resolve_model_path(stats_raw, input_file) if stats_raw else previous_path.parent / STATS_FILENAME
+            )
+            previous, previous_features = load_checkpoint(
+                previous_path, use_mmap=False, stats_path=stats_path if stats_path.exists() else None
+            )
+            # The checkpoint fixes the feature map and ensemble layout; report what was inherited.
+            config["backend"] = KIND_TO_BACKEND[previous.feature_map.kind]
+            config["ensemble_size"] = previous.ensemble_size
+            config["feature_columns"] = previous_features
+            config.update(feature_map_config(previous.feature_map))
+
+    with spans.span("load_dataset") as span:
+        dataset = load_dataset(model_path, config)
+        span["rows"] = dataset.features.shape[0]
+        if dataset.files:
+            span["files"] = len(dataset.files)
+    if previous is not None and dataset.feature_names != previous_features:
+        raise ValueError(
+            f"New rows have features {dataset.feature_names}, previous checkpoint expects {previous_features}"
         )
 
-    dataset = load_dataset(model_path, config)
-    x_train, y_train, x_val, y_val = split_dataset(
-        dataset.features,
-        dataset.targets,
-        float(config.get("val_split", 0.2)),
-        int(config.get("random_seed", 42)),
-    )
+    leaderboard: list[dict[str, Any]] = []
+    if config.get("sweep"):
+        with spans.span("sweep", rows=dataset.features.shape[0]) as span:
+            leaderboard = run_sweep(dataset, variants, int(config.get("sweep_workers", 0)))
+            span["variants"] = len(leaderboard)
+            failed = [row for row in leaderboard if row["status"] != "ok"]
+            if failed:
+                span["failed"] = len(failed)
+        for row in failed:
+            print(f"[train_nemo_surrogate] sweep variant {row['variant']} failed: {row['error']}")
+        if len(failed) == len(leaderboard):
+            raise ValueError(f"Every sweep variant failed; first error: {failed[0]['error']}")
+        # Refit only the winner so a single checkpoint is produced.
+        config = dict(
+            leaderboard[0]["config"],
+            ensemble_workers=config.get("ensemble_workers", 1),
+            data_workers=config.get("data_workers", 1),
+        )
 
-    weights = fit_ridge_regression(
-        x_train=x_train,
-        y_train=y_train,
-        ridge_lambda=float(config.get("ridge_lambda", 1e-6)),
+    backend = resolve_backend(config)
+    model, result = train_and_evaluate(
+        dataset.features, dataset.targets, config, previous, dataset.fidelity, spans
     )
-    train_pred = predict(x_train, weights)
-    val_pred = predict(x_val, weights)
-
-    metrics_payload = {
-        "backend": backend,
-        "dataset_job_id": dataset_job_id,
-        "dataset_source": dataset.source,
-        "samples": int(dataset.features.shape[0]),
-        "features": int(dataset.features.shape[1]),
-        "feature_names": dataset.feature_names,
-        "train_metrics": metrics(y_train, train_pred),
-        "val_metrics": metrics(y_val, val_pred),
-        "training_config": config,
-        "hardware": detect_hardware(),
-        "completed_at": datetime.now(timezone.utc).isoformat(),
-        "duration_seconds": round(time.time() - started, 3),
-    }
+    y_train, train_pred = result["y_train"], result["train_pred"]
+    y_val, val_pred, val_var = result["y_val"], result["val_pred"], result["val_var"]
+
+    with spans.span("hardware_probe") as span:
+        hardware, probe_cached = cached_hardware(float(config.get("hardware_probe_ttl_seconds", 86400)))
+        span["cached"] = probe_cached
+
+    with spans.span("evaluate", rows=y_train.shape[0] + y_val.shape[0]):
+        metrics_payload = {
+            "backend": backend,
+            "dataset_job_id": dataset_job_id,
+            "dataset_source": dataset.source,
+            "samples": int(dataset.features.shape[0]),
+            "features": int(dataset.features.shape[1]),
+            "model_features": model.feature_map.output_dim,
+            "feature_names": dataset.feature_names,
+            "train_metrics": metrics(y_train, train_pred),
+            "val_metrics": metrics(y_val, val_pred),
+            "training_config": config,
+            "hardware": hardware,
+            "startup": {
+                # Interpreter launch until main(), of which module imports (numpy etc.) are a part.
+                "time_to_main_seconds": None if time_to_main is None else round(time_to_main, 3),
+                "imports_seconds": round(_IMPORTS_SECONDS, 4),
+                "hardware_probe_seconds": round(spans.spans[-1]["wall_seconds"], 4),
+                "hardware_probe_cached": probe_cached,
+            },
+        }
+        if dataset.files:
+            metrics_payload["dataset_files"] = dataset.files
+        if previous is not None:
+            metrics_payload["warm_start"] = {
+                "previous_train_rows": previous.train_rows,
+                "new_train_rows": model.train_rows - previous.train_rows,
+                "total_train_rows": model.train_rows,
+                "val_rows_scope": "new rows only",
+            }
+        if "fidelity" in result:
+            metrics_payload["fidelity"] = {**result["fidelity"], "val_rows_scope": "high-fidelity rows only"}
+            if model.feature_map.kind == "identity":
+                # Linear correction: the scale factor on f_low(x) (weights end with [..., f_low, bias]).
+                metrics_payload["fidelity"]["low_fidelity_scale"] = float(np.mean(model.weights[..., -2]))
+        if leaderboard:
+            metrics_payload["sweep"] = {
+                "variants": len(leaderboard),
+                "best_variant": leaderboard[0]["variant"],
+                "best_val_metrics": leaderboard[0]["val_metrics"],
+                "failed_variants": sum(row["status"] != "ok" for row in leaderboard),
+            }
+        if model.ensemble_size:
+            metrics_payload["ensemble"] = ensemble_summary(y_val, val_pred, val_var, model.ensemble_size)
 
     metrics_path = temp_dir / "metrics.json"
     checkpoint_path = temp_dir / "model_checkpoint.npz"
+    mappable_checkpoint_path = temp_dir / "model_checkpoint.nsc"
     report_path = temp_dir / "training_report.md"
-
-    metrics_path.write_text(json.dumps(metrics_payload, indent=2), encoding="utf-8")
-    np.savez(
-        checkpoint_path,
-        weights=weights,
-        feature_names=np.asarray(dataset.feature_names, dtype=object),
-        dataset_source=np.asarray([dataset.source], dtype=object),
-    )
-    write_report(report_path, metrics_payload)
-
     outputs = [
         {"name": "metrics_json", "path": str(metrics_path)},
         {"name": "model_checkpoint_npz", "path": str(checkpoint_path)},
+        {"name": "model_checkpoint_nsc", "path": str(mappable_checkpoint_path)},
         {"name": "training_report_md", "path": str(report_path)},
     ]
+
+    with spans.span("write_artifacts"):
+        save_checkpoint(checkpoint_path, model, dataset.feature_names, dataset.source)
+        save_mappable_checkpoint(mappable_checkpoint_path, model, dataset.feature_names, dataset.source, config)
+        if model.ensemble_size:
+            ensemble_path = temp_dir / "ensemble_predictions.csv"
+            write_ensemble_predictions(ensemble_path, y_val, val_pred, val_var)
+            outputs.append({"name": "ensemble_predictions_csv", "path": str(ensemble_path)})
+        # A warm-started model keeps writing statistics so the next batch can be folded in too.
+        if config.get("save_stats") or previous is not None:
+            stats_path = temp_dir / STATS_FILENAME
+            save_stats(stats_path, model)
+            outputs.append({"name": "model_stats_npz", "path": str(stats_path)})
+        if leaderboard:
+            leaderboard_path = temp_dir / "sweep_leaderboard.json"
+            leaderboard_path.write_text(json.dumps(leaderboard, indent=2), encoding="utf-8")
+            outputs.append({"name": "sweep_leaderboard_json", "path": str(leaderboard_path)})
+
+    # Metrics and report are written last so they can include every phase before them.
+    metrics_payload["phases"] = spans.summary()
+    metrics_payload["completed_at"] = datetime.now(timezone.utc).isoformat()
+    metrics_payload["duration_seconds"] = round(time.time() - started, 3)
+    metrics_path.write_text(json.dumps(metrics_payload, indent=2), encoding="utf-8")
+    write_report(report_path, metrics_payload)
+    if config.get("trace"):
+        trace_path = temp_dir / "training_trace.json"
+        spans.write_trace(trace_path)
+        outputs.append({"name": "training_trace_json", "path": str(trace_path)})
     write_output_manifest(output_file, outputs)
 
-    print(f"[train_nemo_surrogate] wrote: {metrics_path}")
-    print(f"[train_nemo_surrogate] wrote: {checkpoint_path}")
-    print(f"[train_nemo_surrogate] wrote: {report_path}")
+    for output in outputs:
+        print(f"[train_nemo_surrogate] wrote: {output['path']}")
     print(f"[train_nemo_surrogate] output manifest: {output_file}")
     return 0
 
@@ -11,7 +11,7 @@ REPO_ROOT = Path(__file__).resolve().parent.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
-from istari_client import get_client, page_items
+from istari_client import cached_listing, get_client
 
 
 def parse_args() -> argparse.Namespace:
@@ -27,6 +27,7 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--agent-id", default="", help="Optional assigned agent id")
     parser.add_argument("--list-functions", action="store_true", help="List available functions and exit")
+    parser.add_argument("--refresh-metadata", action="store_true", help="Bypass the cached function listing")
     parser.add_argument("--dry-run", action="store_true", help="Print payload and exit without submitting")
     return parser.parse_args()
 
@@ -46,16 +47,12 @@ def load_training_config(path: str) -> dict:
     return payload
 
 
-def list_function_names(client) -> list[str]:
+def list_function_names(client, refresh: bool = False) -> list[str]:
     all_names: set[str] = set()
-    for page in range(1, 20):
-        functions = page_items(client.list_functions(page=page, size=100))
-        if not functions:
-            break
-        for fn in functions:
-            name = str(getattr(fn, "name", "")).strip()
-            if name:
-                all_names.add(name)
+    for fn in cached_listing(client, "functions", refresh=refresh):
+        name = str(getattr(fn, "name", "")).strip()
+        if name:
+            all_names.add(name)
     return sorted(all_names)
 
 
@@ -63,7 +60,10 @@ def main() -> None:
     args = parse_args()
     client = get_client()
 
-    available_functions = list_function_names(client)
+    available_functions = list_function_names(client, refresh=args.refresh_metadata)
+    if args.function_key not in available_functions and not args.refresh_metadata:
+        # The function may have been registered since the listing was cached.
+        available_functions = list_function_names(client, refresh=True)
     if args.list_functions:
         for fn in available_functions:
             print(fn)
@@ -0,0 +1,227 @@
+"""Surrogate-guided active learning: submit only the PyIntact cases the surrogate is least sure about.
+
+Each round trains a bootstrap-ensemble surrogate (nemo-integration trainer) on
+the completed cases in ``--results``, stops if the ``check_surrogate_metrics``
+gates pass, and otherwise scores a large random candidate pool inside the
+spec's grid bounds by ensemble predictive std. The top-K candidates (kept
+``--min-separation`` apart) are submitted through ``submit_campaign`` and
+polled to completion. Cases whose executor reports scalar outputs (the local
+executor does) are appended to ``--results`` directly. Otherwise
+``--collect-command`` refreshes the results CSV between rounds (for example by
+running dataset assembly); without it the script stops after one submission
+and can be rerun once results are in.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+NEMO_SRC = REPO_ROOT / "nemo-integration" / "src"
+CHECKS_DIR = REPO_ROOT / "use-cases" / "many-pyintact-to-nemo"
+for path in (REPO_ROOT, NEMO_SRC, CHECKS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from campaign_checks import PASS, check_surrogate_metrics, format_report
+from pyintact.campaign_utils import dump_json, load_json, make_case
+from pyintact.executors import add_executor_args, make_executor, report_client_stats
+from pyintact.poll_campaign import poll_until_done
+from pyintact.submit_campaign import require_field, submit_cases
+from train_nemo_surrogate import SurrogateModel, parse_training_config, predict_distribution, train_and_evaluate
+
+MIN_TRAINING_CASES = 5
+DEFAULT_TRAINING_CONFIG = {"backend": "random_fourier", "ensemble_size": 16, "ridge_lambda": 1e-3}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spec", required=True, help="Path to campaign spec JSON (grid bounds + geometry IDs)")
+    parser.add_argument("--results", required=True, help="CSV of completed cases: grid inputs + target column")
+    parser.add_argument("--target-column", default="max_von_mises_stress")
+    parser.add_argument("--training-config", default="", help="Optional trainer config JSON (needs ensemble_size > 1)")
+    parser.add_argument("--function-key", default="@istari:run_pyintact_simulation")
+    parser.add_argument("--output", default="campaign_jobs.active.json", help="Manifest of actively selected jobs")
+    parser.add_argument("--pool-size", type=int, default=20000, help="Random candidates scored per round")
+    parser.add_argument("--top-k", type=int, default=8, help="Cases submitted per round")
+    parser.add_argument("--min-separation", type=float, default=0.05, help="Min distance between picks (unit box)")
+    parser.add_argument("--max-rounds", type=int, default=5)
+    parser.add_argument("--min-r2", type=float, default=0.90)
+    parser.add_argument("--max-normalized-mae", type=float, default=0.08)
+    parser.add_argument("--collect-command", default="", help="Shell command that refreshes --results after a round")
+    parser.add_argument("--poll-seconds", type=float, default=20)
+    parser.add_argument("--throttle-seconds", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dry-run", action="store_true", help="Write the selected cases without submitting")
+    add_executor_args(parser)
+    return parser.parse_args()
+
+
+def grid_bounds(spec: dict) -> tuple[list[str], np.ndarray, np.ndarray]:
+    grid = spec.get("grid", {})
+    if not grid:
+        raise ValueError("campaign spec must define a non-empty 'grid' object")
+    keys = list(grid.keys())
+    lo = np.asarray([min(float(v) for v in grid[k]) for k in keys], dtype=np.float64)
+    hi = np.asarray([max(float(v) for v in grid[k]) for k in keys], dtype=np.float64)
+    return keys, lo, hi
+
+
+def load_results(path: Path, keys: list[str], target_column: str) -> tuple[np.ndarray, np.ndarray]:
+    if not path.exists():
+        return np.empty((0, len(keys))), np.empty(0)
+    x_rows: list[list[float]] = []
+    y_vals: list[float] = []
+    with path.open("r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                x_rows.append([float(row[k]) for k in keys])
+                y_vals.append(float(row[target_column]))
+            except (KeyError, TypeError, ValueError):
+                continue
+    return np.asarray(x_rows, dtype=np.float64).reshape(-1, len(keys)), np.asarray(y_vals, dtype=np.float64)
+
+
+def append_results(path: Path, keys: list[str], target_column: str, rows: list[dict]) -> int:
+    """Append rows that carry ``outputs[target_column]`` to the results CSV; return how many."""
+    usable = [r for r in rows if target_column in (r.get("outputs") or {})]
+    if not usable:
+        return 0
+    new_file = not path.exists() or path.stat().st_size == 0
+    with path.open("a", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow([*keys, target_column])
+        for row in usable:
+            writer.writerow([*(row["inputs"][k] for k in keys), row["outputs"][target_column]])
+    return len(usable)
+
+
+def load_training_config(path: str) -> dict:
+    raw = json.loads(Path(path).read_text(encoding="utf-8")) if path else dict(DEFAULT_TRAINING_CONFIG)
+    config = parse_training_config(raw)
+    if int(config.get("ensemble_size", 0)) < 2:
+        config["ensemble_size"] = DEFAULT_TRAINING_CONFIG["ensemble_size"]
+    return config
+
+
+def train_round(x: np.ndarray, y: np.ndarray, config: dict) -> tuple[SurrogateModel, dict]:
+    model, result = train_and_evaluate(x, y, config)
+    y_val, val_pred = result["y_val"], result["val_pred"]
+    err = y_val - val_pred
+    denom = float(np.sum((y_val - y_val.mean()) ** 2))
+    target_range = float(y.max() - y.min()) or 1.0
+    return model, {
+        # Same keys as surrogate_metrics_*.json so check_surrogate_metrics applies unchanged.
+        "val_normalized_mae": float(np.mean(np.abs(err))) / target_range,
+        "val_r2": float(1.0 - np.sum(err ** 2) / denom) if denom > 0 else 0.0,
+        "train_cases": int(x.shape[0]),
+    }
+
+
+def select_candidates(
+    scores: np.ndarray,
+    pool_unit: np.ndarray,
+    seen_unit: np.ndarray,
+    top_k: int,
+    min_separation: float,
+) -> list[int]:
+    """Highest-score candidates, skipping any within ``min_separation`` of a run or already picked case."""
+    picked: list[int] = []
+    taken = list(seen_unit)
+    for idx in np.argsort(-scores):
+        point = pool_unit[idx]
+        if taken and float(np.min(np.linalg.norm(np.asarray(taken) - point, axis=1))) < min_separation:
+            continue
+        picked.append(int(idx))
+        taken.append(point)
+        if len(picked) == top_k:
+            break
+    return picked
+
+
+def main() -> int:
+    args = parse_args()
+    spec = load_json(args.spec)
+    require_field(spec, "campaign_root_model_id")
+    keys, lo, hi = grid_bounds(spec)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    config = load_training_config(args.training_config)
+    rng = np.random.default_rng(args.seed)
+    manifest: list[dict] = load_json(args.output) if Path(args.output).exists() else []
+    executor = None
+
+    for round_no in range(1, args.max_rounds + 1):
+        x, y = load_results(Path(args.results), keys, args.target_column)
+        pool = lo + rng.random((args.pool_size, len(keys))) * (hi - lo)
+        pool_unit = (pool - lo) / span
+        seen_unit = (x - lo) / span
+
+        if x.shape[0] >= MIN_TRAINING_CASES:
+            model, round_metrics = train_round(x, y, config)
+            results = check_surrogate_metrics(round_metrics, args.max_normalized_mae, args.min_r2)
+            print(f"Round {round_no}: trained on {x.shape[0]} cases")
+            print(format_report(results))
+            if all(r.status == PASS for r in results):
+                print(f"Surrogate gates pass after {x.shape[0]} simulations; stopping.")
+                return 0
+            _, variance = predict_distribution(model, pool)
+            scores = np.sqrt(variance)
+        else:
+            # Too few cases to train: fall back to a space-filling pick (distance from seen cases).
+            print(f"Round {round_no}: {x.shape[0]} completed cases, seeding with a space-filling design")
+            scores = np.zeros(args.pool_size)
+            if seen_unit.shape[0]:
+                scores = np.min(np.linalg.norm(pool_unit[:, None, :] - seen_unit[None, :, :], axis=2), axis=1)
+
+        picks = select_candidates(scores, pool_unit, seen_unit, args.top_k, args.min_separation)
+        cases = [
+            make_case(spec, f"case_al{round_no:02d}_{i:03d}", {k: float(v) for k, v in zip(keys, pool[idx])})
+            for i, idx in enumerate(picks, start=1)
+        ]
+        for case, idx in zip(cases, picks):
+            case["acquisition_score"] = float(scores[idx])
+
+        if args.dry_run:
+            preview = [
+                {"case_id": c["case_id"], "job_id": None, "status": "dry_run", "inputs": c["inputs"],
+                 "acquisition_score": c["acquisition_score"]}
+                for c in cases
+            ]
+            dump_json(args.output, manifest + preview)
+            print(f"Wrote {len(preview)} selected cases (dry run) to: {Path(args.output).resolve()}")
+            return 0
+
+        executor = executor or make_executor(args)
+        throttle_seconds = args.throttle_seconds if args.executor == "istari" else 0.0
+        rows = submit_cases(executor, spec, cases, args.function_key, throttle_seconds)
+        for row, case in zip(rows, cases):
+            row["acquisition_round"] = round_no
+            row["acquisition_score"] = case["acquisition_score"]
+        manifest.extend(rows)
+        dump_json(args.output, manifest)
+        poll_until_done(executor, manifest, args.output, args.poll_seconds)
+        report_client_stats(executor, args.client_stats)
+
+        collected = append_results(Path(args.results), keys, args.target_column, rows)
+        if collected:
+            print(f"Appended {collected} executor results to {args.results}")
+        elif args.collect_command:
+            subprocess.run(args.collect_command, shell=True, check=True)
+        else:
+            print("Round submitted and finished. Refresh --results from the new case outputs, then rerun.")
+            return 1
+
+    print(f"Surrogate gates still failing after {args.max_rounds} rounds.")
+    return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
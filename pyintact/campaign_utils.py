@@ -7,9 +7,16 @@ import json
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+CASE_ORDERINGS = {"grid", "farthest_point"}
 TERMINAL_SUCCESS = {"succeeded", "completed", "success", "done"}
 TERMINAL_FAILURE = {"failed", "error", "cancelled", "canceled", "timed_out", "timeout"}
 TERMINAL_STATES = TERMINAL_SUCCESS | TERMINAL_FAILURE
+# Not started yet; any other non-terminal status counts as running.
+WAITING_STATES = {"submitted", "queued", "pending", "created", "scheduled", "waiting", "unknown"}
+# Keys of a fidelity level that steer case generation instead of the simulation scenario.
+FIDELITY_CONTROL_KEYS = {"max_cases"}
 
 
 def load_json(path: str | Path) -> dict[str, Any]:
@@ -20,6 +27,84 @@ def dump_json(path: str | Path, data: Any) -> None:
     Path(path).write_text(json.dumps(data, indent=2, sort_keys=False))
 
 
+def make_case(
+    spec: dict[str, Any],
+    case_id: str,
+    combo_dict: dict[str, Any],
+    fidelity: str | None = None,
+) -> dict[str, Any]:
+    base_material = spec.get("base_material", {})
+    scenario = dict(spec.get("scenario", {}))
+    if fidelity is not None:
+        scenario.update(fidelity_scenario(spec["fidelity"][fidelity]))
+    case = {
+        "case_id": case_id,
+        "inputs": combo_dict,
+        "material": {
+            "density": combo_dict.get("density", base_material.get("density", 7800.0)),
+            "poisson_ratio": combo_dict["poisson_ratio"],
+            "youngs_modulus": combo_dict["youngs_modulus"],
+        },
+        "load": {
+            "type": "pressure",
+            "magnitude": combo_dict["pressure_pa"],
+        },
+        "scenario": {
+            "resolution": scenario.get("resolution", 1000),
+            "units": scenario.get("units", "MKS"),
+        },
+    }
+    if fidelity is not None:
+        case["fidelity"] = fidelity
+    return case
+
+
+def fidelity_scenario(level: dict[str, Any]) -> dict[str, Any]:
+    """The ``scenario`` overrides of one fidelity level, without its control keys."""
+    return {key: value for key, value in level.items() if key not in FIDELITY_CONTROL_KEYS}
+
+
+def fidelity_levels(spec: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Validate the optional ``fidelity`` block: ``{"low": {...}, "high": {..., "max_cases": N}}``.
+
+    Each level holds ``scenario`` overrides (typically ``resolution``) plus
+    optional control keys (``FIDELITY_CONTROL_KEYS``), which never reach the
+    scenario.
+    """
+    levels = spec.get("fidelity")
+    if not levels:
+        return {}
+    if not isinstance(levels, dict) or set(levels) != {"low", "high"}:
+        raise ValueError("'fidelity' must define exactly the levels 'low' and 'high'")
+    return levels
+
+
+def evenly_spaced(count: int, total: int) -> list[int]:
+    if count >= total:
+        return list(range(total))
+    return sorted({round(i * (total - 1) / max(count - 1, 1)) for i in range(count)})
+
+
+def farthest_point_order(points: np.ndarray) -> list[int]:
+    """Greedy max-min traversal: each next point is the one farthest from all earlier ones.
+
+    Every prefix of the returned order is a well-spread design. Starts at the point
+    nearest the centroid; ties go to the lowest index, so the order is deterministic.
+    """
+    if points.shape[0] == 0:
+        return []
+    first = int(np.argmin(np.sum((points - points.mean(axis=0)) ** 2, axis=1)))
+    order = [first]
+    min_dist = np.sum((points - points[first]) ** 2, axis=1)
+    min_dist[first] = -1.0
+    for _ in range(points.shape[0] - 1):
+        nxt = int(np.argmax(min_dist))
+        order.append(nxt)
+        np.minimum(min_dist, np.sum((points - points[nxt]) ** 2, axis=1), out=min_dist)
+        min_dist[nxt] = -1.0
+    return order
+
+
 def generate_cases(spec: dict[str, Any]) -> list[dict[str, Any]]:
     grid = spec.get("grid", {})
     if not grid:
@@ -30,40 +115,44 @@ def generate_cases(spec: dict[str, Any]) -> list[dict[str, Any]]:
     if any(not isinstance(v, list) or not v for v in values):
         raise ValueError("every entry in 'grid' must be a non-empty list")
 
-    base_material = spec.get("base_material", {})
-    scenario = spec.get("scenario", {})
-
-    all_cases: list[dict[str, Any]] = []
-    for idx, combo in enumerate(itertools.product(*values), start=1):
-        combo_dict = dict(zip(keys, combo))
-        case = {
-            "case_id": f"case_{idx:05d}",
-            "inputs": combo_dict,
-            "material": {
-                "density": combo_dict.get("density", base_material.get("density", 7800.0)),
-                "poisson_ratio": combo_dict["poisson_ratio"],
-                "youngs_modulus": combo_dict["youngs_modulus"],
-            },
-            "load": {
-                "type": "pressure",
-                "magnitude": combo_dict["pressure_pa"],
-            },
-            "scenario": {
-                "resolution": scenario.get("resolution", 1000),
-                "units": scenario.get("units", "MKS"),
-            },
-        }
-        all_cases.append(case)
+    ordering = str(spec.get("ordering", "grid"))
+    if ordering not in CASE_ORDERINGS:
+        raise ValueError(f"'ordering' must be one of {sorted(CASE_ORDERINGS)}, got {ordering!r}")
+
+    combos = [dict(zip(keys, combo)) for combo in itertools.product(*values)]
+    if ordering == "farthest_point":
+        # Distances in grid-index space scaled to [0, 1] per axis, so log-spaced or
+        # non-numeric axes weigh the same as linear ones.
+        unit = np.asarray(
+            list(itertools.product(*[np.linspace(0.0, 1.0, len(v)) for v in values])),
+            dtype=np.float64,
+        ).reshape(len(combos), len(keys))
+        combos = [combos[i] for i in farthest_point_order(unit)]
 
     max_cases = spec.get("max_cases")
     if isinstance(max_cases, int) and max_cases > 0:
-        return all_cases[:max_cases]
-    return all_cases
+        combos = combos[:max_cases]
+
+    levels = fidelity_levels(spec)
+    if not levels:
+        return [make_case(spec, f"case_{idx:05d}", combo) for idx, combo in enumerate(combos, start=1)]
+
+    # Cheap low-fidelity runs cover the whole grid; the expensive high-fidelity
+    # runs cover a spread-out subset that anchors the low-to-high correction.
+    high = levels["high"]
+    high_count = int(high.get("max_cases", max(2, len(combos) // 10)))
+    if ordering == "farthest_point":
+        high_combos = combos[:high_count]
+    else:
+        high_combos = [combos[i] for i in evenly_spaced(high_count, len(combos))]
+    cases = [make_case(spec, f"case_lo_{idx:05d}", combo, "low") for idx, combo in enumerate(combos, start=1)]
+    cases += [make_case(spec, f"case_hi_{idx:05d}", combo, "high") for idx, combo in enumerate(high_combos, start=1)]
+    return cases
 
 
 def make_job_parameters(spec: dict[str, Any], case: dict[str, Any]) -> dict[str, Any]:
     geometry = spec.get("geometry", {})
-    return {
+    params = {
         "case_id": case["case_id"],
         # These keys are a common shape for custom Istari modules.
         # Adapt names here if your tenant's function schema differs.
@@ -78,6 +167,9 @@ def make_job_parameters(spec: dict[str, Any], case: dict[str, Any]) -> dict[str,
         },
         "campaign_id": spec.get("campaign_name", "pyintact_campaign"),
     }
+    if "fidelity" in case:
+        params["fidelity"] = case["fidelity"]
+    return params
 
 
 def normalize_status(job: Any) -> str:
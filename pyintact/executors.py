@@ -0,0 +1,199 @@
+"""Execution backends for PyIntact campaigns.
+
+An executor submits one case and reports on it by job id:
+
+    submit(spec, case, function_key) -> job_id
+    status(job_id)                   -> normalized status (see campaign_utils)
+    fetch_outputs(job_id)            -> dict of scalar outputs ({} if unavailable)
+
+``IstariExecutor`` wraps the Istari client. ``LocalExecutor`` runs a simulation
+callable in a local process pool and keeps one JSON file per job in a job-store
+directory, so a later ``poll_campaign --executor local`` run (a separate process)
+sees the same jobs. Manifests have the same shape for both backends.
+
+``stats()`` returns per-endpoint API call counters and latency histograms
+(see ``istari_client.InstrumentedClient``); it is empty for local runs.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import math
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+from pyintact.campaign_utils import dump_json, make_job_parameters, normalize_status
+
+EXECUTORS = ("istari", "local")
+DEFAULT_LOCAL_SIMULATOR = "pyintact.executors:analytic_beam_simulation"
+DEFAULT_JOB_DIR = ".campaign_jobs"
+
+
+class IstariExecutor:
+    def __init__(self, client=None) -> None:
+        if client is None:
+            from istari_client import get_client
+
+            client = get_client()
+        self.client = client
+
+    def submit(self, spec: dict, case: dict, function_key: str) -> str:
+        job = self.client.add_job(
+            model_id=str(spec["campaign_root_model_id"]).strip(),
+            function=function_key,
+            parameters=make_job_parameters(spec, case),
+        )
+        return str(getattr(job, "id", ""))
+
+    def status(self, job_id: str) -> str:
+        return normalize_status(self.client.get_job(job_id))
+
+    def fetch_outputs(self, job_id: str) -> dict[str, Any]:
+        # Istari outputs are artifacts on the job; dataset assembly downloads them.
+        return {}
+
+    def stats(self) -> dict[str, Any]:
+        from istari_client import client_stats
+
+        return client_stats(self.client)
+
+    def close(self) -> None:
+        pass
+
+
+def load_simulator(ref: str) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    module_name, _, attr = ref.partition(":")
+    if not module_name or not attr:
+        raise ValueError(f"Simulator must be 'module:function', got {ref!r}")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def write_job_record(path: Path, record: dict[str, Any]) -> None:
+    # Replace atomically so a concurrent poller never reads a half-written file.
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(record, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def run_local_job(job_path: str, simulator_ref: str) -> str:
+    path = Path(job_path)
+    record = json.loads(path.read_text(encoding="utf-8"))
+    write_job_record(path, {**record, "status": "running"})
+    try:
+        outputs = load_simulator(simulator_ref)(record["parameters"])
+        record.update(status="completed", outputs=outputs)
+    except Exception as exc:  # a failed case is a job result, not a pool failure
+        record.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+    write_job_record(path, record)
+    return record["status"]
+
+
+class LocalExecutor:
+    def __init__(
+        self,
+        job_dir: str | Path = DEFAULT_JOB_DIR,
+        workers: int = 0,
+        simulator: str = DEFAULT_LOCAL_SIMULATOR,
+    ) -> None:
+        self.job_dir = Path(job_dir)
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.simulator = simulator
+        load_simulator(simulator)  # fail fast on a bad reference
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _job_path(self, job_id: str) -> Path:
+        return self.job_dir / f"{job_id}.json"
+
+    def submit(self, spec: dict, case: dict, function_key: str) -> str:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        job_id = f"local-{uuid.uuid4().hex[:12]}"
+        record = {
+            "job_id": job_id,
+            "case_id": case["case_id"],
+            "function": function_key,
+            "status": "queued",
+            "parameters": make_job_parameters(spec, case),
+        }
+        path = self._job_path(job_id)
+        write_job_record(path, record)
+        self._pool.submit(run_local_job, str(path), self.simulator)
+        return job_id
+
+    def _record(self, job_id: str) -> dict[str, Any]:
+        path = self._job_path(job_id)
+        if not path.exists():
+            return {"status": "unknown"}
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def status(self, job_id: str) -> str:
+        return str(self._record(job_id).get("status", "unknown"))
+
+    def fetch_outputs(self, job_id: str) -> dict[str, Any]:
+        return dict(self._record(job_id).get("outputs") or {})
+
+    def stats(self) -> dict[str, Any]:
+        return {}
+
+    def close(self) -> None:
+        """Wait for every submitted job; local jobs do not outlive the submitting process."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+def analytic_beam_simulation(parameters: dict[str, Any]) -> dict[str, Any]:
+    """Closed-form stand-in for run_pyintact_simulation (pressure-loaded cantilever plate).
+
+    Good enough to smoke-test campaigns, dataset assembly and training offline.
+    Coarser ``scenario.resolution`` underestimates both outputs, like a coarse mesh.
+    """
+    sim = parameters["simulation_config"]
+    material = sim["material"]
+    pressure = float(sim["load"]["magnitude"])
+    youngs = float(material["youngs_modulus"])
+    nu = float(material["poisson_ratio"])
+    resolution = float(sim.get("scenario", {}).get("resolution", 1000))
+
+    length, thickness = 1.0, 0.05
+    discretization = 1.0 - math.exp(-resolution / 300.0)
+    stress = 3.0 * pressure * (length / thickness) ** 2 * (1.0 + 0.15 * nu) * discretization
+    displacement = 1.5 * pressure * length**4 / (youngs * thickness**3) * (1.0 - nu**2) * discretization
+    return {"max_von_mises_stress": stress, "max_displacement": displacement}
+
+
+def add_executor_args(parser) -> None:
+    parser.add_argument("--executor", choices=EXECUTORS, default="istari", help="Where cases run")
+    parser.add_argument("--job-dir", default=DEFAULT_JOB_DIR, help="Local executor job store")
+    parser.add_argument("--workers", type=int, default=0, help="Local executor processes (default: all cores)")
+    parser.add_argument(
+        "--local-simulator",
+        default=DEFAULT_LOCAL_SIMULATOR,
+        help="Local executor simulation callable as module:function (takes job parameters, returns outputs)",
+    )
+    parser.add_argument("--client-stats", default="", help="Write per-endpoint API call stats JSON here")
+
+
+def report_client_stats(executor, path: str = "") -> None:
+    from istari_client import format_client_stats
+
+    stats = executor.stats()
+    if not stats:
+        return
+    print("API calls:")
+    for line in format_client_stats(stats):
+        print(f"  {line}")
+    if path:
+        dump_json(path, stats)
+        print(f"Wrote client stats: {Path(path).resolve()}")
+
+
+def make_executor(args) -> IstariExecutor | LocalExecutor:
+    if args.executor == "local":
+        return LocalExecutor(args.job_dir, args.workers, args.local_simulator)
+    return IstariExecutor()
@@ -0,0 +1,399 @@
+"""Weighted fair-share scheduler for several campaigns sharing one tenant.
+
+Instead of each team running ``submit_campaign.py`` (first come, first served),
+campaign specs are dropped into an inbox directory and one daemon meters their
+submissions under a global cap on jobs in flight:
+
+    python -m pyintact.fair_share enqueue --inbox fair_share/inbox --spec sweep.json --weight 1
+    python -m pyintact.fair_share enqueue --inbox fair_share/inbox --spec urgent.json --weight 4 --priority 1
+    python -m pyintact.fair_share serve --inbox fair_share/inbox --max-in-flight 32
+
+A spec's optional ``scheduling`` block holds ``weight`` (default 1) and
+``priority`` (default 0). Each time a slot frees up, it goes to the highest
+priority campaign with cases left, and within a priority to the campaign with
+the lowest virtual time (cases submitted / weight), so campaigns submit in
+proportion to their weights. A campaign that arrives later starts at the
+current virtual time of the busy campaigns, so it earns its share from then on
+rather than a burst for the time it was absent.
+
+Accepted specs move to ``<output-dir>/accepted``, and each campaign's manifest
+(``<output-dir>/<name>.jobs.json``, the same rows as ``submit_campaign``) is
+rewritten every pass, so a restarted daemon resumes where it stopped. Every
+submission is also appended to ``<name>.journal.jsonl`` (fsynced) as soon as
+the executor returns its job id, together with the campaign's virtual time,
+so a crash between passes does not submit those cases again; only a submit
+interrupted mid-call can repeat. A case whose submission raises stays queued
+and is retried on later passes; after ``MAX_SUBMIT_ATTEMPTS`` it is recorded
+as a ``failed`` row with the error.
+``<output-dir>/fair_share_report.json`` holds per-campaign throughput and wait
+times: scheduler wait (accepted -> submitted) and queue wait (submitted -> first
+seen running).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import median
+from typing import Any
+
+from pyintact.campaign_utils import TERMINAL_STATES, TERMINAL_SUCCESS, dump_json, generate_cases, load_json
+from pyintact.executors import add_executor_args, make_executor, report_client_stats
+from pyintact.forecast import format_duration, quantile
+from pyintact.submit_campaign import require_field
+from pyintact.telemetry import finished_at, running_since
+
+MAX_SUBMIT_ATTEMPTS = 3
+
+
+@dataclass
+class Campaign:
+    name: str
+    spec: dict[str, Any]
+    cases: list[dict[str, Any]]
+    weight: float = 1.0
+    priority: int = 0
+    accepted_at: float = 0.0
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    virtual_time: float = 0.0
+    # case_id -> failed submission attempts in this process.
+    submit_failures: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def pending(self) -> int:
+        return len(self.cases) - len(self.rows)
+
+    @property
+    def in_flight(self) -> int:
+        return sum(1 for r in self.rows if r["status"] not in TERMINAL_STATES)
+
+    @property
+    def finished(self) -> bool:
+        return self.pending == 0 and self.in_flight == 0
+
+
+def scheduling(spec: dict[str, Any]) -> tuple[float, int]:
+    block = spec.get("scheduling") or {}
+    weight, priority = float(block.get("weight", 1.0)), int(block.get("priority", 0))
+    if weight <= 0:
+        raise ValueError(f"scheduling.weight must be positive, got {weight}")
+    return weight, priority
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def enqueue(inbox: str | Path, spec_path: str | Path, weight: float, priority: int, name: str = "") -> Path:
+    spec = load_json(spec_path)
+    spec["scheduling"] = {**(spec.get("scheduling") or {}), "weight": weight, "priority": priority}
+    scheduling(spec)
+    require_field(spec, "campaign_root_model_id")
+    inbox = Path(inbox)
+    inbox.mkdir(parents=True, exist_ok=True)
+    path = inbox / f"{name or Path(spec_path).stem}.json"
+    if path.exists():
+        raise ValueError(f"{path} is already queued")
+    # The daemon picks up *.json only, so it never sees a half-written request.
+    write_json_atomic(path, spec)
+    return path
+
+
+def pick_campaign(campaigns: list[Campaign]) -> Campaign | None:
+    ready = [c for c in campaigns if c.pending]
+    if not ready:
+        return None
+    return min(ready, key=lambda c: (-c.priority, c.virtual_time, c.accepted_at, c.name))
+
+
+class FairShareScheduler:
+    def __init__(
+        self,
+        executor,
+        output_dir: str | Path,
+        max_in_flight: int,
+        function_key: str,
+        throttle_seconds: float = 0.0,
+    ) -> None:
+        self.executor = executor
+        self.output_dir = Path(output_dir)
+        self.accepted_dir = self.output_dir / "accepted"
+        self.accepted_dir.mkdir(parents=True, exist_ok=True)
+        self.max_in_flight = max_in_flight
+        self.function_key = function_key
+        self.throttle_seconds = throttle_seconds
+        self.state_path = self.output_dir / "fair_share_state.json"
+        self.campaigns: list[Campaign] = []
+        for path in sorted(self.accepted_dir.glob("*.json")):
+            self._load(path)
+
+    def _manifest_path(self, name: str) -> Path:
+        return self.output_dir / f"{name}.jobs.json"
+
+    def _journal_path(self, name: str) -> Path:
+        return self.output_dir / f"{name}.journal.jsonl"
+
+    def _journal(self, campaign: Campaign, row: dict[str, Any]) -> None:
+        with self._journal_path(campaign.name).open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"row": row, "virtual_time": campaign.virtual_time}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _load(self, path: Path) -> Campaign:
+        spec = load_json(path)
+        weight, priority = scheduling(spec)
+        campaign = Campaign(
+            name=path.stem,
+            spec=spec,
+            cases=generate_cases(spec),
+            weight=weight,
+            priority=priority,
+            accepted_at=float(spec["scheduling"].get("accepted_at", time.time())),
+        )
+        manifest = self._manifest_path(campaign.name)
+        if manifest.exists():
+            # Resume: cases are generated in a deterministic order, so submitted rows are a prefix.
+            campaign.rows = load_json(manifest)
+        state = load_json(self.state_path) if self.state_path.exists() else {}
+        campaign.virtual_time = float(
+            state.get(campaign.name, {}).get("virtual_time", len(campaign.rows) / campaign.weight)
+        )
+        journal = self._journal_path(campaign.name)
+        if journal.exists():
+            # Submissions made after the last save; entries already in the manifest are skipped.
+            known = {r["case_id"] for r in campaign.rows}
+            for line in journal.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line torn by the crash; its submit had not been recorded
+                if entry["row"]["case_id"] not in known:
+                    campaign.rows.append(entry["row"])
+                    known.add(entry["row"]["case_id"])
+                campaign.virtual_time = max(campaign.virtual_time, float(entry["virtual_time"]))
+        self.campaigns.append(campaign)
+        return campaign
+
+    def _save_state(self) -> None:
+        write_json_atomic(self.state_path, {c.name: {"virtual_time": c.virtual_time} for c in self.campaigns})
+
+    def accept(self, inbox: str | Path) -> list[Campaign]:
+        """Move new specs from ``inbox`` into the schedule."""
+        accepted = []
+        known = {c.name for c in self.campaigns}
+        for path in sorted(Path(inbox).glob("*.json")):
+            if path.stem in known:
+                print(f"Skipping {path.name}: a campaign named {path.stem!r} is already scheduled")
+                continue
+            try:
+                spec = load_json(path)
+                scheduling(spec)
+                require_field(spec, "campaign_root_model_id")
+                generate_cases(spec)
+            except (ValueError, KeyError, json.JSONDecodeError) as exc:
+                print(f"Rejecting {path.name}: {exc}")
+                path.rename(path.with_suffix(".rejected"))
+                continue
+            # Start a newcomer at the busy campaigns' virtual time so it gets no catch-up burst.
+            busy = [c.virtual_time for c in self.campaigns if c.pending]
+            spec["scheduling"] = {**(spec.get("scheduling") or {}), "accepted_at": time.time()}
+            target = self.accepted_dir / path.name
+            dump_json(target, spec)
+            path.unlink()
+            campaign = self._load(target)
+            campaign.virtual_time = max(campaign.virtual_time, min(busy, default=0.0))
+            self._save_state()
+            accepted.append(campaign)
+            print(
+                f"Accepted {campaign.name}: {len(campaign.cases)} cases, "
+                f"weight {campaign.weight:g}, priority {campaign.priority}"
+            )
+        return accepted
+
+    def poll(self) -> None:
+        for campaign in self.campaigns:
+            for row in campaign.rows:
+                if row["status"] in TERMINAL_STATES:
+                    continue
+                row["status"] = self.executor.status(row["job_id"])
+                stamps = row.setdefault("timestamps", {})
+                stamps.setdefault(row["status"], time.time())
+                if row["status"] in TERMINAL_SUCCESS:
+                    outputs = self.executor.fetch_outputs(row["job_id"])
+                    if outputs:
+                        row["outputs"] = outputs
+
+    def fill(self) -> int:
+        """Submit cases into free slots by priority and weighted fair share; returns the number submitted."""
+        in_flight = sum(c.in_flight for c in self.campaigns)
+        submitted = 0
+        while in_flight < self.max_in_flight:
+            campaign = pick_campaign(self.campaigns)
+            if campaign is None:
+                break
+            case = campaign.cases[len(campaign.rows)]
+            row = {"case_id": case["case_id"], "inputs": case["inputs"]}
+            if "fidelity" in case:
+                row["fidelity"] = case["fidelity"]
+            try:
+                job_id = self.executor.submit(campaign.spec, case, self.function_key)
+            except Exception as exc:
+                attempts = campaign.submit_failures.get(case["case_id"], 0) + 1
+                campaign.submit_failures[case["case_id"]] = attempts
+                error = f"{type(exc).__name__}: {exc}"
+                print(f"Submit failed for {campaign.name}/{case['case_id']} (attempt {attempts}): {error}")
+                if attempts < MAX_SUBMIT_ATTEMPTS:
+                    break  # leave the case queued; retry on the next pass
+                row.update(job_id=None, status="failed", error=error, timestamps={"failed": time.time()})
+                campaign.rows.append(row)
+                self._journal(campaign, row)
+                continue
+            row.update(job_id=job_id, status="submitted", timestamps={"submitted": time.time()})
+            campaign.rows.append(row)
+            campaign.virtual_time += 1.0 / campaign.weight
+            self._journal(campaign, row)
+            in_flight += 1
+            submitted += 1
+            time.sleep(self.throttle_seconds)
+        return submitted
+
+    def save(self) -> dict[str, Any]:
+        for campaign in self.campaigns:
+            write_json_atomic(self._manifest_path(campaign.name), campaign.rows)
+        self._save_state()
+        # Everything journaled is in the manifests now.
+        for campaign in self.campaigns:
+            self._journal_path(campaign.name).unlink(missing_ok=True)
+        report = {"at": time.time(), "max_in_flight": self.max_in_flight, "campaigns": self.report()}
+        dump_json(self.output_dir / "fair_share_report.json", report)
+        return report
+
+    def report(self) -> list[dict[str, Any]]:
+        now = time.time()
+        total = sum(len(c.rows) for c in self.campaigns if not c.finished) or 1
+        rows = []
+        for c in self.campaigns:
+            stamps = [r.get("timestamps") or {} for r in c.rows]
+            waits = [s["submitted"] - c.accepted_at for s in stamps if "submitted" in s]
+            queue = [running_since(s) - s["submitted"] for s in stamps if running_since(s) is not None]
+            ended = [t for t in (finished_at(s) for s in stamps) if t is not None]
+            done = sum(1 for r in c.rows if r["status"] in TERMINAL_STATES)
+            elapsed = (max(ended) if c.finished and ended else now) - c.accepted_at
+            rows.append(
+                {
+                    "campaign": c.name,
+                    "weight": c.weight,
+                    "priority": c.priority,
+                    "cases": len(c.cases),
+                    "submitted": len(c.rows),
+                    "in_flight": c.in_flight,
+                    "done": done,
+                    "failed": sum(1 for r in c.rows if r["status"] in TERMINAL_STATES - TERMINAL_SUCCESS),
+                    "finished": c.finished,
+                    # Share of the submissions made by campaigns that are still active.
+                    "active_share": 0.0 if c.finished else len(c.rows) / total,
+                    "throughput_per_minute": 60.0 * done / elapsed if elapsed > 0 else 0.0,
+                    "elapsed_seconds": elapsed,
+                    "scheduler_wait_seconds_p50": median(waits) if waits else None,
+                    "scheduler_wait_seconds_p90": quantile(waits, 0.9),
+                    "queue_seconds_p50": median(queue) if queue else None,
+                }
+            )
+        return rows
+
+    def run(self, inbox: str | Path, poll_seconds: float, exit_when_idle: bool) -> None:
+        while True:
+            if inbox:
+                self.accept(inbox)
+            self.poll()
+            submitted = self.fill()
+            self.save()
+            in_flight = sum(c.in_flight for c in self.campaigns)
+            pending = sum(c.pending for c in self.campaigns)
+            active = [c.name for c in self.campaigns if not c.finished]
+            if submitted or active:
+                print(f"Submitted {submitted} | in flight {in_flight}/{self.max_in_flight} | pending {pending}")
+            if not active and exit_when_idle:
+                return
+            time.sleep(poll_seconds)
+
+
+def format_report(rows: list[dict[str, Any]]) -> list[str]:
+    lines = [
+        f"{'campaign':<24} {'w':>4} {'pri':>3} {'done':>11} {'fail':>5} {'jobs/min':>9} "
+        f"{'wait p50':>9} {'wait p90':>9} {'queue p50':>9}"
+    ]
+    for r in rows:
+        lines.append(
+            f"{r['campaign'][:24]:<24} {r['weight']:>4g} {r['priority']:>3} "
+            f"{r['done']:>5}/{r['cases']:<5} {r['failed']:>5} {r['throughput_per_minute']:>9.2f} "
+            f"{format_duration(r['scheduler_wait_seconds_p50']):>9} "
+            f"{format_duration(r['scheduler_wait_seconds_p90']):>9} "
+            f"{format_duration(r['queue_seconds_p50']):>9}"
+        )
+    return lines
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    queue = commands.add_parser("enqueue", help="Queue a campaign spec for the daemon")
+    queue.add_argument("--inbox", required=True)
+    queue.add_argument("--spec", required=True, help="Path to campaign spec JSON")
+    queue.add_argument("--weight", type=float, default=1.0, help="Relative share of submissions")
+    queue.add_argument("--priority", type=int, default=0, help="Higher priorities are served first")
+    queue.add_argument("--name", default="", help="Campaign name (default: spec file stem)")
+
+    serve = commands.add_parser("serve", help="Run the scheduler")
+    serve.add_argument("--inbox", default="", help="Directory watched for queued specs")
+    serve.add_argument("--output-dir", default="fair_share")
+    serve.add_argument("--function-key", default="@istari:run_pyintact_simulation")
+    serve.add_argument("--max-in-flight", type=int, default=32, help="Global cap on unfinished jobs")
+    serve.add_argument("--poll-seconds", type=float, default=20)
+    serve.add_argument("--throttle-seconds", type=float, default=0.05)
+    serve.add_argument(
+        "--exit-when-idle",
+        action="store_true",
+        help="Exit once every campaign has finished (default when no --inbox is watched)",
+    )
+    add_executor_args(serve)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "enqueue":
+        path = enqueue(args.inbox, args.spec, args.weight, args.priority, args.name)
+        print(f"Queued: {path.resolve()}")
+        return
+
+    if args.max_in_flight < 1:
+        raise ValueError("--max-in-flight must be at least 1")
+    executor = make_executor(args)
+    # Throttling protects the Istari control plane; local jobs need none.
+    throttle_seconds = args.throttle_seconds if args.executor == "istari" else 0.0
+    scheduler = FairShareScheduler(
+        executor, args.output_dir, args.max_in_flight, args.function_key, throttle_seconds
+    )
+    try:
+        scheduler.run(args.inbox, args.poll_seconds, args.exit_when_idle or not args.inbox)
+    except KeyboardInterrupt:
+        print("Stopping; in-flight jobs keep running and are picked up on restart.")
+    finally:
+        scheduler.save()
+        executor.close()
+    for line in format_report(scheduler.report()):
+        print(line)
+    report_client_stats(executor, args.client_stats)
+    print(f"Wrote report: {(Path(args.output_dir) / 'fair_share_report.json').resolve()}")
+
+
+if __name__ == "__main__":
+    main()
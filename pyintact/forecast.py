@@ -0,0 +1,131 @@
+"""Completion-rate and ETA forecasting for a polled campaign.
+
+Works from the manifest ``timestamps`` (first time each status was seen). Job
+completions are treated as a Poisson process whose rate is estimated over a
+recent window (``window_seconds``), so ramp-up and slowdowns are tracked. The
+remaining makespan is ``remaining / rate`` with a log-normal interval whose
+width combines the rate estimate's uncertainty (``1/sqrt(k)`` for ``k``
+completions in the window) and the completion noise of the remaining jobs
+(``1/sqrt(remaining)``).
+
+A throughput drop is flagged when the windowed rate falls below
+``drop_ratio`` of the rate since the first completion while jobs are still
+waiting (a slowdown with nothing waiting is the campaign tail); no job running
+while some wait is flagged as likely agent starvation.
+"""
+
+from __future__ import annotations
+
+import math
+from statistics import median
+from typing import Any
+
+from pyintact.campaign_utils import TERMINAL_STATES, WAITING_STATES
+from pyintact.telemetry import finished_at, running_since
+
+# Two-sided 90% normal quantile.
+Z_90 = 1.645
+MIN_COMPLETIONS = 3
+
+
+def quantile(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def format_duration(seconds: float | None) -> str:
+    if seconds is None or math.isinf(seconds):
+        return "?"
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 5400:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def forecast(
+    rows: list[dict[str, Any]],
+    now: float,
+    window_seconds: float = 900.0,
+    drop_ratio: float = 0.5,
+) -> dict[str, Any]:
+    jobs = [r for r in rows if r.get("job_id")]
+    stamps = [r.get("timestamps") or {} for r in jobs]
+    finished = sorted(t for t in (finished_at(s) for s in stamps) if t is not None)
+    statuses = [str(r.get("status", "unknown")) for r in jobs]
+    waiting = sum(1 for s in statuses if s in WAITING_STATES)
+    done = sum(1 for s in statuses if s in TERMINAL_STATES)
+    remaining = len(jobs) - done
+    submitted = [s["submitted"] for s in stamps if "submitted" in s]
+
+    queue_times, run_times = [], []
+    for s in stamps:
+        running, end = running_since(s), finished_at(s)
+        if running is not None and "submitted" in s:
+            queue_times.append(running - s["submitted"])
+        if running is not None and end is not None:
+            run_times.append(end - running)
+
+    result: dict[str, Any] = {
+        "at": now,
+        "jobs": len(jobs),
+        "done": done,
+        "waiting": waiting,
+        "running": remaining - waiting,
+        "remaining": remaining,
+        "elapsed_seconds": now - min(submitted) if submitted else None,
+        "queue_seconds_p50": median(queue_times) if queue_times else None,
+        "queue_seconds_p90": quantile(queue_times, 0.9),
+        "run_seconds_p50": median(run_times) if run_times else None,
+        "run_seconds_p90": quantile(run_times, 0.9),
+        "rate_per_second": None,
+        "overall_rate_per_second": None,
+        "eta_seconds": None,
+        "eta_low_seconds": None,
+        "eta_high_seconds": None,
+        "warnings": [],
+    }
+    if remaining == 0:
+        result.update(eta_seconds=0.0, eta_low_seconds=0.0, eta_high_seconds=0.0)
+        return result
+    if waiting and waiting == remaining and finished:
+        result["warnings"].append(f"no job running while {waiting} wait (agent starvation?)")
+    if len(finished) < MIN_COMPLETIONS:
+        return result
+
+    # Rates count completions after the window start, over the time since it.
+    overall = (len(finished) - 1) / max(now - finished[0], 1e-9)
+    start = max(now - window_seconds, finished[0])
+    recent = sum(1 for t in finished if t > start)
+    rate = recent / max(now - start, 1e-9)
+    result.update(rate_per_second=rate, overall_rate_per_second=overall)
+    if recent == 0:
+        result["eta_seconds"] = result["eta_high_seconds"] = math.inf
+        result["warnings"].append(f"no completions in the last {format_duration(now - start)}")
+        return result
+
+    eta = remaining / rate
+    spread = Z_90 * math.sqrt(1.0 / recent + 1.0 / remaining)
+    result.update(eta_seconds=eta, eta_low_seconds=eta * math.exp(-spread), eta_high_seconds=eta * math.exp(spread))
+    # With nothing waiting a slowdown is just the campaign tail, not lost capacity.
+    if waiting and now - finished[0] > window_seconds and rate < drop_ratio * overall:
+        result["warnings"].append(
+            f"throughput dropped to {rate * 60:.2f}/min from {overall * 60:.2f}/min overall with {waiting} waiting"
+        )
+    return result
+
+
+def describe(stats: dict[str, Any]) -> str:
+    if stats["remaining"] == 0:
+        return "done"
+    if stats["rate_per_second"] is None:
+        return "ETA ? (waiting for completions)"
+    if math.isinf(stats["eta_seconds"]):
+        return "ETA ? (no recent completions)"
+    return (
+        f"ETA {format_duration(stats['eta_seconds'])} "
+        f"({format_duration(stats['eta_low_seconds'])}-{format_duration(stats['eta_high_seconds'])} 90%) "
+        f"at {stats['rate_per_second'] * 60:.2f} jobs/min"
+    )
@@ -0,0 +1,435 @@
+"""Run the campaign end to end with stage-level caching: submit, poll, assemble, train, checks.
+
+Stages and what they wrap:
+
+    submit        pyintact.submit_campaign
+    poll          pyintact.poll_campaign
+    assemble      manifest outputs -> dataset.csv + dataset_summary.json (local executor)
+    train         nemo-integration trainer on dataset.csv (local executor), or
+                  nemo/launch_training.py with --dataset-job-id (Istari)
+    data_checks   campaign_checks throughput + dataset readiness gates
+    model_checks  campaign_checks surrogate gates on the trainer metrics (local executor)
+
+Each stage's fingerprint hashes its command and parameters, the bytes of its
+input files, the source of the code it runs and the fingerprints of the
+stages it depends on. A stage whose fingerprint matches the last successful
+run in ``<workdir>/.pipeline/state.json`` and whose outputs are unchanged on
+disk is skipped. Remote stages (Istari submit and training) start paid jobs,
+so their code is not fingerprinted, and once they have succeeded they never
+rerun by themselves: if their inputs or outputs change, the run stops there,
+prints what changed and asks for ``--force <stage>``. Stages whose dependencies are done run concurrently (for
+example ``train`` next to ``data_checks``). Command output goes to
+``<workdir>/logs/<stage>.log``. The run ends with a per-stage timing summary
+and exits non-zero when a stage fails or a quality gate does not pass.
+
+Usage:
+    python -m pyintact.pipeline --spec use-cases/many-pyintact-to-nemo/campaign_spec.example.json \\
+        --workdir pipeline_run --executor local
+    python -m pyintact.pipeline --spec campaign_spec.json --workdir pipeline_run --dataset-job-id <job-id>
+    python -m pyintact.pipeline ... --force poll      # rerun one stage; later ones rerun if its outputs change
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CHECKS_DIR = REPO_ROOT / "use-cases" / "many-pyintact-to-nemo"
+TRAINER = REPO_ROOT / "nemo-integration" / "src" / "train_nemo_surrogate.py"
+for path in (REPO_ROOT, CHECKS_DIR):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from campaign_checks import (
+    PASS,
+    CheckResult,
+    check_campaign_throughput,
+    check_dataset_readiness,
+    check_surrogate_metrics,
+    format_report,
+)
+from pyintact.campaign_utils import TERMINAL_SUCCESS, dump_json, load_json
+from pyintact.executors import DEFAULT_LOCAL_SIMULATOR, EXECUTORS
+
+
+@dataclass
+class Stage:
+    name: str
+    deps: list[str]
+    inputs: list[Path]
+    outputs: list[Path]
+    # Subprocess argv, or an in-process callable returning nothing.
+    command: list[str] | None = None
+    action: Callable[[], None] | None = None
+    params: dict[str, Any] = field(default_factory=dict)
+    code: list[Path] = field(default_factory=list)
+    # Starts remote (non-idempotent, billed) jobs: reruns only with --force after a success.
+    remote: bool = False
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--spec", required=True, help="Path to campaign spec JSON")
+    parser.add_argument("--workdir", default="pipeline_run", help="Stage outputs, logs and cache state")
+    parser.add_argument("--function-key", default="@istari:run_pyintact_simulation")
+    parser.add_argument("--executor", choices=EXECUTORS, default="istari")
+    parser.add_argument("--local-simulator", default=DEFAULT_LOCAL_SIMULATOR)
+    parser.add_argument("--workers", type=int, default=0, help="Local executor processes")
+    parser.add_argument("--poll-seconds", type=float, default=20)
+    parser.add_argument("--target-column", default="max_von_mises_stress", help="Output trained on (local)")
+    parser.add_argument(
+        "--training-config",
+        default="use-cases/many-pyintact-to-nemo/example-input/training_config.json",
+        help="Trainer config JSON (local) or launch_training --training-config (Istari)",
+    )
+    parser.add_argument("--dataset-job-id", default="", help="Istari dataset assembly job to train on")
+    parser.add_argument("--force", default="", help="Comma-delimited stages to rerun regardless of cache")
+    parser.add_argument("--max-parallel", type=int, default=4, help="Stages run at once")
+    return parser.parse_args()
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_parts(stage: Stage, dep_fingerprints: list[str]) -> dict[str, Any]:
+    # A refactor of a remote stage's code must not re-submit its jobs, so only local stages hash code.
+    files = stage.inputs if stage.remote else [*stage.inputs, *stage.code]
+    return {
+        "command": stage.command,
+        "params": stage.params,
+        "deps": dep_fingerprints,
+        "files": {str(p): sha256_file(p) if p.exists() else "<missing>" for p in files},
+    }
+
+
+def fingerprint(stage: Stage, parts: dict[str, Any]) -> str:
+    payload = {"name": stage.name, **parts}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def describe_changes(old: dict[str, Any], new: dict[str, Any]) -> list[str]:
+    if not old:
+        return ["fingerprint changed"]
+    changes = [f"{key} changed" for key in ("command", "params") if old.get(key) != new.get(key)]
+    if old.get("deps") != new.get("deps"):
+        changes.append("an upstream stage changed")
+    old_files, new_files = old.get("files", {}), new.get("files", {})
+    changes += [f"{path} changed" for path in sorted(set(old_files) | set(new_files)) if old_files.get(path) != new_files.get(path)]
+    return changes
+
+
+def assemble_dataset(manifest_path: Path, dataset_path: Path, summary_path: Path, target_column: str) -> None:
+    """Write succeeded rows' inputs (+ fidelity) and ``target_column`` output as a training CSV."""
+    rows = load_json(manifest_path)
+    usable = [
+        r for r in rows
+        if str(r.get("status", "")).lower() in TERMINAL_SUCCESS and target_column in (r.get("outputs") or {})
+    ]
+    keys = list(usable[0]["inputs"]) if usable else []
+    fidelity = ["fidelity"] if any("fidelity" in r for r in usable) else []
+    targets = [float(r["outputs"][target_column]) for r in usable]
+    with dataset_path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([*keys, *fidelity, target_column])
+        for row, target in zip(usable, targets):
+            writer.writerow([*(row["inputs"][k] for k in keys), *(row.get(c, "high") for c in fidelity), target])
+    dump_json(
+        summary_path,
+        {
+            "samples_ready": len(usable),
+            "schema_valid": bool(usable) and all(set(r["inputs"]) == set(keys) for r in usable),
+            "target_column": target_column,
+            "target_range": (max(targets) - min(targets)) if targets else 0.0,
+            "manifest_rows": len(rows),
+        },
+    )
+
+
+def write_checks(path: Path, results: list[CheckResult]) -> None:
+    dump_json(path, [asdict(r) for r in results])
+
+
+def surrogate_gate_metrics(metrics_path: Path, summary_path: Path) -> dict[str, float]:
+    """Map trainer metrics onto the keys ``check_surrogate_metrics`` reads."""
+    val = load_json(metrics_path)["val_metrics"]
+    target_range = float(load_json(summary_path).get("target_range") or 0.0) or 1.0
+    return {"val_normalized_mae": float(val["mae"]) / target_range, "val_r2": float(val["r2"])}
+
+
+def build_stages(args: argparse.Namespace, work: Path) -> list[Stage]:
+    spec_path = Path(args.spec).resolve()
+    config_path = Path(args.training_config).resolve()
+    manifest = work / "campaign_jobs.json"
+    updated = work / "campaign_jobs.updated.json"
+    dataset, summary = work / "dataset.csv", work / "dataset_summary.json"
+    local = args.executor == "local"
+    executor_args = ["--executor", args.executor]
+    if local:
+        executor_args += ["--job-dir", str(work / "jobs"), "--workers", str(args.workers)]
+        executor_args += ["--local-simulator", args.local_simulator]
+    py = sys.executable
+
+    stages = [
+        Stage(
+            "submit",
+            [],
+            [spec_path],
+            [manifest],
+            command=[py, "-m", "pyintact.submit_campaign", "--spec", str(spec_path), "--output", str(manifest),
+                     "--function-key", args.function_key, *executor_args],
+            code=[REPO_ROOT / "pyintact" / "submit_campaign.py", REPO_ROOT / "pyintact" / "campaign_utils.py"],
+            remote=not local,
+        ),
+        Stage(
+            "poll",
+            ["submit"],
+            [manifest],
+            [updated],
+            command=[py, "-m", "pyintact.poll_campaign", "--manifest", str(manifest), "--output", str(updated),
+                     "--poll-seconds", str(args.poll_seconds), *executor_args],
+            code=[REPO_ROOT / "pyintact" / "poll_campaign.py"],
+        ),
+    ]
+    if local:
+        trainer_input = work / "train_input.json"
+        train_dir = work / "train"
+        stages += [
+            Stage(
+                "assemble",
+                ["poll"],
+                [updated],
+                [dataset, summary],
+                action=lambda: assemble_dataset(updated, dataset, summary, args.target_column),
+                params={"target_column": args.target_column},
+                code=[Path(__file__).resolve()],
+            ),
+            Stage(
+                "train",
+                ["assemble"],
+                [dataset, config_path],
+                [train_dir / "metrics.json"],
+                action=lambda: run_local_training(dataset, config_path, args.target_column, trainer_input, train_dir),
+                params={"target_column": args.target_column},
+                code=[TRAINER],
+            ),
+            Stage(
+                "model_checks",
+                ["train", "assemble"],
+                [train_dir / "metrics.json", summary],
+                [work / "model_checks.json"],
+                action=lambda: write_checks(
+                    work / "model_checks.json",
+                    check_surrogate_metrics(surrogate_gate_metrics(train_dir / "metrics.json", summary)),
+                ),
+                code=[CHECKS_DIR / "campaign_checks.py"],
+            ),
+        ]
+    else:
+        # Istari assembles the dataset in its own job; training needs that job's id.
+        if args.dataset_job_id:
+            spec = load_json(spec_path)
+            stages.append(
+                Stage(
+                    "train",
+                    ["poll"],
+                    [config_path],
+                    [work / "logs" / "train.log"],
+                    command=[py, str(REPO_ROOT / "nemo" / "launch_training.py"),
+                             "--campaign-root-model-id", str(spec["campaign_root_model_id"]),
+                             "--dataset-job-id", args.dataset_job_id, "--training-config", str(config_path)],
+                    code=[REPO_ROOT / "nemo" / "launch_training.py"],
+                    remote=True,
+                )
+            )
+        else:
+            print("No --dataset-job-id: the Istari pipeline stops before training.")
+    stages.append(
+        Stage(
+            "data_checks",
+            ["poll", *(["assemble"] if local else [])],
+            [updated, *([summary] if local else [])],
+            [work / "data_checks.json"],
+            action=lambda: write_checks(
+                work / "data_checks.json",
+                [
+                    *check_campaign_throughput(load_json(updated)),
+                    *(check_dataset_readiness(load_json(summary)) if local else []),
+                ],
+            ),
+            code=[CHECKS_DIR / "campaign_checks.py"],
+        )
+    )
+    return stages
+
+
+def run_local_training(dataset: Path, config_path: Path, target_column: str, input_path: Path, out_dir: Path) -> None:
+    config = load_json(config_path) if config_path.exists() else {}
+    config["target_column"] = target_column
+    dump_json(
+        input_path,
+        {
+            "campaign_root_model": {"type": "user_model", "value": str(dataset)},
+            "dataset_job_id": {"type": "parameter", "value": "pipeline"},
+            "training_config": {"type": "parameter", "value": json.dumps(config)},
+        },
+    )
+    out_dir.mkdir(parents=True, exist_ok=True)
+    run_command("train", [sys.executable, str(TRAINER), str(input_path), str(out_dir / "output.json"), str(out_dir)],
+                input_path.parent / "logs")
+
+
+def run_command(name: str, command: list[str], log_dir: Path) -> None:
+    log_dir.mkdir(parents=True, exist_ok=True)
+    with (log_dir / f"{name}.log").open("w", encoding="utf-8") as log:
+        completed = subprocess.run(command, cwd=REPO_ROOT, stdout=log, stderr=subprocess.STDOUT)
+    if completed.returncode != 0:
+        raise RuntimeError(f"exit code {completed.returncode}; see {log_dir / f'{name}.log'}")
+
+
+def run_pipeline(stages: list[Stage], work: Path, force: set[str], max_parallel: int) -> list[dict[str, Any]]:
+    state_path = work / ".pipeline" / "state.json"
+    state: dict[str, Any] = load_json(state_path) if state_path.exists() else {}
+    state_lock = threading.Lock()
+    by_name = {s.name: s for s in stages}
+    fingerprints: dict[str, str] = {}
+    parts: dict[str, dict[str, Any]] = {}
+    report: dict[str, dict[str, Any]] = {}
+
+    def execute(stage: Stage) -> dict[str, Any]:
+        started = time.perf_counter()
+        if stage.command is not None:
+            run_command(stage.name, stage.command, work / "logs")
+        else:
+            stage.action()
+        seconds = time.perf_counter() - started
+        with state_lock:
+            state[stage.name] = {
+                "fingerprint": fingerprints[stage.name],
+                "parts": parts[stage.name],
+                "outputs": {str(p): sha256_file(p) for p in stage.outputs},
+                "seconds": seconds,
+                "finished_at": time.time(),
+            }
+            dump_json(state_path, state)
+        return {"status": "ran", "seconds": seconds}
+
+    def cached(stage: Stage) -> bool:
+        entry = state.get(stage.name)
+        if stage.name in force or not entry or entry["fingerprint"] != fingerprints[stage.name]:
+            return False
+        return all(p.exists() and sha256_file(p) == entry["outputs"].get(str(p)) for p in stage.outputs)
+
+    def hold_reason(stage: Stage) -> str:
+        """Why a remote stage that already succeeded is not rerun without --force ('' to run it)."""
+        entry = state.get(stage.name)
+        if not stage.remote or stage.name in force or not entry:
+            return ""
+        changes = describe_changes(entry.get("parts", {}), parts[stage.name])
+        changes += [
+            f"output {p} changed or is missing"
+            for p in stage.outputs
+            if not p.exists() or sha256_file(p) != entry["outputs"].get(str(p))
+        ]
+        return "; ".join(changes) or "outputs changed"
+
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    wall_started = time.perf_counter()
+    remaining = list(stages)
+    running: dict[Future, Stage] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as pool:
+        while remaining or running:
+            for stage in list(remaining):
+                dep_status = [report.get(d, {}).get("status") for d in stage.deps if d in by_name]
+                if any(s in ("failed", "blocked", "held") for s in dep_status):
+                    report[stage.name] = {"status": "blocked", "seconds": 0.0}
+                    remaining.remove(stage)
+                    continue
+                if any(s is None for s in dep_status) or len(running) >= max(1, max_parallel):
+                    continue
+                remaining.remove(stage)
+                # Inputs are final once the dependencies are done, so fingerprint now.
+                parts[stage.name] = fingerprint_parts(stage, [fingerprints[d] for d in stage.deps if d in by_name])
+                fingerprints[stage.name] = fingerprint(stage, parts[stage.name])
+                if cached(stage):
+                    report[stage.name] = {"status": "cached", "seconds": 0.0, "last_seconds": state[stage.name]["seconds"]}
+                    print(f"[pipeline] {stage.name}: unchanged, skipped")
+                    continue
+                reason = hold_reason(stage)
+                if reason:
+                    report[stage.name] = {"status": "held", "seconds": 0.0, "error": reason}
+                    print(
+                        f"[pipeline] {stage.name}: HELD, it starts remote jobs and already ran ({reason}); "
+                        f"rerun with --force {stage.name}"
+                    )
+                    continue
+                print(f"[pipeline] {stage.name}: running")
+                running[pool.submit(execute, stage)] = stage
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    report[stage.name] = future.result()
+                    print(f"[pipeline] {stage.name}: done in {report[stage.name]['seconds']:.1f}s")
+                except Exception as exc:
+                    report[stage.name] = {"status": "failed", "seconds": 0.0, "error": f"{type(exc).__name__}: {exc}"}
+                    print(f"[pipeline] {stage.name}: FAILED {report[stage.name]['error']}")
+    summary = [{"stage": s.name, **report[s.name]} for s in stages]
+    summary.append({"stage": "total", "status": "wall", "seconds": time.perf_counter() - wall_started})
+    return summary
+
+
+def format_summary(summary: list[dict[str, Any]]) -> str:
+    lines = [f"{'stage':<14} {'status':<8} {'seconds':>9}"]
+    for row in summary:
+        note = f"  (last run {row['last_seconds']:.1f}s)" if "last_seconds" in row else ""
+        lines.append(f"{row['stage']:<14} {row['status']:<8} {row['seconds']:>9.2f}{note}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    args = parse_args()
+    work = Path(args.workdir).resolve()
+    work.mkdir(parents=True, exist_ok=True)
+    stages = build_stages(args, work)
+    force = {s.strip() for s in args.force.split(",") if s.strip()}
+    unknown = force - {s.name for s in stages}
+    if unknown:
+        raise ValueError(f"unknown --force stages: {sorted(unknown)}")
+
+    summary = run_pipeline(stages, work, force, args.max_parallel)
+    print()
+    print(format_summary(summary))
+    dump_json(work / "pipeline_summary.json", summary)
+
+    failed_gates = 0
+    for name in ("data_checks", "model_checks"):
+        path = work / f"{name}.json"
+        if any(s.name == name for s in stages) and path.exists():
+            results = load_json(path)
+            print(f"\n{name}:")
+            print(format_report([CheckResult(**r) for r in results]))
+            failed_gates += sum(1 for r in results if r["status"] != PASS)
+    stage_failed = any(row["status"] in ("failed", "blocked", "held") for row in summary)
+    return 1 if stage_failed or failed_gates else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,26 +1,43 @@
-"""Poll Istari job status for a submitted campaign."""
+"""Poll Istari job status for a submitted campaign.
+
+Each pass prints an ETA with a 90% interval from the recent completion rate
+(see ``pyintact.forecast``) and warns on throughput drops. The forecast
+history is kept in a stats file next to the output manifest
+(``<output>.stats.json``) for post-mortems. The stats file records a digest of
+the campaign's job ids; a restarted poll continues its history only when the
+digest matches, so a file left by another campaign at that path is replaced.
+"""
 
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
+import math
 import time
 from collections import Counter
 from pathlib import Path
 
-from istari_client import get_client
 from pyintact.campaign_utils import (
     TERMINAL_STATES,
+    TERMINAL_SUCCESS,
     dump_json,
     load_json,
-    normalize_status,
 )
+from pyintact.executors import add_executor_args, make_executor, report_client_stats
+from pyintact.forecast import describe, forecast
+from pyintact.telemetry import add_telemetry_args, make_telemetry, write_trace
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--manifest", default="campaign_jobs.json")
     parser.add_argument("--output", default="campaign_jobs.updated.json")
-    parser.add_argument("--poll-seconds", type=int, default=20)
+    parser.add_argument("--poll-seconds", type=float, default=20)
+    parser.add_argument("--stats-output", default="", help="Forecast stats JSON (default: <output>.stats.json)")
+    parser.add_argument("--eta-window-seconds", type=float, default=900.0, help="Window for the completion rate")
+    add_executor_args(parser)
+    add_telemetry_args(parser)
     return parser.parse_args()
 
 
@@ -29,35 +46,131 @@ def summarize(rows: list[dict]) -> str:
     return ", ".join([f"{k}={v}" for k, v in sorted(counts.items())])
 
 
-def main() -> None:
-    args = parse_args()
-    rows = load_json(args.manifest)
+def stats_path(output: str) -> Path:
+    return Path(output).with_suffix(".stats.json")
+
+
+def job_ids_digest(rows: list[dict]) -> str:
+    """SHA-256 over the sorted job ids, identifying which campaign a stats file belongs to."""
+    return hashlib.sha256("\n".join(sorted(str(r["job_id"]) for r in rows)).encode("utf-8")).hexdigest()
+
+
+def load_history(path: Path, digest: str) -> list[dict]:
+    """Forecast history of an interrupted poll of the same jobs, else an empty list."""
+    if not path.exists():
+        return []
+    try:
+        saved = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        saved = {}
+    if saved.get("job_ids_sha256") != digest:
+        print(f"Ignoring {path}: it holds stats for different jobs; starting a new history")
+        return []
+    return saved.get("history", [])
+
+
+def write_stats(path: Path, history: list[dict], digest: str) -> None:
+    # Strict JSON has no Infinity; an unbounded ETA is stored as null.
+    def finite(value):
+        return None if isinstance(value, float) and math.isinf(value) else value
+
+    latest = {k: finite(v) for k, v in history[-1].items()}
+    compact = [
+        {k: finite(h[k]) for k in ("at", "done", "running", "waiting", "rate_per_second", "eta_seconds",
+                                   "eta_low_seconds", "eta_high_seconds", "warnings")}
+        for h in history
+    ]
+    dump_json(path, {"job_ids_sha256": digest, "latest": latest, "history": compact})
+
+
+def poll_until_done(
+    executor,
+    rows: list[dict],
+    output: str,
+    poll_seconds: float,
+    telemetry=None,
+    metrics_file: str = "",
+    stats_file: str = "",
+    eta_window_seconds: float = 900.0,
+) -> list[dict]:
+    """Poll submitted rows in place until all reach terminal states, rewriting ``output`` each pass.
+
+    Succeeded rows gain the executor's scalar ``outputs`` when it has any, and
+    every row's ``timestamps`` gains the epoch time each status was first seen.
+    With ``stats_file``, forecast history is appended there each pass,
+    continuing the history of an interrupted poll of the same jobs.
+    """
     pending = [r for r in rows if r.get("job_id")]
-
-    if not pending:
-        print("No submitted jobs found in manifest.")
-        return
-
-    client = get_client()
-
+    digest = job_ids_digest(pending)
+    history = load_history(Path(stats_file), digest) if stats_file else []
     while True:
         done = 0
+        pass_started = time.perf_counter()
         for row in pending:
             if row.get("status") in TERMINAL_STATES:
                 done += 1
                 continue
 
-            job = client.get_job(row["job_id"])
-            row["status"] = normalize_status(job)
+            row["status"] = executor.status(row["job_id"])
+            stamps = row.setdefault("timestamps", {})
+            if row["status"] not in stamps:
+                now = time.time()
+                if telemetry is not None:
+                    telemetry.job_transition(row, row["status"], now)
+                stamps[row["status"]] = now
             if row["status"] in TERMINAL_STATES:
                 done += 1
-
-        print(f"Progress {done}/{len(pending)} | {summarize(rows)}")
-        dump_json(args.output, rows)
+                outputs = executor.fetch_outputs(row["job_id"]) if row["status"] in TERMINAL_SUCCESS else {}
+                if outputs:
+                    row["outputs"] = outputs
+
+        pass_seconds = time.perf_counter() - pass_started
+        stats = forecast(rows, time.time(), eta_window_seconds)
+        print(f"Progress {done}/{len(pending)} | {summarize(rows)} | {describe(stats)}")
+        for warning in stats["warnings"]:
+            print(f"  WARNING {warning}")
+        dump_json(output, rows)
+        if stats_file:
+            history.append(stats)
+            write_stats(Path(stats_file), history, digest)
+        if telemetry is not None:
+            telemetry.observe("campaign_poll_pass_seconds", pass_seconds)
+            if metrics_file:
+                telemetry.write(metrics_file)
 
         if done == len(pending):
-            break
-        time.sleep(args.poll_seconds)
+            return rows
+        time.sleep(poll_seconds)
+
+
+def main() -> None:
+    args = parse_args()
+    rows = load_json(args.manifest)
+    pending = [r for r in rows if r.get("job_id")]
+
+    if not pending:
+        print("No submitted jobs found in manifest.")
+        return
+
+    executor = make_executor(args)
+    telemetry = make_telemetry(args, executor)
+    try:
+        poll_until_done(
+            executor,
+            rows,
+            args.output,
+            args.poll_seconds,
+            telemetry,
+            args.metrics_file,
+            args.stats_output or str(stats_path(args.output)),
+            args.eta_window_seconds,
+        )
+    finally:
+        executor.close()
+        if args.trace_file:
+            write_trace(args.trace_file, rows)
+            print(f"Wrote job trace: {Path(args.trace_file).resolve()}")
+    report_client_stats(executor, args.client_stats)
 
     print(f"Final manifest written to: {Path(args.output).resolve()}")
 
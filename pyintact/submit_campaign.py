@@ -1,13 +1,24 @@
-"""Submit many PyIntact simulations to Istari from a campaign spec."""
+"""Submit many PyIntact simulations to Istari from a campaign spec.
+
+Every submission is appended to ``<output>.journal.jsonl`` (fsynced) as soon as
+the executor returns its job id, and the manifest is written even when a
+submit raises. Rerunning the same command after a failure or a crash resumes
+from the journal: cases it records are not submitted again. The journal is
+removed once the full manifest is written.
+"""
 
 from __future__ import annotations
 
 import argparse
+import json
+import os
+import sys
 import time
 from pathlib import Path
 
-from istari_client import get_client
 from pyintact.campaign_utils import dump_json, generate_cases, load_json, make_job_parameters
+from pyintact.executors import add_executor_args, make_executor, report_client_stats
+from pyintact.telemetry import add_telemetry_args, make_telemetry
 
 
 def parse_args() -> argparse.Namespace:
@@ -17,6 +28,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--output", default="campaign_jobs.json")
     parser.add_argument("--throttle-seconds", type=float, default=0.05)
     parser.add_argument("--dry-run", action="store_true")
+    add_executor_args(parser)
+    add_telemetry_args(parser)
     return parser.parse_args()
 
 
@@ -27,16 +40,90 @@ def require_field(spec: dict, key: str) -> str:
     return value
 
 
+def journal_path(output: str | Path) -> Path:
+    return Path(output).with_suffix(".journal.jsonl")
+
+
+def append_journal(path: Path, row: dict) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(row) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_journal(path: Path) -> list[dict]:
+    rows: list[dict] = []
+    if not path.exists():
+        return rows
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            rows.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue  # a line torn by a crash; its submit had not been recorded
+    return rows
+
+
+def submit_cases(
+    executor,
+    spec: dict,
+    cases: list[dict],
+    function_key: str,
+    throttle_seconds: float,
+    telemetry=None,
+    manifest: list[dict] | None = None,
+    journal: Path | None = None,
+) -> list[dict]:
+    """Submit ``cases`` and return manifest rows; ``timestamps.submitted`` is epoch seconds.
+
+    Rows are appended to ``manifest`` (and to ``journal``) as each job is
+    submitted, so a caller that passes its own list keeps them if a later
+    submit raises.
+    """
+    require_field(spec, "campaign_root_model_id")
+    manifest = [] if manifest is None else manifest
+    for idx, case in enumerate(cases, start=1):
+        started = time.perf_counter()
+        try:
+            job_id = executor.submit(spec, case, function_key)
+        except Exception:
+            if telemetry is not None:
+                telemetry.inc("campaign_submit_errors")
+            raise
+        if telemetry is not None:
+            telemetry.observe("campaign_submit_seconds", time.perf_counter() - started)
+            telemetry.inc("campaign_jobs_submitted")
+        row = {
+            "case_id": case["case_id"],
+            "job_id": job_id,
+            "status": "submitted",
+            "inputs": case["inputs"],
+            "timestamps": {"submitted": time.time()},
+        }
+        if "fidelity" in case:
+            row["fidelity"] = case["fidelity"]
+        manifest.append(row)
+        if journal is not None:
+            append_journal(journal, row)
+
+        if idx % 25 == 0 or idx == len(cases):
+            print(f"Submitted {idx}/{len(cases)}")
+        time.sleep(throttle_seconds)
+    return manifest
+
+
 def main() -> None:
     args = parse_args()
     spec = load_json(args.spec)
 
-    campaign_root_model_id = require_field(spec, "campaign_root_model_id")
+    require_field(spec, "campaign_root_model_id")
     cases = generate_cases(spec)
 
     print(f"Campaign: {spec.get('campaign_name', '<unnamed>')}")
     print(f"Function: {args.function_key}")
     print(f"Cases: {len(cases)}")
+    if any("fidelity" in case for case in cases):
+        high = sum(1 for case in cases if case.get("fidelity") == "high")
+        print(f"Fidelity: {len(cases) - high} low, {high} high")
 
     manifest: list[dict] = []
 
@@ -55,22 +142,43 @@ def main() -> None:
         print(f"Wrote dry-run payload preview to: {Path(args.output).resolve()}")
         return
 
-    client = get_client()
-    for idx, case in enumerate(cases, start=1):
-        params = make_job_parameters(spec, case)
-        job = client.add_job(
-            model_id=campaign_root_model_id,
-            function=args.function_key,
-            parameters=params,
+    journal = journal_path(args.output)
+    manifest = read_journal(journal)
+    if manifest:
+        expected = {case["case_id"]: case["inputs"] for case in cases}
+        if any(expected.get(row["case_id"]) != row["inputs"] for row in manifest):
+            raise SystemExit(
+                f"{journal} records submissions that do not match this spec's cases. "
+                "Move it aside (its jobs exist) before submitting this spec."
+            )
+        done = {row["case_id"] for row in manifest}
+        cases = [case for case in cases if case["case_id"] not in done]
+        print(f"Resuming from {journal}: {len(done)} already submitted, {len(cases)} to go")
+
+    print(f"Executor: {args.executor}")
+    executor = make_executor(args)
+    # Throttling protects the Istari control plane; local jobs need none.
+    throttle_seconds = args.throttle_seconds if args.executor == "istari" else 0.0
+    telemetry = make_telemetry(args, executor)
+    try:
+        submit_cases(
+            executor, spec, cases, args.function_key, throttle_seconds, telemetry, manifest=manifest, journal=journal
         )
-        job_id = str(getattr(job, "id", ""))
-        manifest.append({"case_id": case["case_id"], "job_id": job_id, "status": "submitted"})
-
-        if idx % 25 == 0 or idx == len(cases):
-            print(f"Submitted {idx}/{len(cases)}")
-        time.sleep(args.throttle_seconds)
+    except Exception:
+        print(
+            f"Submission stopped after {len(manifest)} job(s); rerun the same command to submit the rest.",
+            file=sys.stderr,
+        )
+        raise
+    finally:
+        executor.close()
+        # Also written on failure: these jobs exist and must be polled, not submitted again.
+        dump_json(args.output, manifest)
+        if telemetry is not None and args.metrics_file:
+            telemetry.write(args.metrics_file)
+    journal.unlink(missing_ok=True)
+    report_client_stats(executor, args.client_stats)
 
-    dump_json(args.output, manifest)
     print(f"Wrote manifest: {Path(args.output).resolve()}")
 
 
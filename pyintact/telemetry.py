@@ -0,0 +1,240 @@
+"""Campaign control-plane telemetry: counters and histograms in OpenMetrics text.
+
+``submit_cases`` and ``poll_until_done`` record into a ``Telemetry`` when given
+one:
+
+    campaign_submit_seconds           executor.submit latency per case
+    campaign_submit_errors_total      submissions that raised
+    campaign_jobs_submitted_total
+    campaign_job_queue_seconds        submit -> first poll that saw the job running
+    campaign_job_run_seconds          first seen running -> first seen terminal
+    campaign_job_turnaround_seconds   submit -> first seen terminal
+    campaign_jobs_finished_total      by terminal status
+    campaign_poll_pass_seconds        one status sweep over the pending jobs
+
+Job durations come from the manifest's ``timestamps`` (epoch seconds of the
+first poll that saw each status), so they are only as fine as
+``--poll-seconds``, and a job that finishes between two polls has no run time.
+The executor's per-endpoint API stats (calls, retries, errors, latency) are
+appended as ``istari_api_*`` families.
+
+``--metrics-file`` is rewritten after every poll pass, ``--trace-file`` writes
+one Chrome trace-event row per job (queued / running spans; open it in
+Perfetto), and ``--metrics-port`` serves the current metrics at ``/metrics``
+for a Prometheus scrape while the script runs.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+from pyintact.campaign_utils import TERMINAL_STATES, WAITING_STATES
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+API_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+JOB_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0, 7200.0, 21600.0, math.inf)
+# name -> (type, help, buckets)
+METRICS: dict[str, tuple[str, str, tuple[float, ...]]] = {
+    "campaign_submit_seconds": ("histogram", "Latency of one case submission", API_BUCKETS),
+    "campaign_submit_errors": ("counter", "Case submissions that raised", ()),
+    "campaign_jobs_submitted": ("counter", "Cases submitted", ()),
+    "campaign_job_queue_seconds": ("histogram", "Submit to first seen running", JOB_BUCKETS),
+    "campaign_job_run_seconds": ("histogram", "First seen running to first seen terminal", JOB_BUCKETS),
+    "campaign_job_turnaround_seconds": ("histogram", "Submit to first seen terminal", JOB_BUCKETS),
+    "campaign_jobs_finished": ("counter", "Jobs that reached a terminal status", ()),
+    "campaign_poll_pass_seconds": ("histogram", "Duration of one status sweep", API_BUCKETS),
+}
+
+
+def running_since(stamps: dict[str, float]) -> float | None:
+    """First time the job was seen in a working (non-waiting, non-terminal) status."""
+    working = [t for status, t in stamps.items() if status not in WAITING_STATES and status not in TERMINAL_STATES]
+    return min(working, default=None)
+
+
+def finished_at(stamps: dict[str, float]) -> float | None:
+    return min((t for status, t in stamps.items() if status in TERMINAL_STATES), default=None)
+
+
+def _labels(labels: dict[str, str] | None, **extra: str) -> str:
+    merged = {**(labels or {}), **extra}
+    if not merged:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in sorted(merged.items())) + "}"
+
+
+def _bound(value: float) -> str:
+    return "+Inf" if math.isinf(value) else repr(float(value))
+
+
+class Telemetry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, tuple], float] = {}
+        # (name, labels) -> [bucket counts..., sum, count]
+        self._histograms: dict[tuple[str, tuple], list[float]] = {}
+        self._extra: list[Callable[[], dict[str, Any]]] = []
+
+    def inc(self, name: str, labels: dict[str, str] | None = None, value: float = 1.0) -> None:
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: dict[str, str] | None = None) -> None:
+        buckets = METRICS[name][2]
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            state = self._histograms.setdefault(key, [0.0] * (len(buckets) + 2))
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    def add_api_stats(self, source: Callable[[], dict[str, Any]]) -> None:
+        """Include ``source()`` (per-endpoint stats as from ``executor.stats()``) in every render."""
+        self._extra.append(source)
+
+    def job_transition(self, row: dict[str, Any], status: str, now: float) -> None:
+        """Record what ends at the first observation of ``status``; call before stamping it."""
+        stamps = row.get("timestamps") or {}
+        submitted, running = stamps.get("submitted"), running_since(stamps)
+        if status in TERMINAL_STATES:
+            self.inc("campaign_jobs_finished", {"status": status})
+            if submitted is not None:
+                self.observe("campaign_job_turnaround_seconds", now - submitted)
+            if running is not None:
+                self.observe("campaign_job_run_seconds", now - running)
+        elif status not in WAITING_STATES and running is None and submitted is not None:
+            self.observe("campaign_job_queue_seconds", now - submitted)
+
+    def render(self) -> str:
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+        lines: list[str] = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            series = counters if kind == "counter" else histograms
+            keys = sorted(k for k in series if k[0] == name)
+            if not keys:
+                continue
+            lines += [f"# TYPE {name} {kind}", f"# HELP {name} {help_text}"]
+            for key in keys:
+                labels = dict(key[1])
+                if kind == "counter":
+                    lines.append(f"{name}_total{_labels(labels)} {series[key]:g}")
+                    continue
+                state, cumulative = series[key], 0.0
+                for bound, count in zip(buckets, state):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels, le=_bound(bound))} {cumulative:g}")
+                lines += [f"{name}_sum{_labels(labels)} {state[-2]:.6f}", f"{name}_count{_labels(labels)} {state[-1]:g}"]
+        for source in self._extra:
+            lines += render_api_stats(source())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str | Path) -> None:
+        path = Path(path)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        telemetry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def render_api_stats(stats: dict[str, Any]) -> list[str]:
+    if not stats:
+        return []
+    lines = ["# TYPE istari_api_calls counter", "# HELP istari_api_calls API call attempts"]
+    lines += [f'istari_api_calls_total{{endpoint="{name}"}} {s["calls"]}' for name, s in stats.items()]
+    lines += ["# TYPE istari_api_retries counter", "# HELP istari_api_retries Attempts that were retried"]
+    lines += [f'istari_api_retries_total{{endpoint="{name}"}} {s["retries"]}' for name, s in stats.items()]
+    lines += ["# TYPE istari_api_errors counter", "# HELP istari_api_errors Failed attempts by status"]
+    for name, s in stats.items():
+        lines += [f'istari_api_errors_total{{endpoint="{name}",status="{k}"}} {v}' for k, v in sorted(s["errors"].items())]
+    lines += ["# TYPE istari_api_request_seconds histogram", "# HELP istari_api_request_seconds Per-attempt latency"]
+    for name, s in stats.items():
+        latency = s["latency_seconds"]
+        # The client reports cumulative counts already.
+        lines += [f'istari_api_request_seconds_bucket{{endpoint="{name}",le="{b}"}} {c}' for b, c in latency["buckets"].items()]
+        lines += [
+            f'istari_api_request_seconds_sum{{endpoint="{name}"}} {latency["sum"]:.6f}',
+            f'istari_api_request_seconds_count{{endpoint="{name}"}} {s["calls"]}',
+        ]
+    return lines
+
+
+def write_trace(path: str | Path, rows: list[dict[str, Any]]) -> None:
+    """One trace row per job with ``queued`` and ``running`` spans from the manifest timestamps."""
+    stamped = [r for r in rows if (r.get("timestamps") or {}).get("submitted") is not None]
+    origin = min((r["timestamps"]["submitted"] for r in stamped), default=0.0)
+    events: list[dict[str, Any]] = []
+    for tid, row in enumerate(stamped, start=1):
+        stamps = row["timestamps"]
+        end = finished_at(stamps)
+        running = running_since(stamps)
+        spans = [("queued", stamps["submitted"], running if running is not None else end)]
+        if running is not None:
+            spans.append(("running", running, end))
+        for name, start, stop in spans:
+            if stop is None:
+                continue
+            events.append(
+                {
+                    "name": name,
+                    "cat": "job",
+                    "ph": "X",
+                    "ts": round((start - origin) * 1e6),
+                    "dur": round((stop - start) * 1e6),
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"case_id": row.get("case_id"), "job_id": row.get("job_id"), "status": row.get("status")},
+                }
+            )
+        events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": str(row.get("case_id"))}})
+    Path(path).write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+
+
+def add_telemetry_args(parser) -> None:
+    parser.add_argument("--metrics-file", default="", help="Write OpenMetrics text here (rewritten as the run goes)")
+    parser.add_argument("--trace-file", default="", help="Write per-job Chrome trace events here")
+    parser.add_argument("--metrics-port", type=int, default=0, help="Serve /metrics on this port while running")
+
+
+def make_telemetry(args, executor) -> Telemetry | None:
+    if not (args.metrics_file or args.trace_file or args.metrics_port):
+        return None
+    telemetry = Telemetry()
+    telemetry.add_api_stats(executor.stats)
+    if args.metrics_port:
+        server = telemetry.serve(args.metrics_port)
+        print(f"Serving metrics on http://{server.server_address[0]}:{server.server_address[1]}/metrics")
+    return telemetry
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Load-test submit_campaign / poll_campaign against the in-process fake Istari client.
+
+Each campaign size runs in a fresh process (so peak RSS is per size). The run
+submits every case through ``submit_cases``, then drives ``poll_until_done``
+until all fake jobs are terminal. Reported per size: submissions/s, polls/s
+(``get_job`` calls per second of polling, sleeps between passes included),
+poll passes, wall time, peak RSS, and the fake API errors seen. The fake client
+is wrapped in ``istari_client.InstrumentedClient`` like the shared production
+client, so 429/503s are retried with backoff (``--max-retries 0`` disables
+that). An API error that escapes the scripts is reported as ``crashed`` rather
+than stopping the benchmark.
+
+Usage:
+    python scripts/benchmark_control_plane.py --sizes 1000,10000,100000
+    python scripts/benchmark_control_plane.py --sizes 2000 --latency-ms 5 --latency-dist lognormal \\
+        --error-rate 0.001 --rate-limit 500 --output control_plane_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from fake_istari_client import FakeClientConfig, FakeIstariClient
+from istari_client import ClientOptions, InstrumentedClient
+from pyintact.campaign_utils import generate_cases
+from pyintact.executors import IstariExecutor
+from pyintact.poll_campaign import poll_until_done
+from pyintact.submit_campaign import submit_cases
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-delimited campaign sizes")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean per-call latency")
+    parser.add_argument("--latency-dist", choices=("fixed", "lognormal", "exponential"), default="fixed")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 503 per call")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Calls/s before 429s (0 = unlimited)")
+    parser.add_argument("--job-seconds", type=float, default=120.0, help="Mean simulated job run time")
+    parser.add_argument("--time-scale", type=float, default=600.0, help="Simulated seconds per wall second")
+    parser.add_argument("--poll-seconds", type=float, default=0.25)
+    parser.add_argument("--throttle-seconds", type=float, default=0.0)
+    parser.add_argument("--max-retries", type=int, default=ClientOptions.max_retries, help="Per-call retries (0 = none)")
+    parser.add_argument("--backoff-seconds", type=float, default=0.05, help="First retry backoff ceiling")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="", help="Optional JSON results path")
+    return parser.parse_args()
+
+
+def benchmark_spec(size: int) -> dict:
+    return {
+        "campaign_name": f"control_plane_bench_{size}",
+        "campaign_root_model_id": "fake-root-model",
+        "geometry": {
+            "body_model_id": "fake-body",
+            "load_face_model_id": "fake-load",
+            "restraint_face_model_id": "fake-restraint",
+        },
+        "grid": {
+            "pressure_pa": [2e5 + i for i in range(size)],
+            "youngs_modulus": [2.1e11],
+            "poisson_ratio": [0.3],
+        },
+    }
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+def run_size(
+    size: int, config: FakeClientConfig, options: ClientOptions, poll_seconds: float, throttle_seconds: float
+) -> dict:
+    client = FakeIstariClient(config)
+    instrumented = InstrumentedClient(client, options, seed=config.seed)
+    executor = IstariExecutor(instrumented)
+    spec = benchmark_spec(size)
+    result: dict = {"size": size, "crashed": None}
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        try:
+            cases = generate_cases(spec)
+            submit_started = time.perf_counter()
+            rows = submit_cases(executor, spec, cases, "@istari:run_pyintact_simulation", throttle_seconds)
+            result["submit_seconds"] = time.perf_counter() - submit_started
+
+            poll_started = time.perf_counter()
+            poll_until_done(executor, rows, str(Path(tmp) / "manifest.json"), poll_seconds)
+            result["poll_seconds"] = time.perf_counter() - poll_started
+        except Exception as exc:  # report how far the unmodified scripts get
+            result["crashed"] = f"{type(exc).__name__}: {exc} (after {client.calls['add_job']} submissions)"
+
+    submit_seconds = result.get("submit_seconds")
+    poll_seconds_taken = result.get("poll_seconds")
+    result.update(
+        wall_seconds=time.perf_counter() - started,
+        submissions_per_second=size / submit_seconds if submit_seconds else None,
+        polls_per_second=client.calls["get_job"] / poll_seconds_taken if poll_seconds_taken else None,
+        get_job_calls=client.calls["get_job"],
+        poll_passes=round(client.calls["get_job"] / size, 2) if size else 0,
+        api_errors=dict(client.errors),
+        retries=sum(s["retries"] for s in instrumented.stats().values()),
+        client_stats=instrumented.stats(),
+        peak_rss_mb=peak_rss_mb(),
+    )
+    return result
+
+
+def format_row(r: dict) -> str:
+    def num(value, fmt):
+        return format(value, fmt) if value is not None else "-"
+
+    status = "ok" if r["crashed"] is None else "CRASHED"
+    return (
+        f"{r['size']:>8} {num(r['submissions_per_second'], ',.0f'):>12} {num(r['polls_per_second'], ',.0f'):>12} "
+        f"{num(r['poll_passes'], '.1f'):>7} {r['retries']:>8} {r['wall_seconds']:>9.2f} {r['peak_rss_mb']:>9.1f}  {status}"
+    )
+
+
+def main() -> int:
+    args = parse_args()
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    config = FakeClientConfig(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        error_rate=args.error_rate,
+        rate_limit_per_second=args.rate_limit,
+        job_queue_seconds=args.job_seconds / 4.0,
+        job_run_seconds=args.job_seconds,
+        time_scale=args.time_scale,
+        seed=args.seed,
+    )
+
+    options = ClientOptions(max_retries=args.max_retries, backoff_seconds=args.backoff_seconds)
+
+    print(
+        f"{'jobs':>8} {'submit/s':>12} {'polls/s':>12} {'passes':>7} {'retries':>8} {'wall s':>9} {'peak MB':>9}  status"
+    )
+    results = []
+    context = multiprocessing.get_context("spawn")
+    for size in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            row = pool.submit(run_size, size, config, options, args.poll_seconds, args.throttle_seconds).result()
+        results.append(row)
+        print(format_row(row))
+        if row["crashed"]:
+            print(f"         {row['crashed']}")
+
+    if args.output:
+        payload = {
+            "fake_client_config": asdict(config),
+            "client_options": asdict(options),
+            "poll_seconds": args.poll_seconds,
+            "results": results,
+        }
+        Path(args.output).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Wrote: {Path(args.output).resolve()}")
+    return 0 if all(r["crashed"] is None for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
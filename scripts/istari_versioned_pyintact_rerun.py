@@ -2,11 +2,27 @@ from __future__ import annotations
 
 import json
 import os
+import sys
 import time
 from datetime import datetime
 from pathlib import Path
 
-from istari_digital_client import Client, Configuration
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from istari_client import (
+    ClientOptions,
+    InstrumentedClient,
+    IstariSettings,
+    ModelUpload,
+    build_client,
+    cached_listing,
+    metadata_scope,
+    paginate,
+    upload_models,
+)
+from istari_digital_client import Client
 from istari_digital_client.v2.models.new_snapshot import NewSnapshot
 from istari_digital_client.v2.models.new_snapshot_tag import NewSnapshotTag
 from istari_digital_client.v2.models.new_source import NewSource
@@ -16,17 +32,6 @@ from istari_digital_client.v2.models.new_tracked_file import NewTrackedFile
 from istari_digital_client.v2.models.tracked_file_specifier_type import TrackedFileSpecifierType
 
 
-def page_items(page_like):
-    if page_like is None:
-        return []
-    if isinstance(page_like, list):
-        return page_like
-    items = getattr(page_like, "items", None)
-    if items is not None:
-        return list(items)
-    return []
-
-
 def job_status(job) -> str:
     status = getattr(job, "status", None)
     if status is not None:
@@ -39,20 +44,13 @@ def job_status(job) -> str:
     return "unknown"
 
 
-def latest_revision_id(model) -> str:
-    revisions = getattr(getattr(model, "file", None), "revisions", [])
-    if not revisions:
-        raise RuntimeError(f"No revisions found for model: {getattr(model, 'id', '<unknown>')}")
-    return revisions[0].id
-
-
 def snapshot_id(create_snapshot_response):
     actual = getattr(create_snapshot_response, "actual_instance", None)
     return getattr(actual, "id", None)
 
 
 def latest_snapshot_id(client: Client, configuration_id: str) -> str | None:
-    snapshots = page_items(client.list_snapshots(configuration_id=configuration_id, size=100))
+    snapshots = list(paginate(client.list_snapshots, page_size=100, configuration_id=configuration_id))
     if not snapshots:
         return None
     snapshots.sort(key=lambda s: getattr(s, "created", None), reverse=True)
@@ -88,17 +86,23 @@ def main() -> int:
         if not path.exists():
             raise FileNotFoundError(str(path))
 
-    client = Client(Configuration(registry_url=registry_url, registry_auth_token=pat))
+    options = ClientOptions.from_env()
+    client = InstrumentedClient(build_client(IstariSettings(registry_url, pat), options), options)
     user = client.get_current_user()
     print(f"connected_user={getattr(user, 'email', '<unknown>')}")
 
+    # Function and agent listings come from the metadata cache; a miss refetches once.
+    scope = metadata_scope(registry_url, pat)
     function_name = "@istari:run_pyintact_simulation"
-    functions = page_items(client.list_functions(name=function_name, size=50))
-    names = [getattr(f, "name", None) for f in functions]
+    names = [getattr(f, "name", None) for f in cached_listing(client, "functions", scope=scope)]
+    if function_name not in names:
+        names = [getattr(f, "name", None) for f in cached_listing(client, "functions", refresh=True, scope=scope)]
     if function_name not in names:
         raise RuntimeError(f"run function missing. functions={names}")
 
-    agents = page_items(client.list_agents(size=100))
+    agents = cached_listing(client, "agents", scope=scope)
+    if not agents:
+        agents = cached_listing(client, "agents", refresh=True, scope=scope)
     if not agents:
         raise RuntimeError("No agents available in tenant.")
     preferred_agent = "Istari Slack Analytics Agent"
@@ -118,29 +122,40 @@ def main() -> int:
     state_path = Path("/tmp") / f"istari_pyintact_run_state_{ts}.json"
     state_path.write_text(json.dumps({"phase": "baseline", "timestamp": ts}, indent=2), encoding="utf-8")
 
-    notebook_model = client.add_model(
-        path=notebook_path,
-        display_name=f"pyintact-howto-notebook-{ts}",
-        version_name="v1.0.0",
+    # Read-only inputs (notebook, load and restraint faces) reuse the models from an earlier run
+    # when their bytes are unchanged, pinned to the revision holding those bytes. The job adds a
+    # version to the beam model and the state file is updated after the run, so both get fresh
+    # models and separate runs never add versions to the same model.
+    models, revisions, reused = upload_models(
+        client,
+        {
+            "notebook": ModelUpload(notebook_path, f"pyintact-howto-notebook-{ts}"),
+            "beam": ModelUpload(beam_path, f"pyintact-beam-{ts}", reuse=False),
+            "load": ModelUpload(load_path, f"pyintact-load-face-{ts}"),
+            "restraint": ModelUpload(restraint_path, f"pyintact-restraint-face-{ts}"),
+            "state": ModelUpload(state_path, f"pyintact-run-state-{ts}", reuse=False),
+        },
+        scope=scope,
+        workers=int(os.getenv("ISTARI_UPLOAD_WORKERS", "4")),
     )
-    beam_model = client.add_model(path=beam_path, display_name=f"pyintact-beam-{ts}", version_name="v1.0.0")
-    load_model = client.add_model(path=load_path, display_name=f"pyintact-load-face-{ts}", version_name="v1.0.0")
-    restraint_model = client.add_model(
-        path=restraint_path,
-        display_name=f"pyintact-restraint-face-{ts}",
-        version_name="v1.0.0",
-    )
-    state_model = client.add_model(
-        path=state_path,
-        display_name=f"pyintact-run-state-{ts}",
-        version_name="v1.0.0",
-    )
-
+    for key, model in models.items():
+        origin = "reused" if key in reused else "uploaded"
+        print(f"model_{key}={getattr(model, 'id', '<unknown>')} revision={revisions[key]} ({origin})")
+    beam_model = models["beam"]
+    state_model = models["state"]
+
+    # Shared read-only inputs are locked to their revision; this run's own models track LATEST,
+    # so the post-run snapshot picks up the job's beam version and the updated state.
     tracked_files = [
-        NewTrackedFile(specifier_type=TrackedFileSpecifierType.LATEST, file_id=notebook_model.file.id),
+        *[
+            NewTrackedFile(
+                specifier_type=TrackedFileSpecifierType.LOCKED,
+                file_id=models[key].file.id,
+                revision_id=revisions[key],
+            )
+            for key in ("notebook", "load", "restraint")
+        ],
         NewTrackedFile(specifier_type=TrackedFileSpecifierType.LATEST, file_id=beam_model.file.id),
-        NewTrackedFile(specifier_type=TrackedFileSpecifierType.LATEST, file_id=load_model.file.id),
-        NewTrackedFile(specifier_type=TrackedFileSpecifierType.LATEST, file_id=restraint_model.file.id),
         NewTrackedFile(specifier_type=TrackedFileSpecifierType.LATEST, file_id=state_model.file.id),
     ]
     config = client.create_configuration(
@@ -169,11 +184,8 @@ def main() -> int:
         function="@istari:run_pyintact_simulation",
         assigned_agent_id=agent.id,
         sources=[
-            NewSource(revision_id=latest_revision_id(load_model), relationship_identifier="load_geometry_file"),
-            NewSource(
-                revision_id=latest_revision_id(restraint_model),
-                relationship_identifier="restraint_geometry_file",
-            ),
+            NewSource(revision_id=revisions["load"], relationship_identifier="load_geometry_file"),
+            NewSource(revision_id=revisions["restraint"], relationship_identifier="restraint_geometry_file"),
         ],
         parameters={"simulation_config": json.dumps(sim_config)},
         description="Versioned pyintact integration rerun",